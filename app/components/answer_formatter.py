@@ -0,0 +1,49 @@
+import logging
+from typing import Optional
+from pydantic import BaseModel
+from haystack import component
+
+logger = logging.getLogger("pipeline")
+
+
+@component
+class QuestionAnswerFormatter:
+    """
+    Component that renders answered sub-questions into a single text block for the reasoning prompt.
+    Joining in Python keeps the prompt template free of per-item Jinja loops.
+    """
+
+    @component.output_types(pairs_block=str)
+    def run(self, questions: Optional[BaseModel] = None):
+        """
+        Format the answered sub-questions as one string
+
+        Args:
+            questions: The Questions object from the query resolver (as BaseModel)
+
+        Returns:
+            Dictionary with pairs_block containing one question/answer entry per sub-question
+        """
+        questions_list = getattr(questions, "questions", None) or []
+
+        pairs_block = "\n  ".join(
+            f"Q: {q.question}\n  A: {q.answer if q.answer is not None else 'No answer available'}"
+            for q in questions_list
+        )
+
+        logger.debug(f"Formatted {len(questions_list)} question/answer pairs for reasoning")
+        return {"pairs_block": pairs_block}
+
+    @component.output_types(pairs_block=str)
+    async def run_async(self, questions: Optional[BaseModel] = None):
+        """
+        Asynchronous version: Format the answered sub-questions as one string
+
+        Args:
+            questions: The Questions object from the query resolver (as BaseModel)
+
+        Returns:
+            Dictionary with pairs_block containing one question/answer entry per sub-question
+        """
+        # A single string join is cheap enough to run directly on the event loop
+        return self.run(questions)
@@ -16,6 +16,7 @@ if not COHERE_API_KEY:
 QDRANT_URL = os.getenv("QDRANT_URL")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "LegalDocs")
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", 6334))
 
 if not QDRANT_URL or not QDRANT_API_KEY:
     logger.warning("Qdrant configuration missing in environment variables")
@@ -26,6 +27,14 @@ UPSTASH_REDIS_REST_URL = os.getenv("UPSTASH_REDIS_REST_URL", "https://new-flamin
 UPSTASH_REDIS_REST_TOKEN = os.getenv("UPSTASH_REDIS_REST_TOKEN", "")
 REDIS_CACHE_TTL = int(os.getenv("REDIS_CACHE_TTL", 3600))  # 1 hour default
 REDIS_CACHE_ENABLED = os.getenv("REDIS_CACHE_ENABLED", "True").lower() == "true"
+# Concurrent cache reads/writes are coalesced into one Upstash request per window
+REDIS_BATCH_MAX_SIZE = int(os.getenv("REDIS_BATCH_MAX_SIZE", 32))
+REDIS_BATCH_MAX_WAIT_MS = float(os.getenv("REDIS_BATCH_MAX_WAIT_MS", "3"))
+# Per-process copy of hot cache entries, checked before Redis
+REDIS_LOCAL_CACHE_SIZE = int(os.getenv("REDIS_LOCAL_CACHE_SIZE", 1024))
+REDIS_LOCAL_CACHE_TTL = int(os.getenv("REDIS_LOCAL_CACHE_TTL", min(REDIS_CACHE_TTL, 60)))
+# Background cache writes beyond this many are skipped rather than queued
+REDIS_MAX_PENDING_WRITES = int(os.getenv("REDIS_MAX_PENDING_WRITES", 64))
 
 # App settings
 APP_PORT = int(os.getenv("APP_PORT", 9005))
@@ -50,4 +59,51 @@ RANKER_MODEL = os.getenv("RANKER_MODEL", "Xenova/ms-marco-MiniLM-L-6-v2")
 
 # Retrieval settings
 DEFAULT_TOP_K = int(os.getenv("DEFAULT_TOP_K", "5"))
-DEFAULT_SCORE_THRESHOLD = float(os.getenv("DEFAULT_SCORE_THRESHOLD", "0.4"))
\ No newline at end of file
+DEFAULT_SCORE_THRESHOLD = float(os.getenv("DEFAULT_SCORE_THRESHOLD", "0.4"))
+# Semantic chat response cache settings
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "True").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+SEMANTIC_CACHE_MAX_SIZE = int(os.getenv("SEMANTIC_CACHE_MAX_SIZE", "512"))
+SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", 3600))  # 1 hour default
+
+# Batch chat settings (LegalQueryChatService.batch_chat, used by offline evaluation runs)
+BATCH_CHAT_CONCURRENCY = int(os.getenv("BATCH_CHAT_CONCURRENCY", 8))
+
+# Conversation memory settings
+CONVERSATION_MAX_MESSAGES = int(os.getenv("CONVERSATION_MAX_MESSAGES", 40))  # 20 user/assistant turns
+
+# Decomposition routing settings
+# Path to a .npz file with a linear classifier ("weights", "bias") over dense question embeddings.
+# When unset or unreadable, the keyword heuristic decides whether to decompose.
+DECOMPOSITION_ROUTER_PATH = os.getenv("DECOMPOSITION_ROUTER_PATH", "")
+
+# Legal research tool settings
+RESEARCH_TOOL_CONCURRENCY = int(os.getenv("RESEARCH_TOOL_CONCURRENCY", 4))
+# Scale for the simulated API latency of the mock research tools; 1.0 reproduces the original delays
+LEGAL_TOOLS_MOCK_LATENCY = float(os.getenv("LEGAL_TOOLS_MOCK_LATENCY", "0"))
+RESEARCH_TOOL_CACHE_SIZE = int(os.getenv("RESEARCH_TOOL_CACHE_SIZE", 512))
+RESEARCH_TOOL_CACHE_TTL = int(os.getenv("RESEARCH_TOOL_CACHE_TTL", 300))  # 5 minutes default
+
+# Unified chat reply cache settings
+REPLY_CACHE_MAX_SIZE = int(os.getenv("REPLY_CACHE_MAX_SIZE", 2048))
+# Near-duplicate questions must be at least this cosine-similar to reuse a reply
+REPLY_CACHE_THRESHOLD = float(os.getenv("REPLY_CACHE_THRESHOLD", "0.97"))
+
+# Embedding micro-batching settings
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", 16))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "20"))
+
+# Retrieval micro-batching settings
+RETRIEVAL_BATCH_MAX_SIZE = int(os.getenv("RETRIEVAL_BATCH_MAX_SIZE", 8))
+RETRIEVAL_BATCH_MAX_WAIT_MS = float(os.getenv("RETRIEVAL_BATCH_MAX_WAIT_MS", "20"))
+
+# Threads dedicated to blocking LLM generation calls
+LLM_EXECUTOR_WORKERS = int(os.getenv("LLM_EXECUTOR_WORKERS", 16))
+
+# Worker processes for CPU-bound PDF generation
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Unified chat conversation retention settings
+CONVERSATION_MAX_COUNT = int(os.getenv("CONVERSATION_MAX_COUNT", 10000))
+CONVERSATION_IDLE_TTL = int(os.getenv("CONVERSATION_IDLE_TTL", 3600))  # 1 hour default
+CONVERSATION_SWEEP_INTERVAL = int(os.getenv("CONVERSATION_SWEEP_INTERVAL", 300))  # 5 minutes default
@@ -0,0 +1,98 @@
+"""
+Micro-batching for async callers that each submit a single item.
+Coalesces concurrent submissions into one call of a batch function.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBatcher:
+    """
+    Collects items submitted by concurrent coroutines and flushes them together.
+    A batch is flushed when it reaches max_batch items or max_wait_ms after its
+    first item arrived, whichever comes first. Each caller awaits its own result.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch: int = 16,
+        max_wait_ms: float = 20
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            flush: Async function mapping a list of items to a same-length list of results
+            max_batch: Largest number of items sent in one flush
+            max_wait_ms: Longest time the first item of a batch waits for others
+        """
+        self._flush = flush
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Submit one item and wait for its result
+
+        Args:
+            item: Item to include in the next batch
+
+        Returns:
+            The flush function's result for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush_pending)
+
+        return await future
+
+    def _flush_pending(self):
+        """Hand the pending batch to a background task"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run the flush function and deliver results (or the error) to each caller"""
+        items = [item for item, _ in batch]
+        try:
+            results = await self._flush(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            logger.error(f"Batch of {len(items)} items failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # The flush was cancelled (e.g. at shutdown); don't leave callers waiting forever
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            raise
+
+        # Callers that were cancelled while waiting already have a done future
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -3,7 +3,7 @@ import asyncio
 from functools import lru_cache
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from haystack.utils import Secret
-from app.config.settings import QDRANT_URL, QDRANT_API_KEY, QDRANT_COLLECTION_NAME
+from app.config.settings import QDRANT_URL, QDRANT_API_KEY, QDRANT_COLLECTION_NAME, QDRANT_GRPC_PORT
 from app.core.singleton import SingletonMeta
 
 logger = logging.getLogger("document_store")
@@ -31,6 +31,8 @@ class DocumentStoreService(metaclass=SingletonMeta):
                 use_sparse_embeddings=True,  # Enable hybrid search
                 similarity="cosine",
                 prefer_grpc=True,
+                grpc_port=QDRANT_GRPC_PORT,
+                return_embedding=False,  # Hits only need payloads; skip shipping vectors back
             )
 
             logger.info(f"Successfully connected to Qdrant. Collection: {QDRANT_COLLECTION_NAME}")
@@ -10,8 +10,6 @@ from app.pipelines.legal_decomposition_pipeline import process_question
 from app.models import LegalQueryResponse, DocumentMetadata, Question
 from app.utils.formatter import format_as_markdown
 from app.utils.sanitizer import sanitize_legal_query
-from app.utils.pdf_generator import get_pdf_generator
-from app.utils.pdf_signer import get_pdf_signer
 from app.core.async_component import AsyncComponent
 from app.auth import (
     require_legal_research_access,
@@ -112,11 +110,15 @@ class QueryProcessor(AsyncComponent):
             # Prepare decomposed questions data
             decomposed_questions = self._prepare_decomposed_questions(result)
 
+            # Import here so ReportLab and PyPDF2 load on the first PDF request, not at startup
+            from app.utils.pdf_generator import get_pdf_generator
+            from app.utils.pdf_signer import get_pdf_signer
+
             # Get PDF generator
             pdf_generator = get_pdf_generator()
 
-            # Generate PDF
-            pdf_bytes = pdf_generator.generate_pdf(
+            # Generate PDF off the event loop
+            pdf_bytes = await pdf_generator.generate_pdf_async(
                 question=question,
                 decomposed_questions=decomposed_questions,
                 final_answer=result.get("answer", ""),
@@ -128,7 +130,8 @@ class QueryProcessor(AsyncComponent):
             if sign_document:
                 pdf_signer = get_pdf_signer()
                 try:
-                    signed_pdf = pdf_signer.sign_pdf(
+                    # Sign in the same worker pool as generation, off the event loop
+                    signed_pdf = await pdf_signer.sign_pdf_async(
                         pdf_bytes,
                         reason=signature_reason,
                         location=signature_location
@@ -313,7 +316,7 @@ async def ask_legal_question(
 
             # Add chat information if followup is enabled
             if response.supports_followup and response.conversation_id:
-                markdown_content += f"\n\n---\n**Follow-up Questions Enabled**\nConversation ID: `{response.conversation_id}`\nUse: `POST /api/chat/followup/{response.conversation_id}`"
+                markdown_content += f"\n\n---\n**Follow-up Questions Enabled**\nConversation ID: `{response.conversation_id}`\nUse: `POST /api/chat/followup/{response.conversation_id}`".encode()
 
             return Response(
                 content=markdown_content,
@@ -3,16 +3,17 @@ Chat API endpoints for legal query conversational functionality.
 Follows RESTful principles and maintains clean separation from existing endpoints.
 """
 
+import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 
 from fastapi import APIRouter, HTTPException, Query, Depends
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.models import (
     Question, LegalQueryRequest, LegalQueryResponse, DocumentMetadata,
-    LegalChatResponse, ChatMessage, LegalSource, ToolCallResult,
+    LegalChatResponse, LegalChatResponseChunk, ChatMessage, LegalSource, ToolCallResult,
     SourceType, ConfidenceLevel, SourceFactory, LegalQueryResponseWithChat,
     LegalQueryRequestWithChat
 )
@@ -132,6 +133,79 @@ async def continue_legal_chat(
         )
 
 
+@router.post("/stream/start")
+async def start_legal_chat_stream(
+    request: LegalQueryRequestWithChat,
+    user_context: dict = Depends(get_user_context),
+    _: None = Depends(require_chat_access),
+    __: None = Depends(require_legal_research_access)
+):
+    """
+    Start a new legal chat session, streaming the reply as Server-Sent Events.
+
+    Args:
+        request: Legal query request with chat options
+
+    Returns:
+        Event stream of LegalChatResponseChunk objects; the last one carries the full response
+    """
+    # Sanitize the question from the request body
+    sanitized_question = sanitize_legal_query_body(request.question)
+    logger.info(f"Starting streamed chat session: {sanitized_question[:100]}...")
+
+    from app.services.legal_chat_service import get_legal_chat_service
+    chunks = get_legal_chat_service().start_chat_stream(
+        initial_question=sanitized_question,
+        enable_decomposition=True
+    )
+    return StreamingResponse(_sse_events(chunks, None), media_type="text/event-stream")
+
+
+@router.post("/stream/{conversation_id}")
+async def continue_legal_chat_stream(
+    conversation_id: str,
+    request: FollowupQuestionRequest,
+    user_context: dict = Depends(get_user_context),
+    _: None = Depends(require_chat_access)
+):
+    """
+    Continue a conversation started with /api/ask?enable_followup=true or /stream/start,
+    streaming the reply as Server-Sent Events.
+
+    Args:
+        conversation_id: Existing conversation ID
+        request: Follow-up question request
+
+    Returns:
+        Event stream of LegalChatResponseChunk objects; the last one carries the full response
+    """
+    # Sanitize the follow-up question
+    sanitized_question = sanitize_legal_query_body(request.question)
+    logger.info(f"Continuing streamed chat {conversation_id}: {sanitized_question[:50]}...")
+
+    from app.services.legal_chat_service import get_legal_chat_service
+    chunks = get_legal_chat_service().continue_chat_stream(
+        question=sanitized_question,
+        conversation_id=conversation_id
+    )
+    return StreamingResponse(_sse_events(chunks, conversation_id), media_type="text/event-stream")
+
+
+async def _sse_events(
+    chunks: AsyncIterator[LegalChatResponseChunk],
+    conversation_id: Optional[str]
+) -> AsyncIterator[str]:
+    """Encode streamed chat chunks as SSE data events, ending with an error event on failure"""
+    try:
+        async for chunk in chunks:
+            conversation_id = chunk.conversation_id
+            yield f"data: {chunk.model_dump_json()}\n\n"
+    except Exception as e:
+        # Headers are already sent, so the failure is reported in-band
+        logger.error(f"Streamed chat failed: {str(e)}")
+        yield f"event: error\ndata: {json.dumps({'conversation_id': conversation_id, 'detail': str(e)})}\n\n"
+
+
 @router.get("/conversations/{conversation_id}/history")
 async def get_conversation_history(
     conversation_id: str,
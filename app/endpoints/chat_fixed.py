@@ -14,6 +14,7 @@ from app.models import (
 )
 from app.services.unified_chat_service import get_unified_chat_service
 from app.utils.sanitizer import sanitize_legal_query_body
+from app.utils.responses import PydanticJSONResponse
 from app.auth import (
     require_chat_access,
     require_legal_research_access,
@@ -54,19 +55,20 @@ async def start_legal_chat_fixed(
             enable_decomposition=True
         )
 
-        return {
+        # Models are encoded directly by pydantic-core rather than dumped per item
+        return PydanticJSONResponse({
             "success": True,
             "response": chat_response.response,
             "conversation_id": chat_response.conversation_id,
-            "sources": [source.model_dump() for source in chat_response.sources],
+            "sources": chat_response.sources,
             "supports_followup": True,
             "processing_time": chat_response.processing_time_seconds,
             "timestamp": chat_response.timestamp.isoformat(),
             "external_research_used": chat_response.external_research_used,
-            "tools_called": [tool.model_dump() for tool in chat_response.tools_called],
+            "tools_called": chat_response.tools_called,
             "previous_decomposition_used": chat_response.previous_decomposition_used,
             "message": "Chat session started successfully with unified service"
-        }
+        })
 
     except Exception as e:
         logger.error(f"Failed to start chat session (fixed): {str(e)}", exc_info=True)
@@ -98,18 +100,18 @@ async def continue_legal_chat_fixed(
             conversation_id=conversation_id
         )
 
-        return {
+        return PydanticJSONResponse({
             "success": True,
             "response": chat_response.response,
             "conversation_id": chat_response.conversation_id,
-            "sources": [source.model_dump() for source in chat_response.sources],
+            "sources": chat_response.sources,
             "processing_time": chat_response.processing_time_seconds,
             "timestamp": chat_response.timestamp.isoformat(),
             "external_research_used": chat_response.external_research_used,
-            "tools_called": [tool.model_dump() for tool in chat_response.tools_called],
+            "tools_called": chat_response.tools_called,
             "previous_decomposition_used": chat_response.previous_decomposition_used,
             "message": f"Chat continued successfully for conversation {conversation_id}"
-        }
+        })
 
     except Exception as e:
         logger.error(f"Failed to continue chat (fixed): {str(e)}", exc_info=True)
@@ -222,17 +224,17 @@ async def ask_legal_question_with_followup_fixed(request: LegalQueryRequestWithC
         )
 
         # Convert to the expected response format
-        return {
+        return PydanticJSONResponse({
             "success": True,
             "original_question": sanitized_question,
             "final_answer": chat_response.response,
-            "sources": [source.model_dump() for source in chat_response.sources],
+            "sources": chat_response.sources,
             "supports_followup": True,
             "conversation_id": chat_response.conversation_id,
             "processing_time": chat_response.processing_time_seconds,
             "previous_decomposition_used": chat_response.previous_decomposition_used,
             "message": "Question processed successfully with unified chat service"
-        }
+        })
 
     except Exception as e:
         logger.error(f"Failed to process question with follow-up (fixed): {str(e)}", exc_info=True)
@@ -264,16 +266,16 @@ async def ask_followup_question_fixed(
             conversation_id=conversation_id
         )
 
-        return {
+        return PydanticJSONResponse({
             "success": True,
             "response": chat_response.response,
             "conversation_id": chat_response.conversation_id,
-            "sources": [source.model_dump() for source in chat_response.sources],
+            "sources": chat_response.sources,
             "processing_time": chat_response.processing_time_seconds,
             "timestamp": chat_response.timestamp.isoformat(),
             "previous_decomposition_used": chat_response.previous_decomposition_used,
             "message": f"Follow-up question processed successfully for conversation {conversation_id}"
-        }
+        })
 
     except Exception as e:
         logger.error(f"Failed to process follow-up question (fixed): {str(e)}", exc_info=True)
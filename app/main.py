@@ -26,7 +26,7 @@ from app.config.settings import (
     CORS_ALLOWED_ORIGINS, CORS_ALLOW_CREDENTIALS,
     CORS_ALLOWED_METHODS, CORS_ALLOWED_HEADERS
 )
-from app.utils.cache import get_redis_client, DummyRedisClient
+from app.utils.cache import get_redis_client, close_http_client, DummyRedisClient
 from app.auth import (
     auth_settings,
     create_authentication_middleware,
@@ -70,7 +70,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown: Clean up resources
     logger.info("Shutting down Legal Query Decomposition API")
-    # Any cleanup tasks would go here
+    from app.services.unified_chat_service import shutdown_unified_chat_service
+    shutdown_unified_chat_service()
+    await close_http_client()
+    from app.utils.pdf_generator import shutdown_pdf_executor
+    shutdown_pdf_executor()
 
 
 def _ensure_directories():
@@ -128,6 +132,7 @@ async def _initialize_components():
     chat_service = get_legal_chat_service()
     enhanced_service = get_enhanced_pipeline_service()
     unified_service = get_unified_chat_service()
+    await unified_service.warm_up()
     logger.info("Chat service components initialized (including fixed unified service)")
 
 
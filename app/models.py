@@ -96,6 +96,7 @@ class ToolCallResult(BaseModel):
     result: Dict[str, Any] = Field(..., description="Result from tool call")
     success: bool = Field(..., description="Whether tool call succeeded")
     timestamp: datetime = Field(..., description="When tool was called")
+    elapsed_ms: Optional[float] = Field(None, description="Tool execution time in milliseconds")
     sources_generated: List[LegalSource] = Field(default_factory=list, description="Sources from this tool")
 
 
@@ -122,6 +123,14 @@ class LegalChatResponse(BaseModel):
     previous_decomposition_used: bool = Field(default=False, description="Used previous decomposition results")
 
 
+class LegalChatResponseChunk(BaseModel):
+    """Incremental chunk of a streamed legal chat response"""
+    conversation_id: str = Field(..., description="Conversation identifier")
+    delta: str = Field(default="", description="Text generated since the previous chunk")
+    done: bool = Field(default=False, description="Whether this is the final chunk")
+    response: Optional[LegalChatResponse] = Field(None, description="Complete response, set on the final chunk")
+
+
 class LegalQueryRequestWithChat(BaseModel):
     """Request model for legal queries with chat support"""
     question: str = Field(..., description="Legal question to answer")
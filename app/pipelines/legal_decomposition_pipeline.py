@@ -12,13 +12,14 @@ from app.components.custom_generators import ExtendedCohereGenerator
 from app.components.embedders import get_dense_embedder, get_sparse_embedder
 from app.components.retrievers import get_hybrid_retriever
 from app.components.decomposition_validator import DecompositionValidator
+from app.components.answer_formatter import QuestionAnswerFormatter
 from app.document_store.store import get_document_store
 from app.models import Questions, Question, DocumentMetadata
 from app.prompts.decomposition import LEGAL_QUERY_DECOMPOSITION_PROMPT
 from app.prompts.answering import LEGAL_MULTI_QUERY_TEMPLATE
 from app.prompts.reasoning import LEGAL_REASONING_TEMPLATE
 from app.config.settings import COHERE_MODEL, COHERE_API_KEY, DEFAULT_TOP_K, DEFAULT_SCORE_THRESHOLD
-from app.utils.cache import get_cached_result, cache_result
+from app.utils.cache import get_cached_result, cache_result_in_background
 from app.core.singleton import SingletonMeta
 
 logger = logging.getLogger("pipeline")
@@ -34,6 +35,8 @@ class PipelineBuilder:
 
     def add_prompt(self, name: str, template: str, required_variables: list = None) -> 'PipelineBuilder':
         """Add a prompt builder component"""
+        # PromptBuilder compiles the Jinja template once here; the pipeline itself is a
+        # singleton, so requests only render the already-compiled template
         self.pipeline.add_component(
             name,
             PromptBuilder(template=template, required_variables=required_variables or [])
@@ -66,6 +69,11 @@ class PipelineBuilder:
         self.pipeline.add_component("validator", DecompositionValidator())
         return self
 
+    def add_answer_formatter(self) -> 'PipelineBuilder':
+        """Add question/answer formatter for the reasoning prompt"""
+        self.pipeline.add_component("answer_formatter", QuestionAnswerFormatter())
+        return self
+
     def add_retriever(self) -> 'PipelineBuilder':
         """Add hybrid retriever"""
         document_store = get_document_store()
@@ -99,7 +107,8 @@ class PipelineBuilder:
         self.pipeline.connect("multi_query_prompt", "query_resolver")
 
         # Final reasoning path
-        self.pipeline.connect("query_resolver.structured_reply", "reasoning_prompt.question_answer_pair")
+        self.pipeline.connect("query_resolver.structured_reply", "answer_formatter.questions")
+        self.pipeline.connect("answer_formatter.pairs_block", "reasoning_prompt.pairs_block")
         self.pipeline.connect("reasoning_prompt", "reasoning_llm")
 
         return self
@@ -131,7 +140,8 @@ class LegalDecompositionPipelineService(metaclass=SingletonMeta):
                          .add_retriever()
                          .add_prompt("multi_query_prompt", LEGAL_MULTI_QUERY_TEMPLATE, required_variables=["question", "question_context_pairs"])
                          .add_generator("query_resolver", Questions)
-                         .add_prompt("reasoning_prompt", LEGAL_REASONING_TEMPLATE, required_variables=["question", "question_answer_pair"])
+                         .add_answer_formatter()
+                         .add_prompt("reasoning_prompt", LEGAL_REASONING_TEMPLATE, required_variables=["question", "pairs_block"])
                          .add_generator("reasoning_llm")
                          .connect_components()
                          .build())
@@ -144,7 +154,7 @@ class LegalDecompositionPipelineService(metaclass=SingletonMeta):
 
     def _generate_cache_key(self, question: str) -> str:
         """Generate a cache key for a question"""
-        return hashlib.md5(question.lower().strip().encode()).hexdigest()
+        return hashlib.blake2b(question.lower().strip().encode(), digest_size=16).hexdigest()
 
     #@cached(key_prefix="legal_decomposition")
     async def run_pipeline(self, question: str, **kwargs) -> Dict[str, Any]:
@@ -198,10 +208,9 @@ class LegalDecompositionPipelineService(metaclass=SingletonMeta):
             pipeline_result["processing_time"] = processing_time
             pipeline_result["cache_hit"] = False
 
-            # CRITICAL: Store result in cache for future use
-            cache_success = await cache_result(cache_key, pipeline_result)
-            if cache_success:
-                logger.info(f"Successfully cached result for: {question[:50]}...")
+            # CRITICAL: Store result in cache for future use (off the request path)
+            if cache_result_in_background(cache_key, pipeline_result):
+                logger.info(f"Scheduled cache write for: {question[:50]}...")
             else:
                 logger.warning(f"Failed to cache result for: {question[:50]}...")
 
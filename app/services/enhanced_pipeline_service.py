@@ -3,18 +3,62 @@ Enhanced pipeline service integrating chat functionality with existing decomposi
 Follows SOLID principles by extending rather than modifying existing functionality.
 """
 
+import asyncio
+import hashlib
 import logging
+import threading
 import time
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, Any, Optional, Tuple
 
 from app.pipelines.legal_decomposition_pipeline import process_question
 from app.models import (
     LegalQueryResponseWithChat, LegalSource, SourceFactory, SourceType
 )
 from app.services.legal_chat_service import get_legal_chat_service
+from app.utils.questions import normalize_questions
+from app.config.settings import REDIS_CACHE_TTL
 
 logger = logging.getLogger("enhanced_pipeline_service")
 
+# Maximum number of finished responses kept in the in-process LRU cache
+RESPONSE_CACHE_MAXSIZE = 256
+
+# Above this many models, follow-up serialization is moved off the event loop
+PARALLEL_DUMP_THRESHOLD = 16
+
+# Pre-built empty response for error paths; model_construct skips validation of the constant fields
+_ERROR_RESPONSE_TEMPLATE = LegalQueryResponseWithChat.model_construct(
+    original_question="",
+    decomposed_questions=[],
+    final_answer="",
+    document_metadata=[],
+    supports_followup=False,
+    conversation_id=None,
+    processing_time=0.0,
+    cache_hit=False,
+    sources=[]
+)
+
+
+def _error_response(question: str, message: str, processing_time: float) -> LegalQueryResponseWithChat:
+    """Create an error response from the shared template"""
+    return _ERROR_RESPONSE_TEMPLATE.model_copy(update={
+        "original_question": question,
+        "final_answer": message,
+        "processing_time": processing_time,
+        # Fresh lists so callers never share the template's mutable fields
+        "decomposed_questions": [],
+        "document_metadata": [],
+        "sources": []
+    })
+
+
+def _dump_models(models: list) -> list:
+    """Serialize a list of Pydantic models"""
+    return [model.model_dump() for model in models]
+
 
 class EnhancedLegalPipelineService:
     """
@@ -23,9 +67,21 @@ class EnhancedLegalPipelineService:
     """
 
     def __init__(self):
-        self.chat_service = get_legal_chat_service()
+        # Bounded LRU of (stored_at, response) keyed by question digest (stored without conversation_id);
+        # entries expire with the Redis result TTL so reindexed answers are picked up
+        self._response_cache: "OrderedDict[bytes, Tuple[float, LegalQueryResponseWithChat]]" = OrderedDict()
         logger.info("EnhancedLegalPipelineService initialized with chat capabilities")
 
+    @cached_property
+    def chat_service(self):
+        """Chat service, resolved on first use rather than at construction"""
+        return get_legal_chat_service()
+
+    @cached_property
+    def _meta_store(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Conversation metadata store of the chat service, or None if it does not keep one"""
+        return getattr(self.chat_service.memory, 'conversation_metadata', None)
+
     async def process_with_chat_support(
         self,
         question: str,
@@ -43,73 +99,71 @@ class EnhancedLegalPipelineService:
         Returns:
             Enhanced response with chat support information
         """
-        start_time = time.time()
-        logger.info(f"Processing question with chat support: {question[:100]}...")
+        start_time = time.perf_counter()
+        logger.info("Processing question with chat support: %s...", question[:100])
+
+        # A fresh conversation must always be bootstrapped, so only serve cached
+        # responses when no new conversation is needed
+        cache_key = hashlib.blake2b(question.encode(), digest_size=16).digest()
+        if not enable_followup or conversation_id:
+            cached_response = self._get_cached_response(cache_key)
+            if cached_response is not None:
+                logger.info("Serving in-process cached response for: %s...", question[:50])
+                return cached_response.model_copy(update={
+                    "supports_followup": enable_followup,
+                    "conversation_id": conversation_id if enable_followup else None,
+                    "processing_time": time.perf_counter() - start_time,
+                    "cache_hit": True
+                })
 
         try:
-            # Step 1: Process through existing decomposition pipeline
-            decomp_result = await process_question(question)
+            # Step 1: Process through existing decomposition pipeline and, when a new
+            # conversation is needed, bootstrap it concurrently - the two calls are independent
+            decomp_task = asyncio.create_task(process_question(question))
+            chat_task = None
+
+            if enable_followup and not conversation_id:
+                chat_task = asyncio.create_task(self.chat_service.start_chat(
+                    initial_question=question,
+                    enable_decomposition=False  # We already have decomposition
+                ))
+
+            if chat_task:
+                try:
+                    decomp_result, chat_response = await asyncio.gather(decomp_task, chat_task)
+                except BaseException:
+                    # gather leaves the sibling running; stop it and drop its conversation
+                    decomp_task.cancel()
+                    self._discard_chat_task(chat_task)
+                    raise
+                conversation_id = chat_response.conversation_id
+            else:
+                decomp_result = await decomp_task
 
-            # Step 2: Create sources from decomposition results
-            sources = self._create_sources_from_result(decomp_result)
+            # Step 2: Extract decomposed questions properly
+            decomposed_questions = normalize_questions(decomp_result.get("sub_questions"))
 
-            # Step 3: Handle conversation setup
+            # Step 3: Create sources from decomposition results
+            sources = self._create_sources_from_result(decomp_result, decomposed_questions)
+
+            # Step 4: Handle conversation setup
             if enable_followup:
-                if conversation_id:
-                    # Use existing conversation
-                    logger.info(f"Using existing conversation: {conversation_id}")
+                if chat_task:
+                    # Store decomposition context for follow-up in the new conversation
+                    await self._store_decomposition_context(conversation_id, decomp_result, sources)
                 else:
-                    # Start new conversation and provide initial context
-                    chat_response = await self.chat_service.start_chat(
-                        initial_question=question,
-                        enable_decomposition=False  # We already have decomposition
-                    )
-                    conversation_id = chat_response.conversation_id
-
-                    # Store decomposition context for follow-up
-                    await self._store_decomposition_context(
-                        conversation_id, decomp_result, sources
-                    )
+                    # Use existing conversation
+                    logger.info("Using existing conversation: %s", conversation_id)
             else:
                 conversation_id = None
 
-            # Step 4: Extract decomposed questions properly
-            sub_questions_obj = decomp_result.get("sub_questions")
-            decomposed_questions = []
-
-            logger.info(f"Type of sub_questions_obj: {type(sub_questions_obj)}")
-
-            # Handle different types of sub_questions objects
-            if sub_questions_obj is None:
-                logger.warning("sub_questions_obj is None")
-                decomposed_questions = []
-            elif isinstance(sub_questions_obj, tuple):
-                # This is the problematic case - it's a tuple instead of Questions object
-                logger.warning(f"sub_questions_obj is a tuple: {sub_questions_obj}")
-                if len(sub_questions_obj) > 1 and isinstance(sub_questions_obj[1], list):
-                    # Extract questions list from tuple
-                    decomposed_questions = sub_questions_obj[1]
-                    logger.info(f"Extracted {len(decomposed_questions)} questions from tuple")
-                else:
-                    decomposed_questions = []
-            elif hasattr(sub_questions_obj, "questions"):
-                # Normal case - it's a Questions object
-                decomposed_questions = sub_questions_obj.questions
-                logger.info(f"Extracted {len(decomposed_questions)} questions from Questions object")
-            elif hasattr(sub_questions_obj, 'content') and hasattr(sub_questions_obj, 'role'):
-                # It's a ChatMessage object - this shouldn't happen but handle it gracefully
-                logger.warning(f"sub_questions_obj is a ChatMessage object - this is unexpected")
-                decomposed_questions = []
-            else:
-                logger.warning(f"sub_questions_obj has unexpected type: {type(sub_questions_obj)}")
-                decomposed_questions = []
-
             # Step 5: Create enhanced response
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
 
             # Validate decomposed_questions before passing to Pydantic
-            logger.info(f"About to create LegalQueryResponseWithChat with {len(decomposed_questions)} questions")
-            logger.info(f"Type of decomposed_questions[0]: {type(decomposed_questions[0]) if decomposed_questions else 'None'}")
+            logger.debug(
+                "About to create LegalQueryResponseWithChat with %d questions", len(decomposed_questions)
+            )
 
             try:
                 enhanced_response = LegalQueryResponseWithChat(
@@ -123,43 +177,60 @@ class EnhancedLegalPipelineService:
                     cache_hit=decomp_result.get("cache_hit", False),
                     sources=sources
                 )
-                logger.info("Successfully created LegalQueryResponseWithChat")
+                logger.debug("Successfully created LegalQueryResponseWithChat")
+
+                if "error" not in decomp_result:
+                    self._cache_response(
+                        cache_key, enhanced_response.model_copy(update={"conversation_id": None})
+                    )
             except Exception as model_error:
                 logger.error(f"Pydantic validation error: {model_error}")
                 logger.error(f"decomposed_questions details: {decomposed_questions}")
-                # Try to create with empty questions as fallback
-                enhanced_response = LegalQueryResponseWithChat(
-                    original_question=question,
-                    decomposed_questions=[],
-                    final_answer=f"Error creating response: {str(model_error)}",
-                    document_metadata=[],
-                    supports_followup=False,
-                    conversation_id=None,
-                    processing_time=processing_time,
-                    cache_hit=False,
-                    sources=[]
+                # Fall back to an empty response carrying the error
+                enhanced_response = _error_response(
+                    question, f"Error creating response: {str(model_error)}", processing_time
                 )
 
-            logger.info(f"Enhanced processing completed in {processing_time:.2f}s")
+            logger.info("Enhanced processing completed in %.2fs", processing_time)
             return enhanced_response
 
         except Exception as e:
             logger.error(f"Enhanced pipeline processing failed: {str(e)}")
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
 
             # Return error response
-            return LegalQueryResponseWithChat(
-                original_question=question,
-                decomposed_questions=[],
-                final_answer=f"An error occurred while processing your question: {str(e)}",
-                document_metadata=[],
-                supports_followup=False,
-                conversation_id=None,
-                processing_time=processing_time,
-                cache_hit=False,
-                sources=[]
+            return _error_response(
+                question, f"An error occurred while processing your question: {str(e)}", processing_time
             )
 
+    def _discard_chat_task(self, chat_task: asyncio.Task):
+        """Cancel a conversation bootstrap, clearing its conversation if it already finished"""
+        if not chat_task.done():
+            # start_chat clears its own conversation when cancelled
+            chat_task.cancel()
+        elif not chat_task.cancelled() and chat_task.exception() is None:
+            self.clear_conversation(chat_task.result().conversation_id)
+
+    def _get_cached_response(self, cache_key: bytes) -> Optional[LegalQueryResponseWithChat]:
+        """Look up a fresh cached response and mark it as most recently used"""
+        entry = self._response_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        if time.monotonic() - entry[0] >= REDIS_CACHE_TTL:
+            del self._response_cache[cache_key]
+            return None
+
+        self._response_cache.move_to_end(cache_key)
+        return entry[1]
+
+    def _cache_response(self, cache_key: bytes, response: LegalQueryResponseWithChat):
+        """Store a response, evicting the least recently used entry when full"""
+        self._response_cache[cache_key] = (time.monotonic(), response)
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > RESPONSE_CACHE_MAXSIZE:
+            self._response_cache.popitem(last=False)
+
     async def process_followup_question(
         self,
         question: str,
@@ -187,12 +258,25 @@ class EnhancedLegalPipelineService:
                 previous_decomposition_context=original_decomposition_context
             )
 
+            sources = chat_response.sources
+            tools_called = chat_response.tools_called
+
+            # Large payloads are dumped in worker threads so the event loop stays free
+            if len(sources) + len(tools_called) > PARALLEL_DUMP_THRESHOLD:
+                sources_dumped, tools_dumped = await asyncio.gather(
+                    asyncio.to_thread(_dump_models, sources),
+                    asyncio.to_thread(_dump_models, tools_called)
+                )
+            else:
+                sources_dumped = _dump_models(sources)
+                tools_dumped = _dump_models(tools_called)
+
             return {
                 "response": chat_response.response,
-                "sources": [source.model_dump() for source in chat_response.sources],
+                "sources": sources_dumped,
                 "conversation_id": chat_response.conversation_id,
                 "external_research_used": chat_response.external_research_used,
-                "tools_called": [tool.model_dump() for tool in chat_response.tools_called],
+                "tools_called": tools_dumped,
                 "processing_time": chat_response.processing_time_seconds,
                 "timestamp": chat_response.timestamp.isoformat()
             }
@@ -210,46 +294,32 @@ class EnhancedLegalPipelineService:
                 "error": str(e)
             }
 
-    def _create_sources_from_result(self, decomp_result: Dict[str, Any]) -> list:
-        """Create LegalSource objects from decomposition results"""
-        sources = []
+    def _create_sources_from_result(
+        self,
+        decomp_result: Dict[str, Any],
+        questions_list: Optional[list] = None
+    ) -> list:
+        """
+        Create LegalSource objects from decomposition results.
+
+        Args:
+            decomp_result: Result dictionary from the decomposition pipeline
+            questions_list: Already-normalized sub-questions, if the caller has them
 
+        Returns:
+            List of LegalSource objects
+        """
         # Add decomposed questions as sources
-        sub_questions = decomp_result.get("sub_questions")
-        questions_list = []
-
-        # Handle different types of sub_questions objects
-        if sub_questions is None:
-            questions_list = []
-        elif isinstance(sub_questions, tuple):
-            # Problematic case - it's a tuple instead of Questions object
-            logger.warning(f"sub_questions is a tuple in _create_sources_from_result: {type(sub_questions)}")
-            if len(sub_questions) > 1 and isinstance(sub_questions[1], list):
-                questions_list = sub_questions[1]
-            else:
-                questions_list = []
-        elif hasattr(sub_questions, "questions"):
-            # Normal case - it's a Questions object
-            questions_list = sub_questions.questions
-        elif hasattr(sub_questions, 'content') and hasattr(sub_questions, 'role'):
-            # It's a ChatMessage object - this shouldn't happen but handle it gracefully
-            logger.warning(f"sub_questions is a ChatMessage object in _create_sources_from_result - this is unexpected")
-            questions_list = []
-        else:
-            logger.warning(f"sub_questions has unexpected type in _create_sources_from_result: {type(sub_questions)}")
-            questions_list = []
-
-        # Create sources from questions
-        for idx, question in enumerate(questions_list):
-            source = SourceFactory.from_decomposition_question(question, idx)
-            sources.append(source)
-
-        # Add document sources
+        if questions_list is None:
+            questions_list = normalize_questions(decomp_result.get("sub_questions"))
+
+        # Create sources from questions, then add document sources
+        from_question = SourceFactory.from_decomposition_question
+        from_document = SourceFactory.from_decomposition_result
         document_metadata = decomp_result.get("document_metadata", [])
-        for doc_meta in document_metadata:
-            source = SourceFactory.from_decomposition_result(doc_meta)
-            sources.append(source)
 
+        sources = [from_question(question, idx) for idx, question in enumerate(questions_list)]
+        sources += [from_document(doc_meta) for doc_meta in document_metadata]
         return sources
 
     async def _store_decomposition_context(
@@ -265,17 +335,20 @@ class EnhancedLegalPipelineService:
                 "original_question": decomp_result.get("original_question", ""),
                 "final_answer": decomp_result.get("answer", ""),
                 "document_metadata": decomp_result.get("document_metadata", []),
-                "sources": [source.model_dump() for source in sources],
+                # Serialized only here, since only new conversations keep this context
+                "sources": _dump_models(sources),
                 "timestamp": time.time()
             }
 
             # Store in conversation memory metadata
-            if hasattr(self.chat_service.memory, 'conversation_metadata'):
-                self.chat_service.memory.conversation_metadata[conversation_id].update({
-                    "decomposition_context": context
+            if self._meta_store is not None:
+                self._meta_store[conversation_id].update({
+                    "decomposition_context": context,
+                    # Materialized sources are reused by reference on follow-up turns
+                    "decomp_sources": sources
                 })
 
-            logger.info(f"Stored decomposition context for conversation {conversation_id}")
+            logger.info("Stored decomposition context for conversation %s", conversation_id)
 
         except Exception as e:
             logger.error(f"Failed to store decomposition context: {str(e)}")
@@ -284,14 +357,8 @@ class EnhancedLegalPipelineService:
         """Get conversation history for a given conversation ID"""
         try:
             messages = self.chat_service.get_conversation_history(conversation_id)
-            return [
-                {
-                    "role": msg.role,
-                    "content": msg.content,
-                    "timestamp": msg.timestamp.isoformat() if msg.timestamp else None
-                }
-                for msg in messages
-            ]
+            # JSON-mode dump yields role, content and an ISO timestamp in one pydantic-core pass
+            return [msg.model_dump(mode="json") for msg in messages]
         except Exception as e:
             logger.error(f"Failed to get conversation history: {str(e)}")
             return []
@@ -307,10 +374,13 @@ class EnhancedLegalPipelineService:
 
 # Singleton instance for dependency injection
 _enhanced_pipeline_service = None
+_enhanced_pipeline_service_lock = threading.Lock()
 
 def get_enhanced_pipeline_service() -> EnhancedLegalPipelineService:
-    """Get singleton instance of enhanced pipeline service"""
+    """Get singleton instance of enhanced pipeline service (thread-safe)"""
     global _enhanced_pipeline_service
     if _enhanced_pipeline_service is None:
-        _enhanced_pipeline_service = EnhancedLegalPipelineService()
+        with _enhanced_pipeline_service_lock:
+            if _enhanced_pipeline_service is None:
+                _enhanced_pipeline_service = EnhancedLegalPipelineService()
     return _enhanced_pipeline_service
\ No newline at end of file
@@ -4,61 +4,245 @@ Follows SOLID principles with clear separation of concerns.
 """
 
 import asyncio
+import base64
+import hashlib
+import heapq
 import logging
+import re
+import time
 import uuid
+from collections import OrderedDict, defaultdict, deque
+from contextvars import ContextVar
+from functools import lru_cache
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Callable, DefaultDict
+
+import numpy as np
 
 from haystack import Pipeline
-from haystack.dataclasses import ChatMessage as HaystackChatMessage
+from haystack.dataclasses import ChatMessage as HaystackChatMessage, StreamingChunk
 from haystack.components.builders import ChatPromptBuilder
 from haystack_integrations.components.generators.cohere import CohereChatGenerator
+from haystack_integrations.components.retrievers.qdrant import QdrantHybridRetriever
 
 from app.models import (
-    LegalSource, LegalChatResponse, ToolCallResult, ChatMessage,
-    SourceType, SourceFactory, ConfidenceLevel, Question
+    LegalSource, LegalChatResponse, LegalChatResponseChunk, ToolCallResult, ChatMessage,
+    SourceType, SourceFactory, ConfidenceLevel, Question, Questions
 )
 from app.services.legal_research_tools import get_legal_research_manager
 from app.pipelines.legal_decomposition_pipeline import process_question
-from app.config.settings import COHERE_MODEL
+from app.components.embedders import get_dense_embedder, get_sparse_embedder
+from app.components.retrievers import get_hybrid_retriever
+from app.document_store.store import get_document_store
+from app.utils.semantic_cache import SemanticResponseCache
+from app.utils.questions import normalize_questions
+from app.config.settings import (
+    COHERE_MODEL,
+    DEFAULT_TOP_K,
+    DEFAULT_SCORE_THRESHOLD,
+    BATCH_CHAT_CONCURRENCY,
+    CONVERSATION_MAX_MESSAGES,
+    DECOMPOSITION_ROUTER_PATH,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_MAX_SIZE,
+    SEMANTIC_CACHE_TTL
+)
 
 logger = logging.getLogger("legal_chat_service")
 
+# Keywords that suggest complex legal questions needing decomposition
+DECOMPOSITION_KEYWORDS = [
+    "what constitutes", "elements of", "requirements for",
+    "how does", "process for", "procedure to", "what are the",
+    "legal framework", "comprehensive analysis", "detailed explanation"
+]
+
+# Keywords that suggest the question needs information beyond existing sources
+RESEARCH_KEYWORDS = [
+    "latest", "recent", "current", "up-to-date", "precedent",
+    "case law", "statute", "regulation", "specific section"
+]
+
+# Each keyword list is compiled into a single alternation so a question is scanned once.
+# Patterns are matched against the lowercased question, which callers compute once.
+_DECOMPOSITION_RE = re.compile("|".join(map(re.escape, DECOMPOSITION_KEYWORDS)))
+_RESEARCH_RE = re.compile("|".join(map(re.escape, RESEARCH_KEYWORDS)))
+
+# Number of top-ranked sources included in a prompt and cited in the response
+MAX_PROMPT_SOURCES = 5
+
+
+def _source_rank(source: LegalSource) -> Tuple[int, float]:
+    """Sort key placing high-priority, high-relevance sources first"""
+    return source.display_priority, -source.relevance_score
+
+
+def _rank_scores(count: int) -> List[float]:
+    """Simulated retrieval scores decaying by 0.1 per rank position"""
+    return (1.0 - 0.1 * np.arange(count, dtype=np.float64)).tolist()
+
+
+def _sources_from_questions(sub_questions: Any) -> List[LegalSource]:
+    """Create decomposition sources from sub-questions in any supported shape"""
+    return [
+        SourceFactory.from_decomposition_question(question, idx)
+        for idx, question in enumerate(normalize_questions(sub_questions))
+    ]
+
+
+# Per-request sink for streamed tokens; set inside the worker thread running the generator
+_stream_emitter: ContextVar[Optional[Callable[[str], None]]] = ContextVar("legal_chat_stream_emitter", default=None)
+
+
+def _dispatch_stream_chunk(chunk: StreamingChunk):
+    """Forward a streamed token to the emitter of the request that produced it"""
+    emit = _stream_emitter.get()
+    if emit is not None and chunk.content:
+        emit(chunk.content)
+
+# Static system prompts are kept byte-identical across turns so the provider can
+# reuse its cached prefix; per-turn sources go in the trailing user message.
+DIRECT_CHAT_SYSTEM_PROMPT = (
+    "You are an expert legal assistant specializing in Nigerian jurisprudence. "
+    "Provide accurate, well-researched legal information with proper citations. "
+    "Always specify when information is general guidance and recommend consulting with qualified legal counsel."
+)
+
+SOURCED_CHAT_SYSTEM_PROMPT = """You are an expert legal assistant specializing in Nigerian jurisprudence. \
+Use the provided sources to give accurate, well-cited legal information.
+
+Each user turn contains LEGAL SOURCES followed by the USER QUESTION. Based on those sources, \
+provide a comprehensive answer to the question.
+
+INSTRUCTIONS:
+1. Provide a detailed legal analysis addressing the user's question
+2. Use inline citations in the format [Source X] when referencing specific sources
+3. Clearly distinguish between different types of sources (statutes, cases, regulations)
+4. Highlight Nigerian legal authority when available
+5. Acknowledge any limitations in the available legal information
+6. Always conclude with a recommendation to consult qualified legal counsel for specific legal advice"""
+
+
+@lru_cache(maxsize=1)
+def _load_decomposition_router() -> Optional[Tuple[np.ndarray, float]]:
+    """
+    Load the linear decomposition router trained offline over dense question embeddings
+
+    Returns:
+        Tuple of (weights, bias), or None when no router is configured or it fails to load
+    """
+    if not DECOMPOSITION_ROUTER_PATH:
+        return None
+
+    try:
+        with np.load(DECOMPOSITION_ROUTER_PATH) as data:
+            weights = np.asarray(data["weights"], dtype=np.float32)
+            bias = float(data["bias"])
+        logger.info(f"Loaded decomposition router with {weights.shape[0]} features")
+        return weights, bias
+    except Exception as e:
+        logger.error(f"Failed to load decomposition router from {DECOMPOSITION_ROUTER_PATH}: {str(e)}")
+        return None
+
+
+def _normalize_question_text(question: str) -> str:
+    """Lowercase a question and collapse its whitespace, for exact-match cache keys"""
+    return " ".join(question.lower().split())
+
+
+def _new_conversation_id() -> str:
+    """Generate a compact conversation ID: a random UUID's 16 bytes as 22 URL-safe base64 characters"""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode("ascii")
+
+
+# Haystack message factory per stored role code
+_ROLE_CODES = {"user": "u", "assistant": "a", "system": "s"}
+_ROLE_NAMES = {code: role for role, code in _ROLE_CODES.items()}
+_ROLE_FACTORIES = {
+    "u": HaystackChatMessage.from_user,
+    "a": HaystackChatMessage.from_assistant,
+    "s": HaystackChatMessage.from_system
+}
+
+
+class Conversation:
+    """
+    Bounded conversation history stored as parallel columns.
+    Once max_messages is reached the oldest messages fall off, capping the context sent per turn.
+    """
+
+    __slots__ = ("roles", "contents", "timestamps")
+
+    def __init__(self, max_messages: int = CONVERSATION_MAX_MESSAGES):
+        self.roles: deque = deque(maxlen=max_messages)
+        self.contents: deque = deque(maxlen=max_messages)
+        self.timestamps: deque = deque(maxlen=max_messages)
+
+    def append(self, role: str, content: str, timestamp: datetime):
+        """Append a message; unknown roles are kept in history but never sent to the model"""
+        self.roles.append(_ROLE_CODES.get(role, role))
+        self.contents.append(content)
+        self.timestamps.append(timestamp)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def to_chat_messages(self) -> List[ChatMessage]:
+        """Materialize the history as ChatMessage models"""
+        return [
+            ChatMessage(role=_ROLE_NAMES.get(role, role), content=content, timestamp=timestamp)
+            for role, content, timestamp in zip(self.roles, self.contents, self.timestamps)
+        ]
+
+    def to_haystack_messages(self) -> List[HaystackChatMessage]:
+        """Convert the history to Haystack chat messages"""
+        return [
+            _ROLE_FACTORIES[role](content)
+            for role, content in zip(self.roles, self.contents)
+            if role in _ROLE_FACTORIES
+        ]
+
 
 class ConversationMemory:
     """Manages conversation state and history following single responsibility principle"""
 
     def __init__(self):
-        self.conversations: Dict[str, List[ChatMessage]] = {}
+        self.conversations: Dict[str, Conversation] = {}
         self.conversation_metadata: Dict[str, Dict[str, Any]] = {}
+        # One lock per conversation so concurrent turns don't interleave their history updates
+        self._locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
     def create_conversation(self) -> str:
         """Create a new conversation and return its ID"""
-        conversation_id = str(uuid.uuid4())
-        self.conversations[conversation_id] = []
+        conversation_id = _new_conversation_id()
+        now = datetime.now()
+        self.conversations[conversation_id] = Conversation()
         self.conversation_metadata[conversation_id] = {
-            "created_at": datetime.now(),
+            "created_at": now,
             "message_count": 0,
-            "last_updated": datetime.now(),
+            "last_updated": now,
             "context_sources": []
         }
         logger.info(f"Created new conversation: {conversation_id}")
         return conversation_id
 
-    def add_message(self, conversation_id: str, role: str, content: str, metadata: Dict = None):
-        """Add a message to the conversation"""
+    def add_message(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        metadata: Dict = None,
+        timestamp: Optional[datetime] = None
+    ):
+        """Add a message to the conversation, stamped with `timestamp` or the current time"""
         if conversation_id not in self.conversations:
             logger.warning(f"Conversation {conversation_id} not found")
             return
 
-        message = ChatMessage(
-            role=role,
-            content=content,
-            timestamp=datetime.now()
-        )
-
-        self.conversations[conversation_id].append(message)
-        self.conversation_metadata[conversation_id]["last_updated"] = datetime.now()
+        timestamp = timestamp or datetime.now()
+        self.conversations[conversation_id].append(role, content, timestamp)
+        self.conversation_metadata[conversation_id]["last_updated"] = timestamp
         self.conversation_metadata[conversation_id]["message_count"] += 1
 
         if metadata:
@@ -66,22 +250,26 @@ class ConversationMemory:
 
     def get_conversation(self, conversation_id: str) -> List[ChatMessage]:
         """Get conversation history"""
-        return self.conversations.get(conversation_id, [])
+        conversation = self.conversations.get(conversation_id)
+        return conversation.to_chat_messages() if conversation is not None else []
 
     def get_haystack_messages(self, conversation_id: str) -> List[HaystackChatMessage]:
         """Convert conversation to Haystack ChatMessage format"""
-        chat_messages = self.get_conversation(conversation_id)
-        haystack_messages = []
+        conversation = self.conversations.get(conversation_id)
+        return conversation.to_haystack_messages() if conversation is not None else []
+
+    def lock(self, conversation_id: str) -> asyncio.Lock:
+        """Get the lock serializing turns within a conversation"""
+        return self._locks[conversation_id]
 
-        for msg in chat_messages:
-            if msg.role == "user":
-                haystack_messages.append(HaystackChatMessage.from_user(msg.content))
-            elif msg.role == "assistant":
-                haystack_messages.append(HaystackChatMessage.from_assistant(msg.content))
-            elif msg.role == "system":
-                haystack_messages.append(HaystackChatMessage.from_system(msg.content))
+    def set_decomposition_sources(self, conversation_id: str, sources: List[LegalSource]):
+        """Keep materialized decomposition sources so follow-up turns reuse them by reference"""
+        if conversation_id in self.conversation_metadata:
+            self.conversation_metadata[conversation_id]["decomp_sources"] = sources
 
-        return haystack_messages
+    def get_decomposition_sources(self, conversation_id: str) -> List[LegalSource]:
+        """Get decomposition sources stored for a conversation"""
+        return self.conversation_metadata.get(conversation_id, {}).get("decomp_sources", [])
 
     def clear_conversation(self, conversation_id: str) -> bool:
         """Clear a conversation"""
@@ -89,6 +277,7 @@ class ConversationMemory:
             del self.conversations[conversation_id]
             if conversation_id in self.conversation_metadata:
                 del self.conversation_metadata[conversation_id]
+            self._locks.pop(conversation_id, None)
             return True
         return False
 
@@ -103,10 +292,31 @@ class LegalQueryChatService:
         self.memory = ConversationMemory()
         self.research_manager = get_legal_research_manager()
         self.chat_pipeline = self._create_chat_pipeline()
+        self.streaming_chat_pipeline = self._create_chat_pipeline(streaming_callback=_dispatch_stream_chunk)
+        self._share_cohere_clients(self.chat_pipeline, self.streaming_chat_pipeline)
+        self.response_cache = SemanticResponseCache(
+            threshold=SEMANTIC_CACHE_THRESHOLD,
+            max_size=SEMANTIC_CACHE_MAX_SIZE,
+            ttl_seconds=SEMANTIC_CACHE_TTL
+        )
+        # Opening responses keyed exactly by decomposition flag and normalized question, as
+        # (stored_at, response); a merely similar question may concern a different statute
+        self._opening_cache: "OrderedDict[str, Tuple[float, LegalChatResponse]]" = OrderedDict()
+
+        # Retrieval components are built once and reused by every follow-up question
+        self._document_store = get_document_store()
+        self._qdrant_retriever = QdrantHybridRetriever(
+            document_store=self._document_store,
+            top_k=DEFAULT_TOP_K,
+            score_threshold=DEFAULT_SCORE_THRESHOLD
+        )
+        self._hybrid_retriever = get_hybrid_retriever(self._qdrant_retriever)
+        self._dense_embedder = get_dense_embedder()
+        self._sparse_embedder = get_sparse_embedder()
         logger.info("LegalQueryChatService initialized")
 
-    def _create_chat_pipeline(self) -> CohereChatGenerator:
-        """Create Cohere chat generator directly"""
+    def _create_chat_pipeline(self, streaming_callback: Optional[Callable] = None) -> CohereChatGenerator:
+        """Create Cohere chat generator directly, optionally in streaming mode"""
         from haystack.utils import Secret
 
         # Get API key from settings
@@ -118,24 +328,64 @@ class LegalQueryChatService:
         # command-r7b-12-2024 is newer and more cost-effective than command-r-plus
         chat_generator = CohereChatGenerator(
             model="command-r7b-12-2024",  # Newer, more capable, and cost-effective
-            api_key=api_key
+            api_key=api_key,
+            streaming_callback=streaming_callback
         )
 
         return chat_generator
 
+    @staticmethod
+    def _share_cohere_clients(source: CohereChatGenerator, target: CohereChatGenerator):
+        """
+        Point target at the Cohere SDK clients of source so both generators reuse one
+        keep-alive connection pool instead of each paying its own TLS handshakes
+        """
+        for attr in ("client", "async_client"):
+            client = getattr(source, attr, None)
+            if client is not None and hasattr(target, attr):
+                setattr(target, attr, client)
+
     async def start_chat(self, initial_question: str, enable_decomposition: bool = True) -> LegalChatResponse:
         """
         Start a new chat session, optionally with initial decomposition
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         conversation_id = self.memory.create_conversation()
 
         try:
             # Step 1: Add user message to conversation
             self.memory.add_message(conversation_id, "user", initial_question)
 
-            # Step 2: Decide whether to use decomposition first
-            if enable_decomposition and self._should_use_decomposition(initial_question):
+            # Step 1b: Serve repeated questions from the opening-response cache. Only the same
+            # question matches, so one about a different statute, section or jurisdiction
+            # never receives another question's answer
+            cache_key = f"{enable_decomposition}:{_normalize_question_text(initial_question)}"
+            cached = self._lookup_opening_response(cache_key)
+            if cached is not None:
+                processing_time = time.perf_counter() - start_time
+                response = cached.model_copy(update={
+                    "conversation_id": conversation_id,
+                    "timestamp": datetime.now(),
+                    "processing_time_seconds": processing_time
+                })
+                # Opening responses carry exactly the decomposition sources (direct chat has none),
+                # so follow-ups in the new conversation keep that context
+                if response.sources:
+                    self.memory.set_decomposition_sources(conversation_id, list(response.sources))
+                self.memory.add_message(
+                    conversation_id, "assistant", response.response,
+                    {"sources_used": len(response.sources), "processing_time": processing_time, "cache_hit": True},
+                    timestamp=response.timestamp
+                )
+                logger.info(f"Chat session {conversation_id} served from response cache in {processing_time:.2f}s")
+                return response
+
+            # Step 2: Decide whether to use decomposition first. The embedding only feeds the
+            # learned router, so it is skipped when no router is configured
+            question_embedding = None
+            if enable_decomposition and _load_decomposition_router() is not None:
+                question_embedding = await self._embed_question(initial_question)
+            if enable_decomposition and self._should_use_decomposition(initial_question.lower(), question_embedding):
                 logger.info(f"Using decomposition for initial question: {initial_question[:50]}...")
 
                 # Use existing decomposition pipeline
@@ -153,6 +403,7 @@ class LegalQueryChatService:
 
                 # Convert decomposition result to sources
                 sources = self._create_sources_from_decomposition(decomp_result)
+                self.memory.set_decomposition_sources(conversation_id, sources)
 
                 # Create context-aware response
                 response = await self._generate_response_from_decomposition(
@@ -167,19 +418,25 @@ class LegalQueryChatService:
                 )
                 sources = []
 
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
 
             # Add assistant response to conversation
             self.memory.add_message(
                 conversation_id, "assistant", response.response,
-                {"sources_used": len(sources), "processing_time": processing_time}
+                {"sources_used": len(sources), "processing_time": processing_time},
+                timestamp=response.timestamp
             )
 
             response.processing_time_seconds = processing_time
+            self._store_opening_response(cache_key, response)
             logger.info(f"Chat session {conversation_id} completed in {processing_time:.2f}s")
 
             return response
 
+        except asyncio.CancelledError:
+            # The caller abandoned this session, so don't leave a half-built conversation behind
+            self.memory.clear_conversation(conversation_id)
+            raise
         except Exception as e:
             logger.error(f"Chat session failed: {str(e)}")
             error_response = LegalChatResponse(
@@ -187,7 +444,7 @@ class LegalQueryChatService:
                 sources=[],
                 conversation_id=conversation_id,
                 timestamp=datetime.now(),
-                processing_time_seconds=(datetime.now() - start_time).total_seconds()
+                processing_time_seconds=time.perf_counter() - start_time
             )
             return error_response
 
@@ -200,237 +457,454 @@ class LegalQueryChatService:
         """
         Continue an existing chat conversation
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         if conversation_id not in self.memory.conversations:
             logger.warning(f"Conversation {conversation_id} not found, creating new one")
             return await self.start_chat(question)
 
-        try:
-            # Add user message
-            self.memory.add_message(conversation_id, "user", question)
+        # Turns in the same conversation run one at a time; other conversations proceed in parallel
+        async with self.memory.lock(conversation_id):
+            try:
+                # Scope the semantic cache to the last exchange and the normalized question, so answers
+                # don't bleed across conversations or onto a similar question about another provision.
+                # The one embedding serves both the cache lookup and document retrieval
+                cache_scope = f"{self._conversation_cache_scope(conversation_id)}:{_normalize_question_text(question)}"
+                question_embedding = await self._embed_question(question)
+                cached = self._lookup_cached_response(question_embedding, cache_scope)
+
+                # Add user message
+                self.memory.add_message(conversation_id, "user", question)
+
+                if cached is not None:
+                    response = cached.model_copy(update={
+                        "conversation_id": conversation_id,
+                        "timestamp": datetime.now(),
+                        "processing_time_seconds": time.perf_counter() - start_time
+                    })
+                    self.memory.add_message(
+                        conversation_id, "assistant", response.response,
+                        {
+                            "sources_used": len(response.sources),
+                            "external_research": response.external_research_used,
+                            "processing_time": response.processing_time_seconds,
+                            "cache_hit": True
+                        },
+                        timestamp=response.timestamp
+                    )
+                    logger.info(f"Chat response for {conversation_id} served from semantic cache")
+                    return response
 
-            # Get conversation history
-            hay_messages = self.memory.get_haystack_messages(conversation_id)
+                # Get conversation history
+                hay_messages = self.memory.get_haystack_messages(conversation_id)
 
-            # Collect sources from various origins
-            all_sources = []
-            tool_calls = []
+                # Steps 1-3: Collect sources from decomposition context, documents and external research
+                all_sources, tool_calls = await self._collect_followup_sources(
+                    question, conversation_id, previous_decomposition_context, question_embedding
+                )
 
-            # Step 1: Use previous decomposition context if available
-            if previous_decomposition_context:
-                decomp_sources = self._create_sources_from_decomposition_context(
-                    previous_decomposition_context
+                # Step 4: Generate response with sources
+                response = await self._generate_sourced_response(
+                    question, all_sources, hay_messages, conversation_id
                 )
-                all_sources.extend(decomp_sources)
 
-            # Step 2: Retrieve relevant legal documents
-            doc_sources = await self._retrieve_document_sources(question)
-            all_sources.extend(doc_sources)
-
-            # Step 3: Conduct external research if needed
-            if self._needs_external_research(question, all_sources):
-                external_sources, external_tools = await self._conduct_external_research(question)
-                all_sources.extend(external_sources)
-                tool_calls.extend(external_tools)
-
-            # Step 4: Generate response with sources
-            response = await self._generate_sourced_response(
-                question, all_sources, hay_messages, conversation_id
+                # Add tool calls to response
+                response.tools_called = tool_calls
+                response.external_research_used = len(tool_calls) > 0
+                response.processing_time_seconds = time.perf_counter() - start_time
+
+                # Add assistant response to conversation
+                self.memory.add_message(
+                    conversation_id, "assistant", response.response,
+                    {
+                        "sources_used": len(all_sources),
+                        "external_research": response.external_research_used,
+                        "processing_time": response.processing_time_seconds
+                    },
+                    timestamp=response.timestamp
+                )
+                self._store_cached_response(question_embedding, response, cache_scope)
+
+                logger.info(f"Chat response generated for {conversation_id} in {response.processing_time_seconds:.2f}s")
+                return response
+
+            except Exception as e:
+                logger.error(f"Continue chat failed: {str(e)}")
+                error_response = LegalChatResponse(
+                    response=f"I apologize, but I encountered an error: {str(e)}",
+                    sources=[],
+                    conversation_id=conversation_id,
+                    timestamp=datetime.now(),
+                    processing_time_seconds=time.perf_counter() - start_time
+                )
+                return error_response
+
+    async def batch_chat(
+        self,
+        questions: List[str],
+        enable_decomposition: bool = True
+    ) -> List[LegalChatResponse]:
+        """
+        Answer many independent questions, each in its own conversation.
+        Library entry point for offline callers such as evaluation runs; not exposed over HTTP.
+
+        Args:
+            questions: Questions to answer
+            enable_decomposition: Whether complex questions may use the decomposition pipeline
+
+        Returns:
+            One LegalChatResponse per question, in input order
+        """
+        # Bound in-flight requests so a large backlog doesn't trip provider rate limits
+        semaphore = asyncio.Semaphore(BATCH_CHAT_CONCURRENCY)
+
+        async def answer(question: str) -> LegalChatResponse:
+            async with semaphore:
+                return await self.start_chat(question, enable_decomposition)
+
+        logger.info(f"Running batch chat for {len(questions)} questions")
+        return await asyncio.gather(*(answer(question) for question in questions))
+
+    async def start_chat_stream(
+        self,
+        initial_question: str,
+        enable_decomposition: bool = True
+    ) -> AsyncIterator[LegalChatResponseChunk]:
+        """
+        Start a new chat session, streaming the response as it is generated
+
+        Args:
+            initial_question: The user's first question
+            enable_decomposition: Whether complex questions may use the decomposition pipeline
+
+        Yields:
+            Text chunks, followed by a final chunk carrying the complete LegalChatResponse
+        """
+        start_time = time.perf_counter()
+        conversation_id = self.memory.create_conversation()
+        self.memory.add_message(conversation_id, "user", initial_question)
+
+        if enable_decomposition and self._should_use_decomposition(initial_question.lower()):
+            # The decomposition pipeline does not stream, so its answer arrives as one chunk
+            decomp_result = await process_question(initial_question)
+            if not isinstance(decomp_result, dict):
+                decomp_result = {"answer": "Error processing question", "sub_questions": None, "document_metadata": []}
+            sources = self._create_sources_from_decomposition(decomp_result)
+            self.memory.set_decomposition_sources(conversation_id, sources)
+            response = await self._generate_response_from_decomposition(
+                initial_question, decomp_result, sources, conversation_id
+            )
+            yield LegalChatResponseChunk(conversation_id=conversation_id, delta=response.response)
+        else:
+            sources = []
+            parts = []
+            async for delta in self._stream_reply(self._build_direct_messages(initial_question)):
+                parts.append(delta)
+                yield LegalChatResponseChunk(conversation_id=conversation_id, delta=delta)
+            response = LegalChatResponse(
+                response="".join(parts) or "I'm unable to provide a response.",
+                sources=[],
+                conversation_id=conversation_id,
+                timestamp=datetime.now(),
+                previous_decomposition_used=False
             )
 
-            # Add tool calls to response
-            response.tools_called = tool_calls
-            response.external_research_used = len(tool_calls) > 0
-            response.processing_time_seconds = (datetime.now() - start_time).total_seconds()
+        response.processing_time_seconds = time.perf_counter() - start_time
+        self.memory.add_message(
+            conversation_id, "assistant", response.response,
+            {"sources_used": len(sources), "processing_time": response.processing_time_seconds},
+            timestamp=response.timestamp
+        )
+        yield LegalChatResponseChunk(conversation_id=conversation_id, done=True, response=response)
 
-            # Add assistant response to conversation
+    async def continue_chat_stream(
+        self,
+        question: str,
+        conversation_id: str,
+        previous_decomposition_context: Optional[Dict] = None
+    ) -> AsyncIterator[LegalChatResponseChunk]:
+        """
+        Continue an existing chat conversation, streaming the response as it is generated
+
+        Args:
+            question: The follow-up question
+            conversation_id: Conversation to continue
+            previous_decomposition_context: Optional decomposition results to draw sources from
+
+        Yields:
+            Text chunks, followed by a final chunk carrying the complete LegalChatResponse
+        """
+        if conversation_id not in self.memory.conversations:
+            logger.warning(f"Conversation {conversation_id} not found, creating new one")
+            async for chunk in self.start_chat_stream(question):
+                yield chunk
+            return
+
+        async with self.memory.lock(conversation_id):
+            start_time = time.perf_counter()
+            self.memory.add_message(conversation_id, "user", question)
+            hay_messages = self.memory.get_haystack_messages(conversation_id)
+
+            all_sources, tool_calls = await self._collect_followup_sources(
+                question, conversation_id, previous_decomposition_context
+            )
+            messages, top_sources = self._build_sourced_messages(question, all_sources, hay_messages)
+
+            parts = []
+            async for delta in self._stream_reply(messages):
+                parts.append(delta)
+                yield LegalChatResponseChunk(conversation_id=conversation_id, delta=delta)
+
+            response = LegalChatResponse(
+                response="".join(parts) or "I'm unable to provide a response.",
+                sources=top_sources,
+                conversation_id=conversation_id,
+                timestamp=datetime.now(),
+                tools_called=tool_calls,
+                external_research_used=len(tool_calls) > 0,
+                processing_time_seconds=time.perf_counter() - start_time
+            )
+
+            # Persist the reply once the stream has completed
             self.memory.add_message(
                 conversation_id, "assistant", response.response,
                 {
                     "sources_used": len(all_sources),
                     "external_research": response.external_research_used,
                     "processing_time": response.processing_time_seconds
-                }
+                },
+                timestamp=response.timestamp
             )
+            yield LegalChatResponseChunk(conversation_id=conversation_id, done=True, response=response)
 
-            logger.info(f"Chat response generated for {conversation_id} in {response.processing_time_seconds:.2f}s")
-            return response
+    async def _stream_reply(self, messages: List[HaystackChatMessage]) -> AsyncIterator[str]:
+        """
+        Run the streaming generator in a worker thread and yield tokens as they arrive
 
-        except Exception as e:
-            logger.error(f"Continue chat failed: {str(e)}")
-            error_response = LegalChatResponse(
-                response=f"I apologize, but I encountered an error: {str(e)}",
-                sources=[],
-                conversation_id=conversation_id,
-                timestamp=datetime.now(),
-                processing_time_seconds=(datetime.now() - start_time).total_seconds()
-            )
-            return error_response
+        Args:
+            messages: Chat messages to send to the generator
 
-    def _should_use_decomposition(self, question: str) -> bool:
-        """Determine if question should be decomposed"""
+        Yields:
+            Generated text fragments in order
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def run_generator():
+            token = _stream_emitter.set(lambda text: loop.call_soon_threadsafe(queue.put_nowait, text))
+            try:
+                return self.streaming_chat_pipeline.run(messages=messages)
+            finally:
+                _stream_emitter.reset(token)
+
+        generation = asyncio.create_task(asyncio.to_thread(run_generator))
+        # Tokens are queued via call_soon_threadsafe before the task completes, so the sentinel comes last
+        generation.add_done_callback(lambda _: queue.put_nowait(None))
+
+        while True:
+            delta = await queue.get()
+            if delta is None:
+                break
+            yield delta
+
+        # Surface generator errors to the caller
+        await generation
+
+    async def _collect_followup_sources(
+        self,
+        question: str,
+        conversation_id: str,
+        previous_decomposition_context: Optional[Dict] = None,
+        dense_embedding: Optional[List[float]] = None
+    ) -> Tuple[List[LegalSource], List[ToolCallResult]]:
+        """
+        Gather sources for a follow-up question from decomposition context, documents and research tools
+
+        Args:
+            question: The follow-up question
+            conversation_id: Conversation whose stored decomposition sources are reused
+            previous_decomposition_context: Decomposition results to parse when none are stored
+            dense_embedding: Dense embedding of the question, if the caller already computed it
+
+        Returns:
+            Tuple of (all sources, tool calls made)
+        """
+        all_sources = []
+        tool_calls = []
         question_lower = question.lower()
 
-        # Keywords that suggest complex legal questions needing decomposition
-        decomp_keywords = [
-            "what constitutes", "elements of", "requirements for",
-            "how does", "process for", "procedure to", "what are the",
-            "legal framework", "comprehensive analysis", "detailed explanation"
-        ]
+        # Start document retrieval, and external research alongside it only when the research
+        # keywords already make it certain to be needed; otherwise it waits for the retrieved sources
+        doc_task = asyncio.create_task(self._retrieve_document_sources(question, dense_embedding))
+        ext_task = None
+        if _RESEARCH_RE.search(question_lower) is not None:
+            ext_task = asyncio.create_task(self._conduct_external_research(question))
 
-        # Check if any decomp keywords are present
-        for keyword in decomp_keywords:
-            if keyword in question_lower:
-                return True
+        try:
+            # Step 1: Reuse decomposition sources materialized earlier in the conversation,
+            # parsing the passed context only when none were stored
+            decomp_sources = self.memory.get_decomposition_sources(conversation_id)
+            if not decomp_sources and previous_decomposition_context:
+                decomp_sources = self._create_sources_from_decomposition_context(
+                    previous_decomposition_context
+                )
+                self.memory.set_decomposition_sources(conversation_id, decomp_sources)
+            all_sources.extend(decomp_sources)
 
-        # Also check question length - longer questions might need decomposition
-        if len(question) > 100:
-            return True
+            # Step 2: Retrieve relevant legal documents
+            doc_sources = await doc_task
+        except BaseException:
+            doc_task.cancel()
+            if ext_task is not None:
+                ext_task.cancel()
+            raise
+        all_sources.extend(doc_sources)
+
+        # Step 3: Conduct external research if needed (always, once it was started above)
+        if ext_task is not None or self._needs_external_research(question_lower, all_sources):
+            external_sources, external_tools = await (ext_task or self._conduct_external_research(question))
+            all_sources.extend(external_sources)
+            tool_calls.extend(external_tools)
+
+        return all_sources, tool_calls
+
+    async def _embed_question(self, question: str) -> Optional[List[float]]:
+        """Embed a question for semantic caching and routing, returning None if unavailable"""
+        if not SEMANTIC_CACHE_ENABLED and _load_decomposition_router() is None:
+            return None
 
-        return False
+        try:
+            result = await self._dense_embedder.run_async(Questions(questions=[Question(question=question)]))
+            embeddings = result.get("embeddings", [])
+            return embeddings[0] if embeddings else None
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {str(e)}")
+            return None
+
+    def _lookup_cached_response(self, embedding: Optional[List[float]], scope: str) -> Optional[LegalChatResponse]:
+        """Return a cached response for a semantically similar question, if any"""
+        if embedding is None:
+            return None
+        return self.response_cache.lookup(embedding, scope)
+
+    def _store_cached_response(self, embedding: Optional[List[float]], response: LegalChatResponse, scope: str):
+        """Cache a successful response under its question embedding"""
+        if embedding is None:
+            return
+        self.response_cache.store(embedding, response.model_copy(deep=True), scope)
 
-    def _create_sources_from_decomposition(self, decomp_result: Dict) -> List[LegalSource]:
-        """Create sources from decomposition pipeline results"""
-        sources = []
+    def _lookup_opening_response(self, cache_key: str) -> Optional[LegalChatResponse]:
+        """Return the cached opening response for the same question, dropping it once expired"""
+        if not SEMANTIC_CACHE_ENABLED:
+            return None
+
+        entry = self._opening_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        if time.monotonic() - entry[0] >= SEMANTIC_CACHE_TTL:
+            del self._opening_cache[cache_key]
+            return None
 
-        logger.debug(f"DEBUG: decomp_result type: {type(decomp_result)}")
-        logger.debug(f"DEBUG: decomp_result keys: {decomp_result.keys() if isinstance(decomp_result, dict) else 'Not a dict'}")
+        self._opening_cache.move_to_end(cache_key)
+        return entry[1]
+
+    def _store_opening_response(self, cache_key: str, response: LegalChatResponse):
+        """Cache a successful opening response, evicting the least recently used"""
+        if not SEMANTIC_CACHE_ENABLED:
+            return
+
+        self._opening_cache[cache_key] = (time.monotonic(), response.model_copy(deep=True))
+        self._opening_cache.move_to_end(cache_key)
+        while len(self._opening_cache) > SEMANTIC_CACHE_MAX_SIZE:
+            self._opening_cache.popitem(last=False)
+
+    def _conversation_cache_scope(self, conversation_id: str) -> str:
+        """Hash the last two turns of a conversation into a semantic cache scope"""
+        conversation = self.memory.conversations[conversation_id]
+        start = max(len(conversation) - 2, 0)
+        digest = hashlib.blake2b(digest_size=16)
+        for idx in range(start, len(conversation)):
+            digest.update(f"{conversation.roles[idx]}\x00{conversation.contents[idx]}\x00".encode("utf-8"))
+        return f"continue:{digest.hexdigest()}"
+
+    def _should_use_decomposition(self, question_lower: str, embedding: Optional[List[float]] = None) -> bool:
+        """
+        Determine if question should be decomposed
+
+        Args:
+            question_lower: The lowercased question
+            embedding: Dense embedding of the question, used by the learned router when configured
+
+        Returns:
+            True if the question should go through the decomposition pipeline
+        """
+        # Prefer the learned router: a single dot product over the embedding we already have
+        router = _load_decomposition_router()
+        if router is not None and embedding is not None:
+            weights, bias = router
+            if weights.shape[0] == len(embedding):
+                return float(weights @ np.asarray(embedding, dtype=np.float32) + bias) > 0
 
+        # Longer questions might need decomposition; otherwise look for decomposition keywords
+        return len(question_lower) > 100 or _DECOMPOSITION_RE.search(question_lower) is not None
+
+    def _create_sources_from_decomposition(self, decomp_result: Dict) -> List[LegalSource]:
+        """Create sources from decomposition pipeline results"""
         # Handle sub_questions - decomp_result is a dict from pipeline
         if not isinstance(decomp_result, dict):
-            logger.error(f"ERROR: Expected dict but got {type(decomp_result)}")
-            return sources
+            logger.error("Expected dict but got %s", type(decomp_result))
+            return []
 
-        sub_questions_data = decomp_result.get("sub_questions")
-        logger.debug(f"DEBUG: sub_questions_data type: {type(sub_questions_data)}")
-
-        if sub_questions_data:
-            # Check if sub_questions is a Questions object (has 'questions' attribute)
-            if hasattr(sub_questions_data, 'questions'):
-                logger.debug("DEBUG: sub_questions is a Questions object")
-                questions_list = sub_questions_data.questions
-            elif isinstance(sub_questions_data, dict):
-                logger.debug("DEBUG: sub_questions is a dict")
-                # If it's a dict, get the questions list
-                questions_list = sub_questions_data.get("questions", [])
-            elif hasattr(sub_questions_data, 'content') and hasattr(sub_questions_data, 'role'):
-                # It's a ChatMessage object - this shouldn't happen but handle it gracefully
-                logger.warning(f"DEBUG: sub_questions is a ChatMessage object - this is unexpected")
-                questions_list = []
-            else:
-                logger.debug(f"DEBUG: sub_questions is type: {type(sub_questions_data)}")
-                # If it's a list directly, use it as is
-                questions_list = sub_questions_data if isinstance(sub_questions_data, list) else []
-
-            logger.debug(f"DEBUG: questions_list type: {type(questions_list)}, length: {len(questions_list) if hasattr(questions_list, '__len__') else 'unknown'}")
-
-            for idx, question in enumerate(questions_list):
-                logger.debug(f"DEBUG: question {idx} type: {type(question)}")
-                # Handle both Question objects and dict formats
-                if hasattr(question, 'question'):
-                    source = SourceFactory.from_decomposition_question(question, idx)
-                    sources.append(source)
-                elif isinstance(question, dict) and "question" in question:
-                    logger.debug("DEBUG: Converting dict question to Question object")
-                    # Convert dict to Question object
-                    from app.models import Question
-                    q_obj = Question(
-                        question=question.get("question", ""),
-                        answer=question.get("answer")
-                    )
-                    source = SourceFactory.from_decomposition_question(q_obj, idx)
-                    sources.append(source)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("decomp_result keys: %s", list(decomp_result.keys()))
+
+        sources = _sources_from_questions(decomp_result.get("sub_questions"))
 
         # Add document sources from decomposition
         document_metadata = decomp_result.get("document_metadata", [])
-        logger.debug(f"DEBUG: document_metadata count: {len(document_metadata)}")
-
         for doc_meta in document_metadata:
-            source = SourceFactory.from_decomposition_result(doc_meta)
-            sources.append(source)
+            sources.append(SourceFactory.from_decomposition_result(doc_meta))
 
-        logger.debug(f"DEBUG: Created {len(sources)} sources")
+        logger.debug("Created %d sources (%d documents)", len(sources), len(document_metadata))
         return sources
 
     def _create_sources_from_decomposition_context(self, context: Dict) -> List[LegalSource]:
         """Create sources from previous decomposition context"""
-        sources = []
-
-        # Convert context to sources
-        if "sub_questions" in context:
-            sub_questions = context["sub_questions"]
-
-            # Handle different types of sub_questions
-            questions_list = []
-            if hasattr(sub_questions, 'questions'):
-                # It's a Questions object
-                questions_list = sub_questions.questions
-            elif isinstance(sub_questions, dict):
-                # It's a dictionary
-                questions_list = sub_questions.get("questions", [])
-            elif isinstance(sub_questions, list):
-                # It's already a list
-                questions_list = sub_questions
-
-            for idx, question_data in enumerate(questions_list):
-                if isinstance(question_data, dict):
-                    from app.models import Question
-                    question = Question(
-                        question=question_data.get("question", ""),
-                        answer=question_data.get("answer")
-                    )
-                    source = SourceFactory.from_decomposition_question(question, idx)
-                    sources.append(source)
-                elif hasattr(question_data, 'question'):
-                    # It's already a Question object
-                    source = SourceFactory.from_decomposition_question(question_data, idx)
-                    sources.append(source)
-
-        if "document_metadata" in context:
-            for doc_meta in context["document_metadata"]:
-                source = SourceFactory.from_decomposition_result(doc_meta)
-                sources.append(source)
+        sources = _sources_from_questions(context.get("sub_questions"))
+
+        for doc_meta in context.get("document_metadata", []):
+            sources.append(SourceFactory.from_decomposition_result(doc_meta))
 
         return sources
 
-    async def _retrieve_document_sources(self, question: str) -> List[LegalSource]:
-        """Retrieve relevant legal documents as sources using hybrid retrieval"""
+    async def _retrieve_document_sources(
+        self,
+        question: str,
+        dense_embedding: Optional[List[float]] = None
+    ) -> List[LegalSource]:
+        """Retrieve relevant legal documents as sources using hybrid retrieval, reusing a given dense embedding"""
         try:
             logger.info(f"Retrieving documents for: {question[:50]}...")
 
-            # Import required components
-            from app.components.embedders import get_dense_embedder, get_sparse_embedder
-            from app.components.retrievers import get_hybrid_retriever
-            from app.document_store.store import get_document_store
-            from app.models import Questions, Question
-            from haystack_integrations.components.retrievers.qdrant import QdrantHybridRetriever
-            from app.config.settings import DEFAULT_TOP_K, DEFAULT_SCORE_THRESHOLD
-
-            # Create document store and retriever
-            document_store = get_document_store()
-            qdrant_retriever = QdrantHybridRetriever(
-                document_store=document_store,
-                top_k=DEFAULT_TOP_K,
-                score_threshold=DEFAULT_SCORE_THRESHOLD
-            )
-            hybrid_retriever = get_hybrid_retriever(qdrant_retriever)
-
             # Create a single-question wrapper for the retriever
             single_question = Questions(questions=[Question(question=question)])
 
-            # Get embedders
-            dense_embedder = get_dense_embedder()
-            sparse_embedder = get_sparse_embedder()
-
-            # Generate embeddings
-            dense_result = await dense_embedder.run_async(single_question)
-            sparse_result = await sparse_embedder.run_async(single_question)
+            # Generate the missing embeddings, concurrently when both are needed
+            if dense_embedding is not None:
+                dense_embeddings = [dense_embedding]
+                sparse_result = await self._sparse_embedder.run_async(single_question)
+            else:
+                dense_result, sparse_result = await asyncio.gather(
+                    self._dense_embedder.run_async(single_question),
+                    self._sparse_embedder.run_async(single_question)
+                )
+                dense_embeddings = dense_result["embeddings"]
 
             # Perform hybrid retrieval
-            retrieval_result = await hybrid_retriever.run_async(
+            retrieval_result = await self._hybrid_retriever.run_async(
                 queries=single_question,
-                dense_embeddings=dense_result["embeddings"],
+                dense_embeddings=dense_embeddings,
                 sparse_embeddings=sparse_result["sparse_embeddings"],
                 top_k=DEFAULT_TOP_K
             )
@@ -441,18 +915,22 @@ class LegalQueryChatService:
 
             for pair in question_context_pairs:
                 if "documents" in pair and pair["documents"]:
-                    for doc_idx, doc in enumerate(pair["documents"]):
+                    documents = pair["documents"]
+                    # Simulated relevance scores by rank, computed for the whole batch at once
+                    scores = _rank_scores(len(documents))
+
+                    for doc, score in zip(documents, scores):
                         # Extract metadata from document
                         metadata = doc.get("metadata", {})
                         content = doc.get("content", "")
 
                         # Create LegalSource using existing SourceFactory method
                         # Enhance metadata with content and score
-                        enhanced_metadata = metadata.copy()
-                        enhanced_metadata.update({
+                        enhanced_metadata = {
+                            **metadata,
                             "content_preview": content[:200] if content else "",
-                            "retrieval_score": 1.0 - (doc_idx * 0.1)  # Simulate relevance score
-                        })
+                            "retrieval_score": score
+                        }
 
                         source = SourceFactory.from_decomposition_result(enhanced_metadata)
                         sources.append(source)
@@ -464,59 +942,28 @@ class LegalQueryChatService:
             logger.error(f"Document retrieval failed: {str(e)}", exc_info=True)
             return []
 
-    def _needs_external_research(self, question: str, existing_sources: List[LegalSource]) -> bool:
-        """Determine if external research is needed"""
+    def _needs_external_research(self, question_lower: str, existing_sources: List[LegalSource]) -> bool:
+        """Determine if external research is needed for a lowercased question"""
         if not existing_sources:
             return True
 
         # If question asks for specific legal information not in existing sources
-        question_lower = question.lower()
-        research_keywords = [
-            "latest", "recent", "current", "up-to-date", "precedent",
-            "case law", "statute", "regulation", "specific section"
-        ]
-
-        return any(keyword in question_lower for keyword in research_keywords)
+        return _RESEARCH_RE.search(question_lower) is not None
 
     async def _conduct_external_research(self, question: str) -> Tuple[List[LegalSource], List[ToolCallResult]]:
         """Conduct external legal research"""
+        # Relevant tools run concurrently under the manager's concurrency cap
+        all_tool_calls = await self.research_manager.call_tools(question)
+
         all_sources = []
-        all_tool_calls = []
-
-        # Get relevant tools for the query
-        relevant_tools = self.research_manager.get_tools_for_query(question)
-
-        # Execute tools in parallel
-        tasks = []
-        for tool in relevant_tools:
-            # Prepare tool arguments based on query
-            args = self._prepare_tool_arguments(tool.name, question)
-            if args:
-                task = tool.call(**args)
-                tasks.append(task)
-
-        if tasks:
-            tool_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for result in tool_results:
-                if isinstance(result, ToolCallResult):
-                    all_tool_calls.append(result)
-                    all_sources.extend(result.sources_generated)
-                elif isinstance(result, Exception):
-                    logger.error(f"Tool execution failed: {str(result)}")
+        for result in all_tool_calls:
+            all_sources.extend(result.sources_generated)
 
         return all_sources, all_tool_calls
 
     def _prepare_tool_arguments(self, tool_name: str, question: str) -> Dict[str, Any]:
-        """Prepare arguments for tool execution"""
-        base_args = {"query": question} if tool_name == "search_nigerian_statutes" else {}
-
-        if tool_name == "search_case_precedents":
-            base_args = {"legal_issue": question}
-        elif tool_name == "search_regulations":
-            base_args = {"industry": question}  # This is simplified
-
-        return base_args
+        """Prepare arguments for tool execution; unknown tools get no arguments and are skipped"""
+        return self.research_manager.build_tool_arguments(tool_name, question)
 
     async def _generate_response_from_decomposition(
         self,
@@ -544,25 +991,11 @@ class LegalQueryChatService:
     async def _direct_chat_response(self, question: str, conversation_id: str) -> LegalChatResponse:
         """Generate direct chat response without decomposition"""
 
-        # Create system message
-        system_message = HaystackChatMessage.from_system(
-            "You are an expert legal assistant specializing in Nigerian jurisprudence. "
-            "Provide accurate, well-researched legal information with proper citations. "
-            "Always specify when information is general guidance and recommend consulting with qualified legal counsel."
-        )
-
-        # Create user message
-        user_message = HaystackChatMessage.from_user(question)
-
-        # Generate response - chat_pipeline is now a CohereChatGenerator directly
-        messages = [system_message, user_message]
-        result = self.chat_pipeline.run(messages=messages)
-
-        # Handle both dictionary and object response formats
-        if isinstance(result, dict):
-            response_text = result.get("replies", [{}])[0].get("text", "I'm unable to provide a response.") if result.get("replies") else "I'm unable to provide a response."
-        else:
-            response_text = result.replies[0].text if result.replies else "I'm unable to provide a response."
+        # Generate response - chat_pipeline is now a CohereChatGenerator directly.
+        # The generator is synchronous, so run it in a worker thread to keep the event loop free
+        messages = self._build_direct_messages(question)
+        result = await asyncio.to_thread(self.chat_pipeline.run, messages=messages)
+        response_text = self._extract_reply_text(result)
 
         return LegalChatResponse(
             response=response_text,
@@ -580,82 +1013,86 @@ class LegalQueryChatService:
         conversation_id: str
     ) -> LegalChatResponse:
         """Generate response with comprehensive source citations"""
+        messages, sorted_sources = self._build_sourced_messages(question, sources, conversation_history)
+
+        # Generate response using the direct generator, off the event loop
+        result = await asyncio.to_thread(self.chat_pipeline.run, messages=messages)
+        response_text = self._extract_reply_text(result)
+
+        return LegalChatResponse(
+            response=response_text,
+            sources=sorted_sources,
+            conversation_id=conversation_id,
+            timestamp=datetime.now()
+        )
 
+    def _build_direct_messages(self, question: str) -> List[HaystackChatMessage]:
+        """Build the message list for a direct chat response"""
+        return [
+            HaystackChatMessage.from_system(DIRECT_CHAT_SYSTEM_PROMPT),
+            HaystackChatMessage.from_user(question)
+        ]
+
+    def _build_sourced_messages(
+        self,
+        question: str,
+        sources: List[LegalSource],
+        conversation_history: List[HaystackChatMessage]
+    ) -> Tuple[List[HaystackChatMessage], List[LegalSource]]:
+        """
+        Build the message list for a sourced response
+
+        Returns:
+            Tuple of (messages, top sources ordered by display priority and relevance)
+        """
         # Sort sources by relevance and display priority
-        sorted_sources = sorted(
+        sorted_sources = heapq.nsmallest(
+            MAX_PROMPT_SOURCES,
             sources,
-            key=lambda x: (x.display_priority, -x.relevance_score)
+            key=_source_rank
         )
 
         # Create a comprehensive prompt with sources
-        sources_text = ""
-        for idx, source in enumerate(sorted_sources[:5]):  # Limit to top 5 sources
-            sources_text += f"[{idx+1}] {source.title}\n"
+        parts = []
+        for idx, source in enumerate(sorted_sources):
+            parts.append(f"[{idx+1}] {source.title}\n")
             if source.citation:
-                sources_text += f"Citation: {source.citation}\n"
+                parts.append(f"Citation: {source.citation}\n")
             if source.jurisdiction:
-                sources_text += f"Jurisdiction: {source.jurisdiction}\n"
+                parts.append(f"Jurisdiction: {source.jurisdiction}\n")
             if source.year:
-                sources_text += f"Year: {source.year}\n"
-            sources_text += f"Content: {source.content_preview}\n\n"
-
-        prompt = f"""Based on the legal sources below, please provide a comprehensive answer to the user's question.
-
-USER QUESTION: {question}
-
-LEGAL SOURCES:
-{sources_text}
-
-INSTRUCTIONS:
-1. Provide a detailed legal analysis addressing the user's question
-2. Use inline citations in the format [Source X] when referencing specific sources
-3. Clearly distinguish between different types of sources (statutes, cases, regulations)
-4. Highlight Nigerian legal authority when available
-5. Acknowledge any limitations in the available legal information
-6. Always conclude with a recommendation to consult qualified legal counsel for specific legal advice
+                parts.append(f"Year: {source.year}\n")
+            parts.append(f"Content: {source.content_preview}\n\n")
+        sources_text = "".join(parts)
 
-ANSWER:"""
+        prompt = f"LEGAL SOURCES:\n{sources_text}\nUSER QUESTION: {question}"
 
-        # Add system message if not in conversation history
-        if not any(msg.role == "system" for msg in conversation_history):
-            system_message = HaystackChatMessage.from_system(
-                "You are an expert legal assistant specializing in Nigerian jurisprudence. "
-                "Use the provided sources to give accurate, well-cited legal information."
-            )
-            conversation_history = [system_message] + conversation_history
+        # Stable system prefix first, then history, then the per-turn sources and question.
+        # The history already ends with the current question, which the prompt message restates.
+        system_message = HaystackChatMessage.from_system(SOURCED_CHAT_SYSTEM_PROMPT)
+        history = [msg for msg in conversation_history if msg.role != "system"]
+        if history and history[-1].role == "user" and history[-1].text == question:
+            history = history[:-1]
 
-        # Add the prompt as user message
         prompt_message = HaystackChatMessage.from_user(prompt)
-        messages = conversation_history + [prompt_message]
+        messages = [system_message] + history + [prompt_message]
 
-        # Generate response using the direct generator
-        result = self.chat_pipeline.run(messages=messages)
+        return messages, sorted_sources
 
-        # Handle both dictionary and object response formats
+    def _extract_reply_text(self, result: Any) -> str:
+        """Extract reply text, handling both dictionary and object response formats"""
         if isinstance(result, dict):
-            response_text = result.get("replies", [{}])[0].get("text", "I'm unable to provide a response.") if result.get("replies") else "I'm unable to provide a response."
-        else:
-            response_text = result.replies[0].text if result.replies else "I'm unable to provide a response."
-
-        return LegalChatResponse(
-            response=response_text,
-            sources=sorted_sources,
-            conversation_id=conversation_id,
-            timestamp=datetime.now()
-        )
+            return result.get("replies", [{}])[0].get("text", "I'm unable to provide a response.") if result.get("replies") else "I'm unable to provide a response."
+        return result.replies[0].text if result.replies else "I'm unable to provide a response."
 
     def _create_source_context(self, sources: List[LegalSource]) -> str:
         """Create formatted context from sources"""
         context_parts = []
 
-        for idx, source in enumerate(sources[:5]):  # Limit to top 5
-            context_part = f"[{idx+1}] {source.title}"
-            if source.citation:
-                context_part += f" ({source.citation})"
-            if source.jurisdiction:
-                context_part += f" - {source.jurisdiction}"
-            context_part += f"\n{source.content_preview}\n"
-            context_parts.append(context_part)
+        for idx, source in enumerate(heapq.nsmallest(MAX_PROMPT_SOURCES, sources, key=_source_rank)):
+            citation = f" ({source.citation})" if source.citation else ""
+            jurisdiction = f" - {source.jurisdiction}" if source.jurisdiction else ""
+            context_parts.append(f"[{idx+1}] {source.title}{citation}{jurisdiction}\n{source.content_preview}\n")
 
         return "\n".join(context_parts)
 
@@ -664,19 +1101,13 @@ ANSWER:"""
         if not sources:
             return response
 
-        # Add source citations to the response
-        formatted_response = response
-
         # Add source list at the end
-        if len(sources) > 0:
-            formatted_response += "\n\n**Sources:**\n"
-            for idx, source in enumerate(sources[:3]):  # Top 3 sources
-                source_ref = f"[{idx+1}] {source.title}"
-                if source.citation:
-                    source_ref += f" ({source.citation})"
-                formatted_response += f"\n{source_ref}"
-
-        return formatted_response
+        source_refs = [
+            f"\n[{idx+1}] {source.title}" + (f" ({source.citation})" if source.citation else "")
+            for idx, source in enumerate(sources[:3])  # Top 3 sources
+        ]
+
+        return "".join([response, "\n\n**Sources:**\n", *source_refs])
 
     def get_conversation_history(self, conversation_id: str) -> List[ChatMessage]:
         """Get conversation history"""
@@ -4,17 +4,232 @@ Follows SOLID principles with modular, testable tool implementations.
 """
 
 import asyncio
+import copy
+import heapq
 import logging
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from collections import Counter, OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Callable, Tuple
+
+import numpy as np
 from datetime import datetime
 from functools import lru_cache
 
 from app.models import LegalSource, SourceType, ToolCallResult
-from app.config.settings import COHERE_API_KEY
+from app.config.settings import (
+    COHERE_API_KEY,
+    RESEARCH_TOOL_CONCURRENCY,
+    RESEARCH_TOOL_CACHE_SIZE,
+    RESEARCH_TOOL_CACHE_TTL,
+    LEGAL_TOOLS_MOCK_LATENCY
+)
 
 logger = logging.getLogger("legal_research_tools")
 
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Query words that boost a statute's relevance when they also appear in its title or summary
+_STATUTE_KEYWORDS = frozenset({"securities", "investment", "insider", "trading", "fraud", "criminal", "company"})
+
+# Query words routing a query to each tool (singular and plural forms)
+_ROUTE_STATUTE = frozenset({"statute", "statutes", "law", "laws", "act", "acts", "code", "codes", "section", "sections"})
+_ROUTE_CASE = frozenset({"case", "cases", "precedent", "precedents", "court", "courts", "ruling", "rulings", "judgment", "judgments"})
+_ROUTE_REGULATION = frozenset({"regulation", "regulations", "compliance", "industry", "industries", "sector", "sectors"})
+
+
+def _tokenize(text: str) -> frozenset:
+    """Lowercase a text and split it into its set of alphabetic words"""
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+async def _simulate_api_latency(seconds: float):
+    """Sleep for a mock API roundtrip scaled by LEGAL_TOOLS_MOCK_LATENCY; no-op when it is 0"""
+    if LEGAL_TOOLS_MOCK_LATENCY:
+        await asyncio.sleep(LEGAL_TOOLS_MOCK_LATENCY * seconds)
+
+
+# Mock databases - replace with real Nigerian legal database APIs.
+# Lowercased search fields are precomputed once here rather than on every call.
+_RAW_MOCK_STATUTES = [
+    {
+        "title": "Investment and Securities Act, 2007",
+        "summary": "Federal legislation governing securities and investments in Nigeria",
+        "relevance": 0.95,
+        "citation": "Investment and Securities Act, 2007, Cap. I24, LFN 2004",
+        "year": 2007,
+        "sections": ["Section 112", "Section 113", "Section 114"],
+        "tool_used": "search_nigerian_statutes"
+    },
+    {
+        "title": "Companies and Allied Matters Act, 2020",
+        "summary": "Governs company formation and regulation in Nigeria",
+        "relevance": 0.78,
+        "citation": "Companies and Allied Matters Act, 2020, Cap. C20, LFN 2020",
+        "year": 2020,
+        "sections": ["Section 330", "Section 331"],
+        "tool_used": "search_nigerian_statutes"
+    },
+    {
+        "title": "Nigerian Criminal Code Act",
+        "summary": "Federal criminal legislation applicable nationwide",
+        "relevance": 0.65,
+        "citation": "Criminal Code Act, Cap. C38, LFN 2004",
+        "year": 2004,
+        "sections": ["Chapter 12", "Chapter 13"],
+        "tool_used": "search_nigerian_statutes"
+    }
+]
+
+_MOCK_STATUTES = tuple(
+    {**statute, "_title_lower": statute["title"].lower(), "_summary_lower": statute["summary"].lower()}
+    for statute in _RAW_MOCK_STATUTES
+)
+
+
+class _StatuteKeywordIndex:
+    """
+    Keyword presence matrices over a fixed statute corpus, so scoring a query is two
+    mat-vec products instead of a per-statute Python loop
+    """
+
+    TITLE_WEIGHT = 0.1
+    SUMMARY_WEIGHT = 0.05
+
+    def __init__(self, statutes, keywords):
+        self.statutes = tuple(statutes)
+        self.keywords = tuple(sorted(keywords))
+        shape = (len(self.statutes), len(self.keywords))
+
+        # Query words match a keyword by prefix, so inflected forms ("investments", "criminally")
+        # count; keywords ending in "y" also accept the "-ies" stem ("companies")
+        self.query_prefixes = tuple(
+            (keyword, keyword[:-1] + "i") if keyword.endswith("y") else (keyword,) for keyword in self.keywords
+        )
+
+        self.base_relevance = np.array([statute["relevance"] for statute in self.statutes], dtype=np.float64)
+        in_title = np.array(
+            [[keyword in statute["_title_lower"] for keyword in self.keywords] for statute in self.statutes],
+            dtype=bool
+        ).reshape(shape)
+        in_summary = np.array(
+            [[keyword in statute["_summary_lower"] for keyword in self.keywords] for statute in self.statutes],
+            dtype=bool
+        ).reshape(shape)
+
+        # A keyword earns the summary weight only when it is not already in the title
+        self.title_hits = in_title.astype(np.float64)
+        self.summary_only_hits = (in_summary & ~in_title).astype(np.float64)
+
+    def score(self, query_words: frozenset) -> np.ndarray:
+        """Relevance of every statute for a query's words, before clamping"""
+        # The query-side keyword check runs once per query, never per statute
+        query_mask = np.fromiter(
+            (any(word.startswith(prefixes) for word in query_words) for prefixes in self.query_prefixes),
+            dtype=np.float64,
+            count=len(self.keywords)
+        )
+        if not query_mask.any():
+            return self.base_relevance.copy()
+        return (
+            self.base_relevance
+            + self.title_hits @ (self.TITLE_WEIGHT * query_mask)
+            + self.summary_only_hits @ (self.SUMMARY_WEIGHT * query_mask)
+        )
+
+
+_STATUTE_INDEX = _StatuteKeywordIndex(_MOCK_STATUTES, _STATUTE_KEYWORDS)
+
+_RAW_MOCK_CASES = [
+    {
+        "case_name": "Securities and Exchange Commission v. Alhaji Ibrahim (2021)",
+        "court": "Federal High Court, Lagos",
+        "citation": "SEC v. Alhaji (2021) FHC/L/CS/1254/2020",
+        "ruling": "The court held that insider trading requires proof of both possession of non-public information and intent to use it for trading advantage",
+        "relevance_score": 0.92,
+        "year": 2021,
+        "legal_principle": "Insider trading elements",
+        "tool_used": "search_case_precedents"
+    },
+    {
+        "case_name": "Central Bank of Nigeria v. Sterling Bank Plc (2022)",
+        "court": "Supreme Court of Nigeria",
+        "citation": "CBN v. Sterling Bank (2022) 13 NWLR (Pt. 1593) 123",
+        "ruling": "The Supreme Court clarified the standard of proof required for financial misconduct cases",
+        "relevance_score": 0.78,
+        "year": 2022,
+        "legal_principle": "Standard of proof in financial cases",
+        "tool_used": "search_case_precedents"
+    },
+    {
+        "case_name": "FRCN v. Skye Bank Plc (2020)",
+        "court": "Court of Appeal, Lagos",
+        "citation": "FRCN v. Skye Bank (2020) 17 NWLR (Pt. 1529) 456",
+        "ruling": "The Court of Appeal addressed issues of regulatory enforcement and due process",
+        "relevance_score": 0.71,
+        "year": 2020,
+        "legal_principle": "Regulatory enforcement procedures",
+        "tool_used": "search_case_precedents"
+    }
+]
+
+_MOCK_CASES = tuple(
+    {**case, "_ruling_lower": case["ruling"].lower(), "_principle_lower": case["legal_principle"].lower()}
+    for case in _RAW_MOCK_CASES
+)
+
+
+# Mock regulations by lowercase industry name - replace with a real regulatory API
+_REGULATION_DB = MappingProxyType({
+    "banking": (
+        {
+            "title": "Central Bank of Nigeria Prudential Guidelines",
+            "summary": "Comprehensive prudential guidelines for Nigerian banks",
+            "relevance": 0.88,
+            "regulator": "Central Bank of Nigeria",
+            "year": 2023,
+            "sections": ["Risk Management", "Capital Adequacy", "Corporate Governance"]
+        },
+        {
+            "title": "Banking and Other Financial Institutions Act",
+            "summary": "Primary legislation governing banking operations in Nigeria",
+            "relevance": 0.91,
+            "regulator": "National Assembly",
+            "year": 2020,
+            "sections": ["Licensing Requirements", "Operational Standards"]
+        },
+    ),
+    "telecommunications": (
+        {
+            "title": "Nigerian Communications Act",
+            "summary": "Legal framework for telecommunications in Nigeria",
+            "relevance": 0.85,
+            "regulator": "Nigerian Communications Commission",
+            "year": 2003,
+            "sections": ["Licensing", "Service Quality", "Consumer Protection"]
+        },
+    ),
+    "oil and gas": (
+        {
+            "title": "Petroleum Industry Act",
+            "summary": "Comprehensive legislation for oil and gas sector",
+            "relevance": 0.90,
+            "regulator": "Nigerian Upstream Petroleum Regulatory Commission",
+            "year": 2021,
+            "sections": ["Upstream Operations", "Downstream Operations", "Environmental Standards"]
+        },
+    )
+})
+
+
+def _public_fields(record: Dict[str, Any], **updates) -> Dict[str, Any]:
+    """Copy a mock record without its precomputed search fields, applying updates"""
+    public = {key: value for key, value in record.items() if not key.startswith("_")}
+    public.update(updates)
+    return public
+
 
 class LegalResearchTool(ABC):
     """Abstract base class for legal research tools following SOLID principles"""
@@ -22,6 +237,9 @@ class LegalResearchTool(ABC):
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
+        # LRU of (created_at, future) keyed on normalized arguments; futures let concurrent
+        # identical calls share one in-flight execution
+        self._result_cache: "OrderedDict[Tuple, Tuple[float, asyncio.Future]]" = OrderedDict()
 
     @abstractmethod
     async def execute(self, **kwargs) -> Dict[str, Any]:
@@ -29,16 +247,16 @@ class LegalResearchTool(ABC):
         pass
 
     @abstractmethod
-    def get_parameters_schema(self) -> Dict[str, Any]:
+    def get_parameters_schema(self) -> Mapping[str, Any]:
         """Get JSON schema for tool parameters"""
         pass
 
     async def call(self, **kwargs) -> ToolCallResult:
         """Call the tool and return a standardized result"""
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
 
         try:
-            result = await self.execute(**kwargs)
+            result = await self._execute_cached(**kwargs)
             sources = self._extract_sources_from_result(result)
 
             return ToolCallResult(
@@ -47,17 +265,19 @@ class LegalResearchTool(ABC):
                 result=result,
                 success=True,
                 timestamp=datetime.now(),
+                elapsed_ms=(time.monotonic_ns() - start_ns) / 1e6,
                 sources_generated=sources
             )
 
         except Exception as e:
-            logger.error(f"Tool {self.name} failed: {str(e)}")
+            logger.error("Tool %s failed: %s", self.name, e)
             return ToolCallResult(
                 tool_name=self.name,
                 arguments=kwargs,
                 result={"error": str(e)},
                 success=False,
                 timestamp=datetime.now(),
+                elapsed_ms=(time.monotonic_ns() - start_ns) / 1e6,
                 sources_generated=[]
             )
 
@@ -66,72 +286,87 @@ class LegalResearchTool(ABC):
         """Extract legal sources from tool results"""
         pass
 
+    async def _execute_cached(self, **kwargs) -> Dict[str, Any]:
+        """
+        Execute the tool, reusing results for recently seen arguments
+
+        Args:
+            **kwargs: Tool arguments; strings are compared case- and whitespace-insensitively
+
+        Returns:
+            A private copy of the tool result
+        """
+        key = tuple(sorted(
+            (name, value.strip().lower() if isinstance(value, str) else value)
+            for name, value in kwargs.items()
+        ))
+        now = time.monotonic()
+
+        entry = self._result_cache.get(key)
+        if entry is not None and now - entry[0] < RESEARCH_TOOL_CACHE_TTL:
+            self._result_cache.move_to_end(key)
+            future = entry[1]
+        else:
+            future = asyncio.ensure_future(self.execute(**kwargs))
+            self._result_cache[key] = (now, future)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > RESEARCH_TOOL_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+        try:
+            result = await asyncio.shield(future)
+        except Exception:
+            # Never cache failures
+            if self._result_cache.get(key, (None, None))[1] is future:
+                del self._result_cache[key]
+            raise
+
+        # Callers may mutate the result, so hand out a copy of the cached value
+        return copy.deepcopy(result)
+
 
 class NigerianStatuteSearchTool(LegalResearchTool):
     """Tool for searching Nigerian statutes and legal codes"""
 
+    _PARAMETERS_SCHEMA = MappingProxyType({
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Legal search query for Nigerian statutes (e.g., 'insider trading definition')"
+            },
+            "jurisdiction": {
+                "type": "string",
+                "description": "Specific Nigerian jurisdiction (e.g., 'Federal', 'Lagos', 'Abuja')",
+                "default": "Nigeria"
+            },
+            "top_k": {
+                "type": "integer",
+                "description": "Maximum number of statutes to return",
+                "default": 20
+            }
+        },
+        "required": ["query"]
+    })
+
     def __init__(self):
         super().__init__(
             name="search_nigerian_statutes",
             description="Search Nigerian statutes, codes, and legal provisions"
         )
 
-    def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Legal search query for Nigerian statutes (e.g., 'insider trading definition')"
-                },
-                "jurisdiction": {
-                    "type": "string",
-                    "description": "Specific Nigerian jurisdiction (e.g., 'Federal', 'Lagos', 'Abuja')",
-                    "default": "Nigeria"
-                }
-            },
-            "required": ["query"]
-        }
+    def get_parameters_schema(self) -> Mapping[str, Any]:
+        return self._PARAMETERS_SCHEMA
 
-    async def execute(self, query: str, jurisdiction: str = "Nigeria") -> Dict[str, Any]:
+    async def execute(self, query: str, jurisdiction: str = "Nigeria", top_k: int = 20) -> Dict[str, Any]:
         """Search Nigerian legal databases for relevant statutes"""
-        logger.info(f"Searching Nigerian statutes: {query} in {jurisdiction}")
+        logger.info("Searching Nigerian statutes: %s in %s", query, jurisdiction)
 
         # Mock implementation - replace with real Nigerian legal database API
-        await asyncio.sleep(0.5)  # Simulate API call
-
-        mock_statutes = [
-            {
-                "title": "Investment and Securities Act, 2007",
-                "summary": "Federal legislation governing securities and investments in Nigeria",
-                "relevance": 0.95,
-                "citation": "Investment and Securities Act, 2007, Cap. I24, LFN 2004",
-                "year": 2007,
-                "sections": ["Section 112", "Section 113", "Section 114"],
-                "tool_used": self.name
-            },
-            {
-                "title": "Companies and Allied Matters Act, 2020",
-                "summary": "Governs company formation and regulation in Nigeria",
-                "relevance": 0.78,
-                "citation": "Companies and Allied Matters Act, 2020, Cap. C20, LFN 2020",
-                "year": 2020,
-                "sections": ["Section 330", "Section 331"],
-                "tool_used": self.name
-            },
-            {
-                "title": "Nigerian Criminal Code Act",
-                "summary": "Federal criminal legislation applicable nationwide",
-                "relevance": 0.65,
-                "citation": "Criminal Code Act, Cap. C38, LFN 2004",
-                "year": 2004,
-                "sections": ["Chapter 12", "Chapter 13"],
-                "tool_used": self.name
-            }
-        ]
+        await _simulate_api_latency(0.5)  # Simulate API call
 
         # Filter statutes based on query relevance
-        relevant_statutes = self._filter_by_query_relevance(query, mock_statutes)
+        relevant_statutes = self._filter_by_query_relevance(query, _STATUTE_INDEX, top_k)
 
         return {
             "success": True,
@@ -139,130 +374,104 @@ class NigerianStatuteSearchTool(LegalResearchTool):
             "query": query,
             "jurisdiction": jurisdiction,
             "total_found": len(relevant_statutes),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
 
-    def _filter_by_query_relevance(self, query: str, statutes: List[Dict]) -> List[Dict]:
-        """Filter statutes based on query relevance (simple keyword matching)"""
-        query_lower = query.lower()
-        keywords = ["securities", "investment", "insider", "trading", "fraud", "criminal", "company"]
+    def _filter_by_query_relevance(self, query: str, index: _StatuteKeywordIndex, top_k: int = 20) -> List[Dict]:
+        """Filter statutes based on query relevance (simple keyword matching), keeping the top_k"""
+        if top_k <= 0:
+            return []
 
-        relevant_statutes = []
-        for statute in statutes:
-            title_lower = statute["title"].lower()
-            summary_lower = statute["summary"].lower()
+        # Increase relevance for matching keywords: title matches outweigh summary matches
+        # score() returns a fresh array, so it is clamped in place
+        scores = index.score(_tokenize(query))
+        np.clip(scores, 0.0, 1.0, out=scores)
 
-            # Increase relevance for matching keywords
-            relevance_boost = 0
-            for keyword in keywords:
-                if keyword in query_lower and keyword in title_lower:
-                    relevance_boost += 0.1
-                elif keyword in query_lower and keyword in summary_lower:
-                    relevance_boost += 0.05
-
-            statute["relevance"] = min(1.0, statute["relevance"] + relevance_boost)
-            if statute["relevance"] > 0.5:  # Only include relevant statutes
-                relevant_statutes.append(statute)
+        # Only include relevant statutes, then keep the top_k by score (stable for ties)
+        candidates = np.nonzero(scores > 0.5)[0]
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
 
-        return sorted(relevant_statutes, key=lambda x: x["relevance"], reverse=True)
+        # Records are shared across calls, so the boosted score goes on a copy
+        return [_public_fields(index.statutes[i], relevance=float(scores[i])) for i in ranked]
 
     def _extract_sources_from_result(self, result: Dict[str, Any]) -> List[LegalSource]:
         """Extract legal sources from statute search results"""
-        sources = []
-
-        for statute in result.get("statutes", []):
-            source = LegalSource(
+        # Fields come from our own tool output, so skip re-validating each source
+        search_query = result.get("query")
+        return [
+            LegalSource.model_construct(
                 title=statute["title"],
                 content_preview=statute["summary"][:200],
                 relevance_score=statute["relevance"],
-                source_type=SourceType.STATUTE,
+                source_type=SourceType.STATUTE.value,
                 citation=statute["citation"],
                 jurisdiction="Nigeria",
                 year=statute["year"],
                 metadata={
                     "tool_used": self.name,
                     "sections": statute.get("sections", []),
-                    "search_query": result.get("query")
+                    "search_query": search_query
                 }
             )
-            sources.append(source)
-
-        return sources
+            for statute in result.get("statutes", [])
+        ]
 
 
 class CaseLawSearchTool(LegalResearchTool):
     """Tool for searching Nigerian case law and precedents"""
 
+    _PARAMETERS_SCHEMA = MappingProxyType({
+        "type": "object",
+        "properties": {
+            "legal_issue": {
+                "type": "string",
+                "description": "Legal issue to research (e.g., 'insider trading enforcement')"
+            },
+            "jurisdiction": {
+                "type": "string",
+                "description": "Court jurisdiction (e.g., 'Federal High Court', 'Supreme Court')",
+                "default": "Nigeria"
+            },
+            "year_range": {
+                "type": "string",
+                "description": "Year range for cases (e.g., '2010-2024')",
+                "default": None
+            },
+            "top_k": {
+                "type": "integer",
+                "description": "Maximum number of cases to return",
+                "default": 20
+            }
+        },
+        "required": ["legal_issue"]
+    })
+
     def __init__(self):
         super().__init__(
             name="search_case_precedents",
             description="Search Nigerian case law and court precedents"
         )
 
-    def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "legal_issue": {
-                    "type": "string",
-                    "description": "Legal issue to research (e.g., 'insider trading enforcement')"
-                },
-                "jurisdiction": {
-                    "type": "string",
-                    "description": "Court jurisdiction (e.g., 'Federal High Court', 'Supreme Court')",
-                    "default": "Nigeria"
-                },
-                "year_range": {
-                    "type": "string",
-                    "description": "Year range for cases (e.g., '2010-2024')",
-                    "default": None
-                }
-            },
-            "required": ["legal_issue"]
-        }
+    def get_parameters_schema(self) -> Mapping[str, Any]:
+        return self._PARAMETERS_SCHEMA
 
-    async def execute(self, legal_issue: str, jurisdiction: str = "Nigeria", year_range: str = None) -> Dict[str, Any]:
+    async def execute(
+        self,
+        legal_issue: str,
+        jurisdiction: str = "Nigeria",
+        year_range: str = None,
+        top_k: int = 20
+    ) -> Dict[str, Any]:
         """Search Nigerian case law databases for relevant precedents"""
-        logger.info(f"Searching case law: {legal_issue} in {jurisdiction}")
+        logger.info("Searching case law: %s in %s", legal_issue, jurisdiction)
 
         # Mock implementation - replace with real Nigerian case law API
-        await asyncio.sleep(0.7)  # Simulate API call
-
-        mock_cases = [
-            {
-                "case_name": "Securities and Exchange Commission v. Alhaji Ibrahim (2021)",
-                "court": "Federal High Court, Lagos",
-                "citation": "SEC v. Alhaji (2021) FHC/L/CS/1254/2020",
-                "ruling": "The court held that insider trading requires proof of both possession of non-public information and intent to use it for trading advantage",
-                "relevance_score": 0.92,
-                "year": 2021,
-                "legal_principle": "Insider trading elements",
-                "tool_used": self.name
-            },
-            {
-                "case_name": "Central Bank of Nigeria v. Sterling Bank Plc (2022)",
-                "court": "Supreme Court of Nigeria",
-                "citation": "CBN v. Sterling Bank (2022) 13 NWLR (Pt. 1593) 123",
-                "ruling": "The Supreme Court clarified the standard of proof required for financial misconduct cases",
-                "relevance_score": 0.78,
-                "year": 2022,
-                "legal_principle": "Standard of proof in financial cases",
-                "tool_used": self.name
-            },
-            {
-                "case_name": "FRCN v. Skye Bank Plc (2020)",
-                "court": "Court of Appeal, Lagos",
-                "citation": "FRCN v. Skye Bank (2020) 17 NWLR (Pt. 1529) 456",
-                "ruling": "The Court of Appeal addressed issues of regulatory enforcement and due process",
-                "relevance_score": 0.71,
-                "year": 2020,
-                "legal_principle": "Regulatory enforcement procedures",
-                "tool_used": self.name
-            }
-        ]
+        await _simulate_api_latency(0.7)  # Simulate API call
 
         # Filter cases based on legal issue relevance
-        relevant_cases = self._filter_by_legal_issue(legal_issue, mock_cases)
+        relevant_cases = self._filter_by_legal_issue(legal_issue, _MOCK_CASES, top_k)
 
         return {
             "success": True,
@@ -270,45 +479,44 @@ class CaseLawSearchTool(LegalResearchTool):
             "legal_issue": legal_issue,
             "jurisdiction": jurisdiction,
             "total_found": len(relevant_cases),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
 
-    def _filter_by_legal_issue(self, legal_issue: str, cases: List[Dict]) -> List[Dict]:
-        """Filter cases based on legal issue relevance"""
-        issue_lower = legal_issue.lower()
+    def _filter_by_legal_issue(self, legal_issue: str, cases: List[Dict], top_k: int = 20) -> List[Dict]:
+        """Filter cases based on legal issue relevance, keeping the top_k"""
+        # Skip short words; a word repeated in the issue counts once per repetition
+        issue_words = Counter(word for word in legal_issue.lower().split() if len(word) > 3)
 
         relevant_cases = []
         for case in cases:
-            ruling_lower = case["ruling"].lower()
-            principle_lower = case["legal_principle"].lower()
-
-            # Simple relevance calculation based on keyword overlap
+            # Simple relevance calculation based on keyword overlap; substring checks, so an
+            # issue word inside a longer one ("court" in "courts") still counts
+            ruling_lower = case["_ruling_lower"]
+            principle_lower = case["_principle_lower"]
             relevance_boost = 0
-            issue_words = issue_lower.split()
-
-            for word in issue_words:
-                if len(word) > 3:  # Skip short words
-                    if word in ruling_lower:
-                        relevance_boost += 0.05
-                    if word in principle_lower:
-                        relevance_boost += 0.08
+            for word, count in issue_words.items():
+                if word in ruling_lower:
+                    relevance_boost += 0.05 * count
+                if word in principle_lower:
+                    relevance_boost += 0.08 * count
 
-            case["relevance_score"] = min(1.0, case["relevance_score"] + relevance_boost)
-            if case["relevance_score"] > 0.6:
-                relevant_cases.append(case)
+            # Records are shared across calls, so the boosted score goes on a copy
+            relevance_score = min(1.0, case["relevance_score"] + relevance_boost)
+            if relevance_score > 0.6:
+                relevant_cases.append(_public_fields(case, relevance_score=relevance_score))
 
-        return sorted(relevant_cases, key=lambda x: x["relevance_score"], reverse=True)
+        return heapq.nlargest(top_k, relevant_cases, key=lambda x: x["relevance_score"])
 
     def _extract_sources_from_result(self, result: Dict[str, Any]) -> List[LegalSource]:
         """Extract legal sources from case law search results"""
-        sources = []
-
-        for case in result.get("cases", []):
-            source = LegalSource(
+        # Fields come from our own tool output, so skip re-validating each source
+        search_issue = result.get("legal_issue")
+        return [
+            LegalSource.model_construct(
                 title=case["case_name"],
                 content_preview=case["ruling"][:200],
                 relevance_score=case["relevance_score"],
-                source_type=SourceType.CASE,
+                source_type=SourceType.CASE.value,
                 citation=case["citation"],
                 jurisdiction="Nigeria",
                 year=case["year"],
@@ -316,148 +524,120 @@ class CaseLawSearchTool(LegalResearchTool):
                 metadata={
                     "tool_used": self.name,
                     "legal_principle": case.get("legal_principle"),
-                    "search_issue": result.get("legal_issue")
+                    "search_issue": search_issue
                 }
             )
-            sources.append(source)
-
-        return sources
+            for case in result.get("cases", [])
+        ]
 
 
 class RegulationSearchTool(LegalResearchTool):
     """Tool for searching industry regulations and compliance requirements"""
 
+    _PARAMETERS_SCHEMA = MappingProxyType({
+        "type": "object",
+        "properties": {
+            "industry": {
+                "type": "string",
+                "description": "Industry sector (e.g., 'banking', 'telecommunications', 'oil and gas')"
+            },
+            "regulation_type": {
+                "type": "string",
+                "description": "Type of regulation (e.g., 'compliance', 'licensing', 'reporting')",
+                "default": None
+            },
+            "jurisdiction": {
+                "type": "string",
+                "description": "Regulatory jurisdiction",
+                "default": "Nigeria"
+            }
+        },
+        "required": ["industry"]
+    })
+
     def __init__(self):
         super().__init__(
             name="search_regulations",
             description="Search industry-specific regulations and compliance requirements"
         )
 
-    def get_parameters_schema(self) -> Dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "industry": {
-                    "type": "string",
-                    "description": "Industry sector (e.g., 'banking', 'telecommunications', 'oil and gas')"
-                },
-                "regulation_type": {
-                    "type": "string",
-                    "description": "Type of regulation (e.g., 'compliance', 'licensing', 'reporting')",
-                    "default": None
-                },
-                "jurisdiction": {
-                    "type": "string",
-                    "description": "Regulatory jurisdiction",
-                    "default": "Nigeria"
-                }
-            },
-            "required": ["industry"]
-        }
+    def get_parameters_schema(self) -> Mapping[str, Any]:
+        return self._PARAMETERS_SCHEMA
 
     async def execute(self, industry: str, regulation_type: str = None, jurisdiction: str = "Nigeria") -> Dict[str, Any]:
         """Search regulatory databases for industry-specific requirements"""
-        logger.info(f"Searching regulations for {industry} industry in {jurisdiction}")
+        logger.info("Searching regulations for %s industry in %s", industry, jurisdiction)
 
         # Mock implementation - replace with real regulatory API
-        await asyncio.sleep(0.6)  # Simulate API call
-
-        regulation_database = {
-            "banking": [
-                {
-                    "title": "Central Bank of Nigeria Prudential Guidelines",
-                    "summary": "Comprehensive prudential guidelines for Nigerian banks",
-                    "relevance": 0.88,
-                    "regulator": "Central Bank of Nigeria",
-                    "year": 2023,
-                    "sections": ["Risk Management", "Capital Adequacy", "Corporate Governance"]
-                },
-                {
-                    "title": "Banking and Other Financial Institutions Act",
-                    "summary": "Primary legislation governing banking operations in Nigeria",
-                    "relevance": 0.91,
-                    "regulator": "National Assembly",
-                    "year": 2020,
-                    "sections": ["Licensing Requirements", "Operational Standards"]
-                }
-            ],
-            "telecommunications": [
-                {
-                    "title": "Nigerian Communications Act",
-                    "summary": "Legal framework for telecommunications in Nigeria",
-                    "relevance": 0.85,
-                    "regulator": "Nigerian Communications Commission",
-                    "year": 2003,
-                    "sections": ["Licensing", "Service Quality", "Consumer Protection"]
-                }
-            ],
-            "oil and gas": [
-                {
-                    "title": "Petroleum Industry Act",
-                    "summary": "Comprehensive legislation for oil and gas sector",
-                    "relevance": 0.90,
-                    "regulator": "Nigerian Upstream Petroleum Regulatory Commission",
-                    "year": 2021,
-                    "sections": ["Upstream Operations", "Downstream Operations", "Environmental Standards"]
-                }
-            ]
-        }
+        await _simulate_api_latency(0.6)  # Simulate API call
 
-        industry_lower = industry.lower()
-        regulations = regulation_database.get(industry_lower, [
-            {
+        regulations = _REGULATION_DB.get(industry.lower())
+        if regulations is None:
+            regulations = ({
                 "title": f"General {industry.title()} Regulations",
                 "summary": f"Regulatory framework for {industry} sector in Nigeria",
                 "relevance": 0.70,
                 "regulator": "Regulatory Authority",
                 "year": 2022,
                 "sections": ["Compliance Requirements"]
-            }
-        ])
+            },)
 
         return {
             "success": True,
-            "regulations": regulations,
+            "regulations": list(regulations),
             "industry": industry,
             "regulation_type": regulation_type,
             "jurisdiction": jurisdiction,
             "total_found": len(regulations),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
 
     def _extract_sources_from_result(self, result: Dict[str, Any]) -> List[LegalSource]:
         """Extract legal sources from regulation search results"""
-        sources = []
-
-        for regulation in result.get("regulations", []):
-            source = LegalSource(
+        # Fields come from our own tool output, so skip re-validating each source
+        industry = result.get("industry")
+        return [
+            LegalSource.model_construct(
                 title=regulation["title"],
                 content_preview=regulation["summary"][:200],
                 relevance_score=regulation["relevance"],
-                source_type=SourceType.REGULATION,
+                source_type=SourceType.REGULATION.value,
                 jurisdiction="Nigeria",
                 year=regulation["year"],
                 metadata={
                     "tool_used": self.name,
                     "regulator": regulation.get("regulator"),
                     "sections": regulation.get("sections", []),
-                    "industry": result.get("industry")
+                    "industry": industry
                 }
             )
-            sources.append(source)
+            for regulation in result.get("regulations", [])
+        ]
+
 
-        return sources
+# Tools are created once at import and shared by every manager. They hold no per-request
+# state; their result caches are safe to share across managers.
+_TOOLS: Dict[str, LegalResearchTool] = {
+    "search_nigerian_statutes": NigerianStatuteSearchTool(),
+    "search_case_precedents": CaseLawSearchTool(),
+    "search_regulations": RegulationSearchTool()
+}
 
 
 class LegalResearchToolManager:
     """Manager for legal research tools following single responsibility principle"""
 
+    # Builds each tool's call arguments from a free-text query
+    _TOOL_ARG_BUILDERS: Dict[str, Callable[[str], Dict[str, Any]]] = {
+        "search_nigerian_statutes": lambda query: {"query": query},
+        "search_case_precedents": lambda query: {"legal_issue": query},
+        "search_regulations": lambda query: {"industry": query},  # This is simplified
+    }
+
     def __init__(self):
-        self.tools = {
-            "search_nigerian_statutes": NigerianStatuteSearchTool(),
-            "search_case_precedents": CaseLawSearchTool(),
-            "search_regulations": RegulationSearchTool()
-        }
+        self.tools = _TOOLS
+        # Caps concurrent backend calls across all requests sharing this manager
+        self._semaphore = asyncio.Semaphore(RESEARCH_TOOL_CONCURRENCY)
 
     def get_tool(self, tool_name: str) -> Optional[LegalResearchTool]:
         """Get a specific tool by name"""
@@ -469,17 +649,17 @@ class LegalResearchToolManager:
 
     def get_tools_for_query(self, query: str) -> List[LegalResearchTool]:
         """Get relevant tools based on query analysis"""
-        query_lower = query.lower()
+        query_words = _tokenize(query)
         relevant_tools = []
 
-        # Simple heuristic for tool selection
-        if any(keyword in query_lower for keyword in ["statute", "law", "act", "code", "section"]):
+        # Simple heuristic for tool selection, matching whole query words
+        if _ROUTE_STATUTE & query_words:
             relevant_tools.append(self.tools["search_nigerian_statutes"])
 
-        if any(keyword in query_lower for keyword in ["case", "precedent", "court", "ruling", "judgment"]):
+        if _ROUTE_CASE & query_words:
             relevant_tools.append(self.tools["search_case_precedents"])
 
-        if any(keyword in query_lower for keyword in ["regulation", "compliance", "industry", "sector"]):
+        if _ROUTE_REGULATION & query_words:
             relevant_tools.append(self.tools["search_regulations"])
 
         # Default to all tools if no specific keywords found
@@ -488,6 +668,49 @@ class LegalResearchToolManager:
 
         return relevant_tools
 
+    def build_tool_arguments(self, tool_name: str, query: str) -> Dict[str, Any]:
+        """Build a tool's call arguments from a query; unknown tools get none"""
+        builder = self._TOOL_ARG_BUILDERS.get(tool_name)
+        return builder(query) if builder else {}
+
+    async def call_tools(self, query: str, tools: Optional[List[LegalResearchTool]] = None) -> List[ToolCallResult]:
+        """
+        Call research tools concurrently for a query
+
+        Args:
+            query: Free-text research query, mapped onto each tool's parameters
+            tools: Tools to call; defaults to those selected by get_tools_for_query
+
+        Returns:
+            Results of the tool calls that completed
+        """
+        if tools is None:
+            tools = self.get_tools_for_query(query)
+
+        async def call_tool(tool: LegalResearchTool, args: Dict[str, Any]) -> ToolCallResult:
+            async with self._semaphore:
+                return await tool.call(**args)
+
+        calls = []
+        for tool in tools:
+            args = self.build_tool_arguments(tool.name, query)
+            if args:
+                calls.append(call_tool(tool, args))
+
+        if not calls:
+            return []
+
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        tool_results = []
+        for result in results:
+            if isinstance(result, ToolCallResult):
+                tool_results.append(result)
+            elif isinstance(result, Exception):
+                logger.error("Tool execution failed: %s", result)
+
+        return tool_results
+
 
 # Singleton instance for dependency injection
 @lru_cache(maxsize=1)
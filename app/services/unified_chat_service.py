@@ -4,11 +4,19 @@ Fixes the 'get' method bug by eliminating type confusion and implementing clean
 """
 
 import asyncio
+import functools
+import hashlib
+import heapq
 import logging
+import re
+import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Deque
 
+from pydantic_core import from_json, to_json
 from haystack.dataclasses import ChatMessage as HaystackChatMessage
 from haystack_integrations.components.generators.cohere import CohereChatGenerator
 from haystack.utils import Secret
@@ -23,76 +31,203 @@ from app.config.settings import COHERE_API_KEY, COHERE_MODEL
 from app.components.embedders import get_dense_embedder, get_sparse_embedder
 from app.components.retrievers import get_hybrid_retriever
 from app.document_store.store import get_document_store
+from app.core.async_batcher import AsyncBatcher
+from app.utils.semantic_cache import SemanticResponseCache
+from app.utils.questions import normalize_questions
 from haystack_integrations.components.retrievers.qdrant import QdrantHybridRetriever
 from app.config.settings import DEFAULT_TOP_K, DEFAULT_SCORE_THRESHOLD
+from app.config.settings import (
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_TTL,
+    REPLY_CACHE_MAX_SIZE,
+    REPLY_CACHE_THRESHOLD,
+    EMBED_BATCH_MAX_SIZE,
+    EMBED_BATCH_MAX_WAIT_MS,
+    RETRIEVAL_BATCH_MAX_SIZE,
+    RETRIEVAL_BATCH_MAX_WAIT_MS,
+    CONVERSATION_MAX_MESSAGES,
+    CONVERSATION_MAX_COUNT,
+    CONVERSATION_IDLE_TTL,
+    CONVERSATION_SWEEP_INTERVAL,
+    LLM_EXECUTOR_WORKERS
+)
 
 logger = logging.getLogger("unified_chat_service")
 
+FALLBACK_REPLY = "I'm unable to provide a response at this time."
+
+# Generation calls block on Cohere for seconds at a time, so they get their own threads
+# rather than competing with embedding and file work in the default executor
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=LLM_EXECUTOR_WORKERS, thread_name_prefix="cohere-chat")
+
+# Number of top-ranked sources included in a contextual prompt
+MAX_PROMPT_SOURCES = 5
+
+# Keywords that suggest complex legal questions needing decomposition
+DECOMPOSITION_KEYWORDS = [
+    "what constitutes", "elements of", "requirements for",
+    "how does", "process for", "procedure to", "what are the",
+    "legal framework", "comprehensive analysis", "detailed explanation"
+]
+
+# Compiled once so a question is scanned for every keyword in a single pass
+_DECOMPOSITION_RE = re.compile("|".join(map(re.escape, DECOMPOSITION_KEYWORDS)))
+_MIN_DECOMPOSITION_KEYWORD_LENGTH = min(map(len, DECOMPOSITION_KEYWORDS))
+
+# Prompt text is kept byte-identical across calls so providers can reuse the cached prefix
+DIRECT_CHAT_SYSTEM_PROMPT = (
+    "You are an expert legal assistant specializing in Nigerian jurisprudence. "
+    "Provide accurate, well-researched legal information with proper citations. "
+    "Always specify when information is general guidance and recommend consulting with qualified legal counsel."
+)
+
+CONTEXTUAL_CHAT_SYSTEM_PROMPT = (
+    "You are an expert legal assistant specializing in Nigerian jurisprudence. "
+    "Use the provided sources to give accurate, well-cited legal information. "
+    "Always cite your sources using the format [Source X] and distinguish between different types of legal authorities."
+)
+
+LEGAL_ANSWER_INSTRUCTIONS = """Each turn provides LEGAL SOURCE messages followed by the USER QUESTION.
+
+INSTRUCTIONS:
+1. Provide a detailed legal analysis addressing the user's question
+2. Use inline citations in the format [Source X] when referencing specific sources
+3. Clearly distinguish between different types of sources (statutes, cases, regulations)
+4. Highlight Nigerian legal authority when available
+5. Acknowledge any limitations in the available legal information
+6. Always conclude with a recommendation to consult qualified legal counsel for specific legal advice"""
+
+NO_SOURCES_FULL_ANALYSIS = "No legal sources were provided. Please provide a comprehensive legal analysis of this question."
+
+NO_SOURCES_GENERAL_GUIDANCE = (
+    "No relevant legal sources were found for this query. "
+    "Please provide general legal guidance while acknowledging the limitation in available sources."
+)
+
+# Haystack message constructors by stored role
+_HAYSTACK_MESSAGE_FACTORIES = {
+    "user": HaystackChatMessage.from_user,
+    "assistant": HaystackChatMessage.from_assistant,
+    "system": HaystackChatMessage.from_system
+}
+
 
 class ConversationMemory:
-    """Manages conversation state and history with robust data handling"""
+    """
+    Manages conversation state and history with robust data handling.
+    Each conversation keeps a sliding window of its last CONVERSATION_MAX_MESSAGES
+    messages, alongside the same window already converted to Haystack messages.
+    At most CONVERSATION_MAX_COUNT conversations are kept; the least recently active
+    are dropped first, and evict_idle drops those idle for longer than the TTL.
+    """
 
     def __init__(self):
-        self.conversations: Dict[str, List[ChatMessage]] = {}
+        self.conversations: Dict[str, Deque[ChatMessage]] = {}
         self.conversation_metadata: Dict[str, Dict[str, Any]] = {}
+        self._haystack_messages: Dict[str, Deque[HaystackChatMessage]] = {}
+        # Conversation IDs ordered from least to most recently active, with monotonic times
+        self._last_active: "OrderedDict[str, float]" = OrderedDict()
 
     def create_conversation(self) -> str:
         """Create a new conversation and return its ID"""
         conversation_id = str(uuid.uuid4())
-        self.conversations[conversation_id] = []
+        self.conversations[conversation_id] = deque(maxlen=CONVERSATION_MAX_MESSAGES)
+        self._haystack_messages[conversation_id] = deque(maxlen=CONVERSATION_MAX_MESSAGES)
+        created_at = datetime.now()
         self.conversation_metadata[conversation_id] = {
-            "created_at": datetime.now(),
+            "created_at": created_at,
             "message_count": 0,
-            "last_updated": datetime.now(),
+            "last_updated": created_at,
             "context_sources": [],
-            "decomposition_context": None
+            "decomposition_context": None,
+            "has_system": False
         }
-        logger.info(f"Created new conversation: {conversation_id}")
+        self._touch(conversation_id)
+
+        # Make room by dropping the least recently active conversations
+        while len(self._last_active) > CONVERSATION_MAX_COUNT:
+            self.clear_conversation(next(iter(self._last_active)))
+
+        logger.info("Created new conversation: %s", conversation_id)
         return conversation_id
 
     def add_message(self, conversation_id: str, role: str, content: str, metadata: Dict = None):
         """Add a message to the conversation"""
-        if conversation_id not in self.conversations:
-            logger.warning(f"Conversation {conversation_id} not found")
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            logger.warning("Conversation %s not found", conversation_id)
             return
 
-        message = ChatMessage(
+        now = datetime.now()
+        conversation.append(ChatMessage(
             role=role,
             content=content,
-            timestamp=datetime.now()
-        )
+            timestamp=now
+        ))
+
+        # Convert once at insertion so building the prompt history needs no role dispatch
+        factory = _HAYSTACK_MESSAGE_FACTORIES.get(role)
+        if factory is not None:
+            self._haystack_messages[conversation_id].append(factory(content))
 
-        self.conversations[conversation_id].append(message)
-        self.conversation_metadata[conversation_id]["last_updated"] = datetime.now()
-        self.conversation_metadata[conversation_id]["message_count"] += 1
+        conversation_metadata = self.conversation_metadata[conversation_id]
+        conversation_metadata["last_updated"] = now
+        conversation_metadata["message_count"] += 1
+        if role == "system":
+            conversation_metadata["has_system"] = True
 
         if metadata:
-            self.conversation_metadata[conversation_id].update(metadata)
+            conversation_metadata.update(metadata)
+
+        self._touch(conversation_id)
+
+    def _touch(self, conversation_id: str):
+        """Mark a conversation as the most recently active"""
+        self._last_active[conversation_id] = time.monotonic()
+        self._last_active.move_to_end(conversation_id)
+
+    def evict_idle(self, ttl_seconds: float = CONVERSATION_IDLE_TTL) -> int:
+        """
+        Drop conversations with no activity for longer than ttl_seconds
+
+        Args:
+            ttl_seconds: Idle time after which a conversation is dropped
+
+        Returns:
+            Number of conversations dropped
+        """
+        cutoff = time.monotonic() - ttl_seconds
+        evicted = 0
+        # Ordered by activity, so stop at the first conversation still within the TTL
+        while self._last_active:
+            conversation_id, last_active = next(iter(self._last_active.items()))
+            if last_active >= cutoff:
+                break
+            self.clear_conversation(conversation_id)
+            evicted += 1
+
+        if evicted:
+            logger.info("Evicted %d idle conversations", evicted)
+        return evicted
 
     def get_conversation(self, conversation_id: str) -> List[ChatMessage]:
         """Get conversation history"""
-        return self.conversations.get(conversation_id, [])
+        return list(self.conversations.get(conversation_id, ()))
 
     def get_haystack_messages(self, conversation_id: str) -> List[HaystackChatMessage]:
-        """Convert conversation to Haystack ChatMessage format"""
-        chat_messages = self.get_conversation(conversation_id)
-        haystack_messages = []
+        """Get the conversation in Haystack ChatMessage format"""
+        return list(self._haystack_messages.get(conversation_id, ()))
 
-        for msg in chat_messages:
-            if msg.role == "user":
-                haystack_messages.append(HaystackChatMessage.from_user(msg.content))
-            elif msg.role == "assistant":
-                haystack_messages.append(HaystackChatMessage.from_assistant(msg.content))
-            elif msg.role == "system":
-                haystack_messages.append(HaystackChatMessage.from_system(msg.content))
-
-        return haystack_messages
+    def has_system_message(self, conversation_id: str) -> bool:
+        """Whether a system message has been added to the conversation"""
+        metadata = self.conversation_metadata.get(conversation_id)
+        return bool(metadata and metadata.get("has_system"))
 
     def set_decomposition_context(self, conversation_id: str, context: Dict[str, Any]):
         """Store decomposition context for follow-up questions"""
         if conversation_id in self.conversation_metadata:
             self.conversation_metadata[conversation_id]["decomposition_context"] = context
-            logger.info(f"Stored decomposition context for conversation {conversation_id}")
+            logger.info("Stored decomposition context for conversation %s", conversation_id)
 
     def get_decomposition_context(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """Get stored decomposition context"""
@@ -100,10 +235,41 @@ class ConversationMemory:
             return self.conversation_metadata[conversation_id].get("decomposition_context")
         return None
 
+    def serialize_context(self, conversation_id: str) -> Optional[bytes]:
+        """
+        Serialize a conversation's decomposition context to JSON for a shared store
+
+        Args:
+            conversation_id: Conversation whose context to serialize
+
+        Returns:
+            JSON bytes, or None if the conversation has no decomposition context
+        """
+        context = self.get_decomposition_context(conversation_id)
+        if context is None:
+            return None
+
+        # Cached sources are derived data and are rebuilt on first use after loading
+        return to_json({key: value for key, value in context.items() if key != "_cached_sources"})
+
+    def deserialize_context(self, conversation_id: str, blob: bytes):
+        """
+        Restore a decomposition context produced by serialize_context
+
+        Args:
+            conversation_id: Conversation to attach the context to
+            blob: JSON bytes from serialize_context
+        """
+        context = from_json(blob)
+        context["questions"] = [Question.model_validate(q_data) for q_data in context.get("questions", [])]
+        self.set_decomposition_context(conversation_id, context)
+
     def clear_conversation(self, conversation_id: str) -> bool:
         """Clear a conversation"""
         if conversation_id in self.conversations:
             del self.conversations[conversation_id]
+            self._haystack_messages.pop(conversation_id, None)
+            self._last_active.pop(conversation_id, None)
             if conversation_id in self.conversation_metadata:
                 del self.conversation_metadata[conversation_id]
             return True
@@ -119,8 +285,72 @@ class UnifiedChatService:
         self.memory = ConversationMemory()
         self.research_manager = get_legal_research_manager()
         self.chat_generator = self._create_chat_generator()
+
+        # Generated replies, keyed exactly by scope and normalized question, and by
+        # question embedding within a scope for near-duplicate questions; both expire
+        # after SEMANTIC_CACHE_TTL (exact entries are stored as (stored_at, reply))
+        self._reply_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._semantic_reply_cache = SemanticResponseCache(
+            threshold=REPLY_CACHE_THRESHOLD,
+            max_size=REPLY_CACHE_MAX_SIZE,
+            ttl_seconds=SEMANTIC_CACHE_TTL
+        )
+
+        # Retrieval components are built once and reused by every request
+        self._document_store = get_document_store()
+        self._qdrant_retriever = QdrantHybridRetriever(
+            document_store=self._document_store,
+            top_k=DEFAULT_TOP_K,
+            score_threshold=DEFAULT_SCORE_THRESHOLD
+        )
+        self._hybrid_retriever = get_hybrid_retriever(self._qdrant_retriever)
+        self._dense_embedder = get_dense_embedder()
+        self._sparse_embedder = get_sparse_embedder()
+
+        # Single-question work from concurrent requests is coalesced: direct retrievals into one
+        # embed-and-retrieve pass (whose dense vectors also key the reply cache), and reply-cache
+        # embeddings for questions that skipped direct retrieval into one embedder call
+        self._dense_batcher = AsyncBatcher(
+            self._embed_dense_batch, max_batch=EMBED_BATCH_MAX_SIZE, max_wait_ms=EMBED_BATCH_MAX_WAIT_MS
+        )
+        self._retrieval_batcher = AsyncBatcher(
+            self._retrieve_batch, max_batch=RETRIEVAL_BATCH_MAX_SIZE, max_wait_ms=RETRIEVAL_BATCH_MAX_WAIT_MS
+        )
+        self._sweeper: Optional[asyncio.Task] = None
         logger.info("UnifiedChatService initialized")
 
+    async def warm_up(self):
+        """
+        Run one embedding and retrieval pass at startup so the first user request
+        does not pay for first-inference setup in the embedders, ranker and Qdrant client
+        """
+        start_time = time.perf_counter()
+        try:
+            await self._retrieve_batch(["warmup"])
+            logger.info("UnifiedChatService warmed up in %.2f seconds", time.perf_counter() - start_time)
+        except Exception as e:
+            logger.warning("UnifiedChatService warm-up failed: %s", e)
+
+    def _ensure_sweeper(self):
+        """Start the idle-conversation sweeper on the running event loop, once"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_idle_conversations())
+
+    async def _sweep_idle_conversations(self):
+        """Periodically drop conversations idle for longer than CONVERSATION_IDLE_TTL"""
+        while True:
+            await asyncio.sleep(CONVERSATION_SWEEP_INTERVAL)
+            try:
+                self.memory.evict_idle()
+            except Exception as e:
+                logger.error("Conversation sweep failed: %s", e)
+
+    def close(self):
+        """Stop background work owned by the service"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
     def _create_chat_generator(self) -> CohereChatGenerator:
         """Create Cohere chat generator"""
         api_key = Secret.from_token(COHERE_API_KEY) if COHERE_API_KEY else None
@@ -137,61 +367,7 @@ class UnifiedChatService:
         Normalize questions data to always return a list of Question objects
         This is the key fix for the 'get' method bug
         """
-        if not questions_data:
-            return []
-
-        # Case 1: It's already a Questions object with a questions attribute
-        if hasattr(questions_data, 'questions') and hasattr(questions_data.questions, '__iter__'):
-            logger.debug("Normalizing Questions object")
-            return questions_data.questions
-
-        # Case 2: It's a list of Question objects
-        elif isinstance(questions_data, list) and all(hasattr(q, 'question') for q in questions_data):
-            logger.debug("Normalizing list of Question objects")
-            return questions_data
-
-        # Case 3: It's a list of dictionaries
-        elif isinstance(questions_data, list) and all(isinstance(q, dict) for q in questions_data):
-            logger.debug("Normalizing list of question dictionaries")
-            questions = []
-            for q_data in questions_data:
-                if "question" in q_data:
-                    questions.append(Question(
-                        question=q_data.get("question", ""),
-                        answer=q_data.get("answer")
-                    ))
-            return questions
-
-        # Case 4: It's a dictionary with questions key
-        elif isinstance(questions_data, dict) and "questions" in questions_data:
-            logger.debug("Normalizing dictionary with questions key")
-            return self._normalize_questions_data(questions_data["questions"])
-
-        # Case 5: It's a single Question object
-        elif hasattr(questions_data, 'question'):
-            logger.debug("Normalizing single Question object")
-            return [questions_data]
-
-        # Case 6: It's a single dictionary
-        elif isinstance(questions_data, dict) and "question" in questions_data:
-            logger.debug("Normalizing single question dictionary")
-            return [Question(
-                question=questions_data.get("question", ""),
-                answer=questions_data.get("answer")
-            )]
-
-        # Case 7: It's a tuple (problematic case from cache)
-        elif isinstance(questions_data, tuple):
-            logger.warning(f"Normalizing tuple data: {type(questions_data)}")
-            if len(questions_data) > 1 and isinstance(questions_data[1], list):
-                return self._normalize_questions_data(questions_data[1])
-            else:
-                return []
-
-        # Case 8: Unknown type - try to extract questions
-        else:
-            logger.warning(f"Unknown questions data type: {type(questions_data)}")
-            return []
+        return normalize_questions(questions_data)
 
     def _create_sources_from_normalized_data(
         self,
@@ -224,11 +400,29 @@ class UnifiedChatService:
 
         return sources
 
+    def _build_context_sources(self, decomposition_context: Dict[str, Any]) -> List[LegalSource]:
+        """
+        Get the sources for a stored decomposition context, building them on first use
+
+        The built list is kept on the context itself, so replacing the context via
+        set_decomposition_context also drops the cached sources.
+        """
+        context_sources = decomposition_context.get("_cached_sources")
+        if context_sources is None:
+            questions = decomposition_context.get("questions", [])
+            document_metadata = decomposition_context.get("document_metadata", [])
+            context_sources = self._create_sources_from_normalized_data(questions, document_metadata)
+            decomposition_context["_cached_sources"] = context_sources
+
+        # Callers extend the returned list, so hand out a copy
+        return list(context_sources)
+
     async def start_chat(self, initial_question: str, enable_decomposition: bool = True) -> LegalChatResponse:
         """
         Start a new chat session with robust data handling
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
+        self._ensure_sweeper()
         conversation_id = self.memory.create_conversation()
 
         try:
@@ -240,7 +434,7 @@ class UnifiedChatService:
             decomposition_used = False
 
             if enable_decomposition and self._should_use_decomposition(initial_question):
-                logger.info(f"Using decomposition for initial question: {initial_question[:50]}...")
+                logger.info("Using decomposition for initial question: %.50s...", initial_question)
 
                 # Use decomposition pipeline
                 decomp_result = await process_question(initial_question)
@@ -256,23 +450,26 @@ class UnifiedChatService:
                 # Store decomposition context for follow-up
                 decomposition_context = {
                     "original_question": initial_question,
-                    "questions": [{"question": q.question, "answer": q.answer} for q in questions],
+                    # Already-normalized Question objects, used as-is by follow-ups
+                    "questions": list(questions),
                     "document_metadata": document_metadata,
                     "final_answer": final_answer,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": datetime.now().isoformat(),
+                    # Sources built above, reused by every follow-up on this context
+                    "_cached_sources": sources
                 }
                 self.memory.set_decomposition_context(conversation_id, decomposition_context)
                 decomposition_used = True
 
-                logger.info(f"Decomposition completed with {len(questions)} sub-questions")
+                logger.info("Decomposition completed with %d sub-questions", len(questions))
 
             else:
                 # Direct chat without decomposition - retrieve documents directly
-                logger.info(f"Using direct chat for question: {initial_question[:50]}...")
-                sources = await self._retrieve_documents_directly(initial_question)
-                final_answer = await self._generate_direct_response(initial_question, sources)
+                logger.info("Using direct chat for question: %.50s...", initial_question)
+                sources, embedding = await self._retrieve_documents_directly(initial_question)
+                final_answer = await self._generate_direct_response(initial_question, sources, embedding)
 
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
 
             # Add assistant response to conversation
             self.memory.add_message(
@@ -290,13 +487,13 @@ class UnifiedChatService:
             )
 
         except Exception as e:
-            logger.error(f"Chat session failed: {str(e)}", exc_info=True)
+            logger.error("Chat session failed: %s", e, exc_info=True)
             error_response = LegalChatResponse(
                 response=f"I apologize, but I encountered an error: {str(e)}",
                 sources=[],
                 conversation_id=conversation_id,
                 timestamp=datetime.now(),
-                processing_time_seconds=(datetime.now() - start_time).total_seconds()
+                processing_time_seconds=time.perf_counter() - start_time
             )
             return error_response
 
@@ -308,10 +505,11 @@ class UnifiedChatService:
         """
         Continue an existing chat conversation with proper context handling
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
+        self._ensure_sweeper()
 
         if conversation_id not in self.memory.conversations:
-            logger.warning(f"Conversation {conversation_id} not found, creating new one")
+            logger.warning("Conversation %s not found, creating new one", conversation_id)
             return await self.start_chat(question)
 
         try:
@@ -321,28 +519,30 @@ class UnifiedChatService:
             # Get conversation history
             hay_messages = self.memory.get_haystack_messages(conversation_id)
 
-            # Collect all sources
-            all_sources = []
-
             # Step 1: Use stored decomposition context if available
             decomposition_context = self.memory.get_decomposition_context(conversation_id)
+
+            # Step 2: Retrieve additional documents for the follow-up question, concurrently
+            # with building the context sources (CPU work, so it runs in a worker thread)
+            retrieval = self._retrieve_documents_directly(question)
             if decomposition_context:
-                questions = self._normalize_questions_data(decomposition_context.get("questions", []))
-                document_metadata = decomposition_context.get("document_metadata", [])
-                context_sources = self._create_sources_from_normalized_data(questions, document_metadata)
-                all_sources.extend(context_sources)
-                logger.info(f"Using decomposition context with {len(context_sources)} sources")
+                context_sources, (additional_sources, embedding) = await asyncio.gather(
+                    asyncio.to_thread(self._build_context_sources, decomposition_context),
+                    retrieval
+                )
+                logger.info("Using decomposition context with %d sources", len(context_sources))
+            else:
+                context_sources, (additional_sources, embedding) = [], await retrieval
 
-            # Step 2: Retrieve additional documents for the follow-up question
-            additional_sources = await self._retrieve_documents_directly(question)
-            all_sources.extend(additional_sources)
+            # Collect all sources
+            all_sources = context_sources + additional_sources
 
             # Step 3: Generate response with all sources
             final_answer, used_sources = await self._generate_contextual_response(
-                question, all_sources, hay_messages
+                question, all_sources, hay_messages, self.memory.has_system_message(conversation_id), embedding
             )
 
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
 
             # Add assistant response to conversation
             self.memory.add_message(
@@ -364,227 +564,293 @@ class UnifiedChatService:
             )
 
         except Exception as e:
-            logger.error(f"Continue chat failed: {str(e)}", exc_info=True)
+            logger.error("Continue chat failed: %s", e, exc_info=True)
             error_response = LegalChatResponse(
                 response=f"I apologize, but I encountered an error: {str(e)}",
                 sources=[],
                 conversation_id=conversation_id,
                 timestamp=datetime.now(),
-                processing_time_seconds=(datetime.now() - start_time).total_seconds()
+                processing_time_seconds=time.perf_counter() - start_time
             )
             return error_response
 
     def _should_use_decomposition(self, question: str) -> bool:
         """Determine if question should be decomposed"""
-        question_lower = question.lower()
-
-        decomp_keywords = [
-            "what constitutes", "elements of", "requirements for",
-            "how does", "process for", "procedure to", "what are the",
-            "legal framework", "comprehensive analysis", "detailed explanation"
-        ]
-
-        for keyword in decomp_keywords:
-            if keyword in question_lower:
-                return True
-
-        if len(question) > 100:
+        # Length alone settles long questions and ones too short to contain any keyword
+        question_length = len(question)
+        if question_length > 100:
             return True
+        if question_length < _MIN_DECOMPOSITION_KEYWORD_LENGTH:
+            return False
 
-        return False
-
-    async def _retrieve_documents_directly(self, question: str) -> List[LegalSource]:
-        """Retrieve documents directly without decomposition with proper relevance scoring"""
-        try:
-            logger.info(f"Retrieving documents for: {question[:50]}...")
-
-            # Create document store and retriever
-            document_store = get_document_store()
-            qdrant_retriever = QdrantHybridRetriever(
-                document_store=document_store,
-                top_k=DEFAULT_TOP_K,
-                score_threshold=DEFAULT_SCORE_THRESHOLD
-            )
-            hybrid_retriever = get_hybrid_retriever(qdrant_retriever)
+        return _DECOMPOSITION_RE.search(question.lower()) is not None
 
-            # Create a single-question wrapper
-            single_question = Questions(questions=[Question(question=question)])
-
-            # Get embedders
-            dense_embedder = get_dense_embedder()
-            sparse_embedder = get_sparse_embedder()
+    async def _retrieve_documents_directly(self, question: str) -> Tuple[List[LegalSource], Optional[List[float]]]:
+        """
+        Retrieve documents directly without decomposition with proper relevance scoring
 
-            # Generate embeddings
-            dense_result = await dense_embedder.run_async(single_question)
-            sparse_result = await sparse_embedder.run_async(single_question)
+        Returns:
+            The sources, and the question's dense embedding (None if retrieval failed)
+        """
+        try:
+            logger.info("Retrieving documents for: %.50s...", question)
 
-            # Perform hybrid retrieval
-            retrieval_result = await hybrid_retriever.run_async(
-                queries=single_question,
-                dense_embeddings=dense_result["embeddings"],
-                sparse_embeddings=sparse_result["sparse_embeddings"],
-                top_k=DEFAULT_TOP_K
-            )
+            # Perform hybrid retrieval, batched with other in-flight requests
+            pair, embedding = await self._retrieval_batcher.submit(question)
 
             # Convert to LegalSource objects with proper relevance scoring
             sources = []
-            question_context_pairs = retrieval_result.get("question_context_pairs", [])
-
-            for pair in question_context_pairs:
-                if "documents" in pair and pair["documents"]:
-                    for doc_idx, doc in enumerate(pair["documents"]):
-                        metadata = doc.get("metadata", {})
-                        content = doc.get("content", "")
-
-                        # Get document score from Haystack Document object
-                        doc_score = getattr(doc, 'score', 0.5)
-                        if doc_score is None:
-                            doc_score = 0.8 - (doc_idx * 0.1)  # Fallback scoring
-
-                        enhanced_metadata = metadata.copy()
-                        enhanced_metadata.update({
-                            "content_preview": content[:200] if content else "",
-                            "retrieval_score": doc_score,
-                            "original_score": doc_score
-                        })
-
-                        source = SourceFactory.from_decomposition_result(enhanced_metadata)
-                        # Ensure the source has the proper relevance score
-                        source.relevance_score = float(doc_score)
-                        sources.append(source)
-
-            logger.info(f"Retrieved {len(sources)} sources for: {question[:50]}...")
-            return sources
+            for doc_idx, doc in enumerate(pair.get("documents", [])):
+                metadata = doc.get("metadata", {})
+                content = doc.get("content", "")
+
+                # Get document score from Haystack Document object
+                doc_score = getattr(doc, 'score', 0.5)
+                if doc_score is None:
+                    doc_score = 0.8 - (doc_idx * 0.1)  # Fallback scoring
+
+                enhanced_metadata = metadata.copy()
+                enhanced_metadata.update({
+                    "content_preview": content[:200] if content else "",
+                    "retrieval_score": doc_score,
+                    "original_score": doc_score
+                })
+
+                source = SourceFactory.from_decomposition_result(enhanced_metadata)
+                # Ensure the source has the proper relevance score
+                source.relevance_score = float(doc_score)
+                sources.append(source)
+
+            logger.info("Retrieved %d sources for: %.50s...", len(sources), question)
+            return sources, embedding
 
         except Exception as e:
-            logger.error(f"Document retrieval failed: {str(e)}", exc_info=True)
-            return []
+            logger.error("Document retrieval failed: %s", e, exc_info=True)
+            return [], None
 
-    async def _generate_direct_response(self, question: str, sources: List[LegalSource]) -> str:
+    async def _generate_direct_response(
+        self,
+        question: str,
+        sources: List[LegalSource],
+        embedding: Optional[List[float]] = None
+    ) -> str:
         """Generate direct response using sources"""
-        system_message = HaystackChatMessage.from_system(
-            "You are an expert legal assistant specializing in Nigerian jurisprudence. "
-            "Provide accurate, well-researched legal information with proper citations. "
-            "Always specify when information is general guidance and recommend consulting with qualified legal counsel."
-        )
-
-        context_message = self._create_context_prompt(question, sources)
-        user_message = HaystackChatMessage.from_user(context_message)
-
-        messages = [system_message, user_message]
-        result = self.chat_generator.run(messages=messages)
-
-        # Handle different response formats from Cohere
-        if hasattr(result, 'replies'):
-            # Result is a ChatGenerator response object
-            if result.replies and len(result.replies) > 0:
-                return result.replies[0].text
-        elif isinstance(result, dict):
-            # Result is a dictionary
-            if "replies" in result and result["replies"]:
-                if isinstance(result["replies"], list) and len(result["replies"]) > 0:
-                    reply = result["replies"][0]
-                    if hasattr(reply, 'text'):
-                        return reply.text
-                    elif isinstance(reply, dict) and "text" in reply:
-                        return reply["text"]
-
-        return "I'm unable to provide a response at this time."
+        messages = [
+            HaystackChatMessage.from_system(DIRECT_CHAT_SYSTEM_PROMPT),
+            HaystackChatMessage.from_system(LEGAL_ANSWER_INSTRUCTIONS),
+            *self._create_context_prompt(question, sources)
+        ]
+        return await self._generate_reply(question, messages, self._reply_cache_scope(messages[:-1]), embedding)
 
     async def _generate_contextual_response(
         self,
         question: str,
         sources: List[LegalSource],
-        conversation_history: List[HaystackChatMessage]
+        conversation_history: List[HaystackChatMessage],
+        has_system: bool = False,
+        embedding: Optional[List[float]] = None
     ) -> Tuple[str, List[LegalSource]]:
         """Generate response with conversation context and sources, returning both response and used sources"""
 
-        # Sort sources by relevance and display priority
-        sorted_sources = sorted(
-            sources,
-            key=lambda x: (x.display_priority, -x.relevance_score)
+        # Only use the top relevant sources (relevance threshold), ordered by display priority
+        # and relevance; ties break on identity so the same source set always renders the same way
+        relevant_sources = heapq.nsmallest(
+            MAX_PROMPT_SOURCES,
+            (s for s in sources if s.relevance_score > -2.0),
+            key=lambda x: (x.display_priority, -x.relevance_score, x.title, x.document_id or "")
         )
 
-        # Only use top relevant sources (relevance threshold)
-        relevant_sources = [s for s in sorted_sources if s.relevance_score > -2.0][:5]
+        # The history already ends with the current question, which goes last after the sources
+        history_end = len(conversation_history)
+        if history_end and conversation_history[-1].role == "user" and conversation_history[-1].text == question:
+            history_end -= 1
 
-        if not relevant_sources:
-            # No relevant sources found
-            context_message = f"USER QUESTION: {question}\n\nNo relevant legal sources were found for this query. Please provide general legal guidance while acknowledging the limitation in available sources."
+        # Use the conversation's own system message if it has one (and it is still in the
+        # history window), otherwise add ours
+        if has_system and history_end and conversation_history[0].role == "system":
+            system_message, history_start = conversation_history[0], 1
         else:
-            context_message = self._create_context_prompt(question, relevant_sources)
+            system_message, history_start = HaystackChatMessage.from_system(CONTEXTUAL_CHAT_SYSTEM_PROMPT), 0
+
+        # Stable prefix first (system prompt, guidelines, history), then per-turn sources and question
+        messages = [
+            system_message,
+            HaystackChatMessage.from_system(LEGAL_ANSWER_INSTRUCTIONS),
+            *conversation_history[history_start:history_end],
+            *self._create_context_prompt(question, relevant_sources, NO_SOURCES_GENERAL_GUIDANCE)
+        ]
+        response_text = await self._generate_reply(
+            question, messages, self._reply_cache_scope(messages[:-1]), embedding
+        )
+
+        return response_text, relevant_sources
 
-        prompt_message = HaystackChatMessage.from_user(context_message)
+    async def _generate_reply(
+        self,
+        question: str,
+        messages: List[HaystackChatMessage],
+        scope: str,
+        embedding: Optional[List[float]] = None
+    ) -> str:
+        """
+        Run the chat generator, reusing a cached reply for the same or a near-identical question
 
-        # Add system message if not in conversation history
-        if not any(msg.role == "system" for msg in conversation_history):
-            system_message = HaystackChatMessage.from_system(
-                "You are an expert legal assistant specializing in Nigerian jurisprudence. "
-                "Use the provided sources to give accurate, well-cited legal information. "
-                "Always cite your sources using the format [Source X] and distinguish between different types of legal authorities."
-            )
-            conversation_history = [system_message] + conversation_history
+        Args:
+            question: The user's question, used for exact and semantic cache keys
+            messages: Full message list to send to the generator
+            scope: Hash of everything in the prompt except the question
+            embedding: The question's dense embedding from retrieval; embedded here if not given
+
+        Returns:
+            Reply text
+        """
+        exact_key = f"{scope}:{' '.join(question.lower().split())}"
+        entry = self._reply_cache.get(exact_key)
+        if entry is not None:
+            if time.monotonic() - entry[0] < SEMANTIC_CACHE_TTL:
+                self._reply_cache.move_to_end(exact_key)
+                logger.info("Reply cache hit")
+                return entry[1]
+            del self._reply_cache[exact_key]
+
+        if not SEMANTIC_CACHE_ENABLED:
+            embedding = None
+        elif embedding is None:
+            embedding = await self._embed_for_reply_cache(question)
+        if embedding is not None:
+            cached = self._semantic_reply_cache.lookup(embedding, scope)
+            if cached is not None:
+                return cached
+
+        # The Cohere client blocks on the HTTP roundtrip, so keep it off the event loop
+        result = await asyncio.get_running_loop().run_in_executor(
+            _LLM_EXECUTOR, functools.partial(self.chat_generator.run, messages=messages)
+        )
+        reply = self._extract_reply_text(result)
+        if reply is None:
+            return FALLBACK_REPLY
+
+        self._reply_cache[exact_key] = (time.monotonic(), reply)
+        while len(self._reply_cache) > REPLY_CACHE_MAX_SIZE:
+            self._reply_cache.popitem(last=False)
+        if embedding is not None:
+            self._semantic_reply_cache.store(embedding, reply, scope)
 
-        messages = conversation_history + [prompt_message]
-        result = self.chat_generator.run(messages=messages)
+        return reply
 
-        # Handle different response formats from Cohere
+    async def _embed_for_reply_cache(self, question: str) -> Optional[List[float]]:
+        """Embed a question for near-duplicate reply lookup, returning None if disabled or unavailable"""
+        if not SEMANTIC_CACHE_ENABLED:
+            return None
+
+        try:
+            return await self._dense_batcher.submit(question)
+        except Exception as e:
+            logger.warning("Reply cache embedding failed: %s", e)
+            return None
+
+    async def _embed_dense_batch(self, questions: List[str]) -> List[List[float]]:
+        """Dense-embed a batch of questions in one embedder call"""
+        batch = Questions(questions=[Question(question=question) for question in questions])
+        result = await self._dense_embedder.run_async(batch)
+        return result.get("embeddings", [])
+
+    async def _retrieve_batch(self, questions: List[str]) -> List[Tuple[Dict[str, Any], List[float]]]:
+        """
+        Embed and retrieve documents for a batch of questions in one pass
+
+        Args:
+            questions: Question texts queued by concurrent requests
+
+        Returns:
+            One (question-context pair, dense embedding) tuple per question, in order
+        """
+        batch = Questions(questions=[Question(question=question) for question in questions])
+
+        dense_result, sparse_result = await asyncio.gather(
+            self._dense_embedder.run_async(batch),
+            self._sparse_embedder.run_async(batch)
+        )
+        dense_embeddings = dense_result.get("embeddings", [])
+        sparse_embeddings = sparse_result.get("sparse_embeddings", [])
+        if len(dense_embeddings) != len(questions) or len(sparse_embeddings) != len(questions):
+            raise RuntimeError("Embedding failed for retrieval batch")
+
+        retrieval_result = await self._hybrid_retriever.run_async(
+            queries=batch,
+            dense_embeddings=dense_embeddings,
+            sparse_embeddings=sparse_embeddings,
+            top_k=DEFAULT_TOP_K
+        )
+        return list(zip(retrieval_result.get("question_context_pairs", []), dense_embeddings))
+
+    @staticmethod
+    def _reply_cache_scope(prefix_messages: List[HaystackChatMessage]) -> str:
+        """Hash every message before the question (prompts, history and sources) into a cache scope"""
+        digest = hashlib.blake2b(digest_size=16)
+        for msg in prefix_messages:
+            digest.update(f"{msg.role}\x00{msg.text}\x00".encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _extract_reply_text(result: Any) -> Optional[str]:
+        """Pull the first reply's text out of a generator result, handling the formats Cohere returns"""
         if hasattr(result, 'replies'):
             # Result is a ChatGenerator response object
-            if result.replies and len(result.replies) > 0:
-                response_text = result.replies[0].text
-            else:
-                response_text = "I'm unable to provide a response at this time."
+            if result.replies:
+                return result.replies[0].text
         elif isinstance(result, dict):
             # Result is a dictionary
-            if "replies" in result and result["replies"]:
-                if isinstance(result["replies"], list) and len(result["replies"]) > 0:
-                    reply = result["replies"][0]
-                    if hasattr(reply, 'text'):
-                        response_text = reply.text
-                    elif isinstance(reply, dict) and "text" in reply:
-                        response_text = reply["text"]
-                    else:
-                        response_text = "I'm unable to provide a response at this time."
-                else:
-                    response_text = "I'm unable to provide a response at this time."
-            else:
-                response_text = "I'm unable to provide a response at this time."
-        else:
-            response_text = "I'm unable to provide a response at this time."
-
-        return response_text, relevant_sources
+            replies = result.get("replies")
+            if isinstance(replies, list) and replies:
+                reply = replies[0]
+                if hasattr(reply, 'text'):
+                    return reply.text
+                elif isinstance(reply, dict) and "text" in reply:
+                    return reply["text"]
 
-    def _create_context_prompt(self, question: str, sources: List[LegalSource]) -> str:
-        """Create context prompt with sources"""
-        if not sources:
-            return f"USER QUESTION: {question}\n\nPlease provide a comprehensive legal analysis of this question."
-
-        sources_text = ""
-        for idx, source in enumerate(sources):
-            sources_text += f"[{idx+1}] {source.title}\n"
-            if source.citation:
-                sources_text += f"Citation: {source.citation}\n"
-            if source.jurisdiction:
-                sources_text += f"Jurisdiction: {source.jurisdiction}\n"
-            if source.year:
-                sources_text += f"Year: {source.year}\n"
-            sources_text += f"Content: {source.content_preview}\n\n"
-
-        return f"""USER QUESTION: {question}
+        return None
 
-LEGAL SOURCES:
-{sources_text}
+    def _create_context_prompt(
+        self,
+        question: str,
+        sources: List[LegalSource],
+        no_sources_note: str = NO_SOURCES_FULL_ANALYSIS
+    ) -> List[HaystackChatMessage]:
+        """
+        Create the per-turn messages: one system message per source, then the user question
 
-INSTRUCTIONS:
-1. Provide a detailed legal analysis addressing the user's question
-2. Use inline citations in the format [Source X] when referencing specific sources
-3. Clearly distinguish between different types of sources (statutes, cases, regulations)
-4. Highlight Nigerian legal authority when available
-5. Acknowledge any limitations in the available legal information
-6. Always conclude with a recommendation to consult qualified legal counsel for specific legal advice
+        Args:
+            question: The user's question
+            sources: Sources to cite, in citation order
+            no_sources_note: Guidance sent instead of sources when there are none
 
-ANSWER:"""
+        Returns:
+            Messages to append after the stable prompt prefix
+        """
+        if not sources:
+            context_messages = [HaystackChatMessage.from_system(no_sources_note)]
+        else:
+            context_messages = [
+                HaystackChatMessage.from_system(self._format_source(idx, source))
+                for idx, source in enumerate(sources)
+            ]
+
+        context_messages.append(HaystackChatMessage.from_user(f"USER QUESTION: {question}"))
+        return context_messages
+
+    @staticmethod
+    def _format_source(idx: int, source: LegalSource) -> str:
+        """Render one source as a LEGAL SOURCE block numbered for [Source X] citations"""
+        lines = [f"LEGAL SOURCE [{idx+1}] {source.title}"]
+        if source.citation:
+            lines.append(f"Citation: {source.citation}")
+        if source.jurisdiction:
+            lines.append(f"Jurisdiction: {source.jurisdiction}")
+        if source.year:
+            lines.append(f"Year: {source.year}")
+        lines.append(f"Content: {source.content_preview}")
+        return "\n".join(lines)
 
     def get_conversation_history(self, conversation_id: str) -> List[ChatMessage]:
         """Get conversation history"""
@@ -603,4 +869,9 @@ def get_unified_chat_service() -> UnifiedChatService:
     global _unified_chat_service
     if _unified_chat_service is None:
         _unified_chat_service = UnifiedChatService()
-    return _unified_chat_service
\ No newline at end of file
+    return _unified_chat_service
+
+def shutdown_unified_chat_service():
+    """Stop the unified chat service's background work, if the service was created"""
+    if _unified_chat_service is not None:
+        _unified_chat_service.close()
@@ -1,15 +1,28 @@
-import json
+import base64
+import binascii
 import logging
 import asyncio
-from typing import Dict, Any, Optional, Union
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+import httpx
+from pydantic_core import from_json, to_json
 from upstash_redis import Redis
 
 from app.config.settings import (
     UPSTASH_REDIS_REST_URL,
     UPSTASH_REDIS_REST_TOKEN,
     REDIS_CACHE_TTL,
-    REDIS_CACHE_ENABLED
+    REDIS_CACHE_ENABLED,
+    REDIS_BATCH_MAX_SIZE,
+    REDIS_BATCH_MAX_WAIT_MS,
+    REDIS_LOCAL_CACHE_SIZE,
+    REDIS_LOCAL_CACHE_TTL,
+    REDIS_MAX_PENDING_WRITES
 )
+from app.core.async_batcher import AsyncBatcher
+from app.models import Questions, Question
 
 logger = logging.getLogger("cache")
 
@@ -17,6 +30,19 @@ logger = logging.getLogger("cache")
 _redis_client = None
 _is_connected = False
 
+# Pydantic models that cached results may carry, keyed by their serialization tag
+_MODEL_TYPES = {model.__name__: model for model in (Questions, Question)}
+
+# In-process LRU of (stored_at, json_data) checked before Redis for hot keys
+_local_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+# Redis lookups in flight, so concurrent misses on one key share a single fetch
+_pending_gets: Dict[str, asyncio.Future] = {}
+# Cache writes running in the background, kept referenced until they finish
+_background_writes: Set[asyncio.Task] = set()
+
+# Pooled HTTP/2 client for the hot-path REST calls (keeps TCP+TLS alive)
+_http_client: Optional[httpx.AsyncClient] = None
+
 
 # Dummy client class for compatibility with main.py
 class DummyRedisClient:
@@ -84,27 +110,27 @@ async def get_cached_result(query_key: str) -> Optional[Dict[str, Any]]:
         return None
 
     # Get client and check connection
-    redis_client = _get_redis_client_sync()
+    _get_redis_client_sync()
     if not _is_connected:
         return None
 
     try:
         # Create key with namespace
-        cache_key = f"legal_query:{query_key}"
+        cache_key = f"lqz:{query_key}"
 
-        # Execute in thread pool to avoid blocking
-        redis_data = await asyncio.to_thread(redis_client.get, cache_key)
+        # Local copy first, then Redis (concurrent lookups share one MGET round-trip)
+        redis_data = await _fetch_cached_json(cache_key)
 
         if redis_data:
             logger.info(f"Cache hit for key: {cache_key[:30]}...")
             try:
-                result = json.loads(redis_data)
+                result = from_json(redis_data)
                 # Add cache hit flag
                 if isinstance(result, dict):
                     result["cache_hit"] = True
-                # Reconstruct Pydantic models
-                return _reconstruct_models(result)
-            except json.JSONDecodeError as e:
+                # Rebuild tagged Pydantic models
+                return _rehydrate(result)
+            except ValueError as e:
                 logger.error(f"Cache JSON decode error: {str(e)}")
                 return None
         else:
@@ -121,130 +147,227 @@ async def cache_result(query_key: str, result: Dict[str, Any]) -> bool:
         return False
 
     # Get client and check connection
-    redis_client = _get_redis_client_sync()
+    _get_redis_client_sync()
     if not _is_connected:
         return False
 
     try:
         # Create key with namespace
-        cache_key = f"legal_query:{query_key}"
+        cache_key = f"lqz:{query_key}"
 
-        # Prepare data for storage - Handle Pydantic models
-        serializable_result = _prepare_for_serialization(result)
+        await _store_json(cache_key, _serialize_result(result))
+        return True
+    except Exception as e:
+        logger.error(f"Cache storage error: {str(e)}")
+        return False
 
-        # Convert to JSON string
-        json_data = json.dumps(serializable_result)
 
-        # Store with TTL (execute in thread pool)
-        await asyncio.to_thread(
-            redis_client.set,
-            cache_key,
-            json_data,
-            ex=REDIS_CACHE_TTL
-        )
+def cache_result_in_background(query_key: str, result: Dict[str, Any]) -> bool:
+    """
+    Store result in cache without making the caller wait for Redis.
+    The result is serialized immediately, so the caller may mutate it afterwards.
 
-        logger.info(f"Cached result for key: {cache_key[:30]}... TTL: {REDIS_CACHE_TTL}s")
-        return True
+    Args:
+        query_key: Cache key for the query
+        result: Result dictionary to store
+
+    Returns:
+        True if the write was scheduled
+    """
+    if not REDIS_CACHE_ENABLED:
+        return False
+
+    # Get client and check connection
+    _get_redis_client_sync()
+    if not _is_connected:
+        return False
+
+    # Bound outstanding writes so a slow Redis cannot pile up payloads in memory
+    if len(_background_writes) >= REDIS_MAX_PENDING_WRITES:
+        logger.warning(f"{len(_background_writes)} cache writes pending, skipping this one")
+        return False
+
+    try:
+        cache_key = f"lqz:{query_key}"
+        json_data = _serialize_result(result)
     except Exception as e:
-        logger.error(f"Cache storage error: {str(e)}")
+        logger.error(f"Cache serialization error: {str(e)}")
         return False
 
+    task = asyncio.ensure_future(_store_json(cache_key, json_data))
+    _background_writes.add(task)
+    task.add_done_callback(_on_background_write_done)
+    return True
+
+
+def _on_background_write_done(task: asyncio.Task):
+    """Release a finished background write and log its failure, if any"""
+    _background_writes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Cache storage error: {str(task.exception())}")
+
+
+def _serialize_result(result: Dict[str, Any]) -> str:
+    """Convert a result to JSON text (Upstash REST takes text values)"""
+    # Pydantic models are serialized natively; other objects go through the fallback
+    return to_json(_tag_models(result), fallback=_serialization_fallback).decode()
+
+
+async def _store_json(cache_key: str, json_data: str):
+    """Store serialized JSON locally and in Redis with TTL"""
+    _local_put(cache_key, json_data)
+
+    # Concurrent writes share one pipelined request
+    await _set_batcher.submit((cache_key, json_data))
+
+    logger.info(f"Cached result for key: {cache_key[:30]}... TTL: {REDIS_CACHE_TTL}s")
+
+
+def _local_get(cache_key: str) -> Optional[str]:
+    """Get a fresh local copy of a cache entry, dropping it if it has expired"""
+    entry = _local_cache.get(cache_key)
+    if entry is None:
+        return None
+
+    if time.monotonic() - entry[0] >= REDIS_LOCAL_CACHE_TTL:
+        del _local_cache[cache_key]
+        return None
+
+    _local_cache.move_to_end(cache_key)
+    return entry[1]
+
 
-def _prepare_for_serialization(data: Any) -> Any:
-    """Prepare data for JSON serialization"""
-    if hasattr(data, "model_dump"):
-        # Pydantic v2+
-        return data.model_dump(mode='json')
-    elif hasattr(data, "dict"):
+def _local_put(cache_key: str, json_data: str):
+    """Keep a local copy of a cache entry, evicting the least recently used"""
+    _local_cache[cache_key] = (time.monotonic(), json_data)
+    _local_cache.move_to_end(cache_key)
+    while len(_local_cache) > REDIS_LOCAL_CACHE_SIZE:
+        _local_cache.popitem(last=False)
+
+
+async def _fetch_cached_json(cache_key: str) -> Optional[str]:
+    """
+    Get the stored JSON for a key from the local cache, falling back to Redis
+
+    Args:
+        cache_key: Namespaced cache key
+
+    Returns:
+        The JSON text, or None on a miss
+    """
+    json_data = _local_get(cache_key)
+    if json_data is not None:
+        return json_data
+
+    future = _pending_gets.get(cache_key)
+    if future is None:
+        future = asyncio.ensure_future(_get_batcher.submit(cache_key))
+        _pending_gets[cache_key] = future
+        future.add_done_callback(lambda _: _pending_gets.pop(cache_key, None))
+
+    json_data = await asyncio.shield(future)
+    if json_data:
+        _local_put(cache_key, json_data)
+    return json_data
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared async client for the Upstash REST API"""
+    global _http_client
+
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=UPSTASH_REDIS_REST_URL,
+            headers={"Authorization": f"Bearer {UPSTASH_REDIS_REST_TOKEN}"},
+            http2=True
+        )
+
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared REST client on shutdown"""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def _execute_rest(path: str, payload: List[Any]) -> Any:
+    """POST a command (or a pipeline of commands) to the Upstash REST API"""
+    response = await _get_http_client().post(path, json=payload)
+    response.raise_for_status()
+    return response.json()
+
+
+def _compress(json_data: str) -> str:
+    """Compress JSON text into the base64 string stored in Redis"""
+    return base64.b64encode(zlib.compress(json_data.encode(), 3)).decode("ascii")
+
+
+def _decompress(stored: Optional[str]) -> Optional[str]:
+    """Recover JSON text from a stored value; unreadable values count as misses"""
+    if not stored:
+        return None
+
+    try:
+        return zlib.decompress(base64.b64decode(stored)).decode()
+    except (binascii.Error, zlib.error, UnicodeDecodeError) as e:
+        logger.warning(f"Discarding unreadable cache value: {str(e)}")
+        return None
+
+
+async def _get_batch(cache_keys: List[str]) -> List[Optional[str]]:
+    """Fetch several keys with a single MGET"""
+    data = await _execute_rest("/", ["MGET", *cache_keys])
+    return [_decompress(stored) for stored in data["result"]]
+
+
+async def _set_batch(entries: List[Tuple[str, str]]) -> List[Any]:
+    """Store several keys with TTL in a single pipeline request"""
+    commands = [
+        ["SET", cache_key, _compress(json_data), "EX", REDIS_CACHE_TTL]
+        for cache_key, json_data in entries
+    ]
+    data = await _execute_rest("/pipeline", commands)
+    return [item.get("result") for item in data]
+
+
+_get_batcher = AsyncBatcher(_get_batch, max_batch=REDIS_BATCH_MAX_SIZE, max_wait_ms=REDIS_BATCH_MAX_WAIT_MS)
+_set_batcher = AsyncBatcher(_set_batch, max_batch=REDIS_BATCH_MAX_SIZE, max_wait_ms=REDIS_BATCH_MAX_WAIT_MS)
+
+
+def _serialization_fallback(data: Any) -> Any:
+    """Convert values the JSON encoder does not recognize"""
+    if hasattr(data, "dict"):
         # Pydantic v1
         return data.dict()
-    elif isinstance(data, dict):
-        return {k: _prepare_for_serialization(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [_prepare_for_serialization(item) for item in data]
-    else:
-        # Basic types are returned as-is
-        return data
+    raise TypeError(f"Object of type {type(data).__name__} is not JSON serializable")
 
 
-def _reconstruct_models(data: Any) -> Any:
-    """Reconstruct Pydantic models from dict representations"""
-    # Import here to avoid circular imports
-    from app.models import Questions, Question
+def _tag_models(result: Any) -> Any:
+    """Wrap top-level Pydantic models with their type name so reads can rebuild them"""
+    if not isinstance(result, dict):
+        return result
 
-    if isinstance(data, dict):
-        # Check if this dict looks like a Questions object that was serialized
-        if "questions" in data and isinstance(data["questions"], list):
-            try:
-                questions_list = []
-                for q_data in data["questions"]:
-                    if isinstance(q_data, dict) and "question" in q_data:
-                        questions_list.append(
-                            Question(
-                                question=q_data.get("question", ""),
-                                answer=q_data.get("answer")
-                            )
-                        )
-                if questions_list:
-                    logger.info(f"Reconstructed Questions object from dict with {len(questions_list)} questions")
-                    return Questions(questions=questions_list)
-            except Exception as e:
-                logger.warning(f"Questions model reconstruction from dict failed: {str(e)}")
-
-        # Process all dict values recursively
-        return {k: _reconstruct_models(v) for k, v in data.items()}
-
-    elif isinstance(data, tuple):
-        # This is the problematic case - tuple needs to be reconstructed
-        logger.warning(f"Reconstructing tuple: {data}")
-        if len(data) >= 2 and data[0] == "questions":
-            # This is the specific case we've been seeing - ("questions", [Question(...)])
-            questions_list = data[1] if isinstance(data[1], list) else []
-            if questions_list:
-                # Convert to Questions object
-                try:
-                    questions_obj = Questions(questions=questions_list)
-                    logger.info(f"Reconstructed Questions object from tuple with {len(questions_list)} questions")
-                    return questions_obj
-                except Exception as e:
-                    logger.warning(f"Failed to reconstruct Questions from tuple: {str(e)}")
-                    return questions_list
-            return questions_list
-        elif len(data) >= 2:
-            # Try to reconstruct the second element if it's a questions list
-            reconstructed_second = _reconstruct_models(data[1])
-            return (data[0], reconstructed_second)
-        else:
-            return data
-
-    elif isinstance(data, list):
-        # Check if this looks like a Questions structure
-        if (len(data) > 0 and
-            isinstance(data[0], dict) and
-            "question" in data[0] and
-            "answer" in data[0]):
-            # This is a list of question dictionaries - convert to Questions object
-            try:
-                questions_list = []
-                for q_data in data:
-                    if isinstance(q_data, dict) and "question" in q_data:
-                        questions_list.append(
-                            Question(
-                                question=q_data.get("question", ""),
-                                answer=q_data.get("answer")
-                            )
-                        )
-                if questions_list:
-                    logger.info(f"Reconstructed Questions object from list with {len(questions_list)} questions")
-                    return Questions(questions=questions_list)
-            except Exception as e:
-                logger.warning(f"Questions model reconstruction from list failed: {str(e)}")
-
-        # Regular list - process recursively
-        return [_reconstruct_models(item) for item in data]
-    else:
+    return {
+        k: {"__type__": type(v).__name__, "__data__": v} if type(v).__name__ in _MODEL_TYPES else v
+        for k, v in result.items()
+    }
+
+
+def _rehydrate(data: Any) -> Any:
+    """Rebuild the Pydantic models tagged by _tag_models"""
+    if not isinstance(data, dict):
         return data
 
+    for k, v in data.items():
+        if isinstance(v, dict) and "__type__" in v:
+            data[k] = _MODEL_TYPES[v["__type__"]].model_validate(v["__data__"])
+
+    return data
+
 
 # Initialize connection at module load time
 if REDIS_CACHE_ENABLED:
@@ -1,9 +1,28 @@
 """
 Formatter utilities for converting structured data to markdown and other formats.
 """
-import json
+import io
+import re
 from typing import Dict, Any, List
 
+from pydantic_core import to_json
+
+# A heading is a line ending in ':' that does not start with a space, or a
+# short (under 30 chars) line made only of letters and whitespace. [^\W\d_] also
+# matches numerals such as '²' or 'Ⅻ', so short-line candidates are confirmed
+# with str.isalpha() in _is_heading
+_HEADING_RE = re.compile(r'(?m)^(?:(?! )[^\n]*:|(?:[^\W\d_]|[^\S\n]){1,29})$')
+
+
+def _is_heading(line: str) -> bool:
+    """Confirm a _HEADING_RE match: colon headings as-is, short lines only if every character is a letter or space"""
+    return line.endswith(':') or all(c.isalpha() or c.isspace() for c in line)
+
+
+# Source title fields in lookup priority order, and their display names
+_TITLE_FIELDS = ("case_title", "article_title", "legislation_title")
+_TYPE_NAMES = {"case_title": "Case", "article_title": "Article", "legislation_title": "Legislation"}
+
 
 class MarkdownFormatter:
     """
@@ -12,7 +31,7 @@ class MarkdownFormatter:
     """
 
     @staticmethod
-    def format_as_markdown(result: Dict[str, Any]) -> str:
+    def format_as_markdown(result: Dict[str, Any]) -> bytes:
         """
         Format query response as JSON with markdown content.
 
@@ -20,13 +39,13 @@ class MarkdownFormatter:
             result: Query result dictionary
 
         Returns:
-            JSON string with formatted markdown content
+            UTF-8 encoded JSON with formatted markdown content
         """
-        output = []
+        # Every line is written with its trailing newline into one buffer
+        buf = io.StringIO()
 
         # Empty heading instead of question (privacy/security consideration)
-        output.append("# ")
-        output.append("")
+        buf.write("# \n\n")
 
         # Process sections in preferred order
         sections = [
@@ -37,23 +56,22 @@ class MarkdownFormatter:
 
         # Apply each section formatter
         for formatter in sections:
-            section_content = formatter(result)
-            if section_content:
-                output.extend(section_content)
+            formatter(result, buf)
 
-        # Combine into a single markdown string
-        markdown_content = "\n".join(output)
+        # Drop the newline after the last line
+        markdown_content = buf.getvalue()[:-1]
 
-        # Return as JSON with markdown key
-        return json.dumps({"markdown": markdown_content})
+        # Return as JSON with markdown key, already encoded for the response body
+        return to_json({"markdown": markdown_content})
 
     @staticmethod
-    def _format_answer_section(result: Dict[str, Any]) -> List[str]:
-        """Format the answer section"""
+    def _format_answer_section(result: Dict[str, Any], buf: io.StringIO):
+        """Write the answer section"""
         if not result.get("final_answer"):
-            return []
+            return
 
-        output = ["## Answer", ""]
+        write = buf.write
+        write("## Answer\n\n")
 
         # Process answer content
         final_answer = result["final_answer"]
@@ -62,76 +80,59 @@ class MarkdownFormatter:
         if sections:
             # Format sections with ### headings
             for heading, content in sections:
-                output.append(f"### {heading}")
-                output.append("")
-                output.append(content)
-                output.append("")
+                write(f"### {heading}\n\n{content}\n\n")
         else:
             # No sections detected, include entire answer
-            output.append(final_answer)
-            output.append("")
-
-        return output
+            write(f"{final_answer}\n\n")
 
     @staticmethod
-    def _format_sources_section(result: Dict[str, Any]) -> List[str]:
-        """Format the sources section"""
+    def _format_sources_section(result: Dict[str, Any], buf: io.StringIO):
+        """Write the sources section"""
         if not result.get("document_metadata"):
-            return []
+            return
 
-        output = ["### Sources", ""]
+        write = buf.write
+        write("### Sources\n\n")
 
-        # Create a dictionary to deduplicate sources
-        unique_sources = {}
+        # Keep only the best (score, document ID) per source in a single pass
+        best_sources = {}
         for doc in result["document_metadata"]:
-            source_key = None
-
             # Find the title field
-            for field in ["case_title", "article_title", "legislation_title"]:
+            for field in _TITLE_FIELDS:
                 if field in doc:
                     source_key = (field, doc[field])
+                    score = doc.get("score", 0)
+                    current = best_sources.get(source_key)
+                    if current is None or score > current[0]:
+                        best_sources[source_key] = (score, doc.get("document_id", "Unknown"))
                     break
 
-            # Only keep sources with higher scores
-            if source_key and (
-                    source_key not in unique_sources or
-                    doc.get("score", 0) > unique_sources[source_key].get("score", 0)):
-                unique_sources[source_key] = doc
-
         # Output unique sources
-        for (field_type, title), doc in unique_sources.items():
-            type_name = field_type.replace("_title", "").capitalize()
-            output.append(f"- **{type_name}**: {title} (Document ID: {doc.get('document_id', 'Unknown')})")
+        for (field_type, title), (_, document_id) in best_sources.items():
+            write(f"- **{_TYPE_NAMES[field_type]}**: {title} (Document ID: {document_id})\n")
 
-        output.append("")
-        return output
+        write("\n")
 
     @staticmethod
-    def _format_questions_section(result: Dict[str, Any]) -> List[str]:
-        """Format the key legal questions section"""
+    def _format_questions_section(result: Dict[str, Any], buf: io.StringIO):
+        """Write the key legal questions section"""
         decomposed_questions = result.get("decomposed_questions")
         if not decomposed_questions:
-            return []
+            return
 
-        output = ["## Key Legal Questions", ""]
+        write = buf.write
+        write("## Key Legal Questions\n\n")
 
-        for i, q_a in enumerate(decomposed_questions, 1):
-            # Handle both dictionary and Pydantic model formats
-            if hasattr(q_a, 'question'):
-                # It's a Pydantic model
-                question = q_a.question
+        # Lists are homogeneous, so decide the item format once up front
+        if hasattr(decomposed_questions[0], 'question'):
+            # Pydantic models
+            for i, q_a in enumerate(decomposed_questions, 1):
                 answer = q_a.answer if q_a.answer is not None else "No answer available"
-            else:
-                # It's a dictionary
-                question = q_a.get('question', '')
-                answer = q_a.get('answer', 'No answer available')
-
-            output.append(f"### Q{i}: {question}")
-            output.append("")
-            output.append(answer)
-            output.append("")
-
-        return output
+                write(f"### Q{i}: {q_a.question}\n\n{answer}\n\n")
+        else:
+            # Dictionaries
+            for i, q_a in enumerate(decomposed_questions, 1):
+                write(f"### Q{i}: {q_a.get('question', '')}\n\n{q_a.get('answer', 'No answer available')}\n\n")
 
     @staticmethod
     def _extract_sections(text: str) -> List[tuple]:
@@ -145,35 +146,27 @@ class MarkdownFormatter:
             List of (heading, content) tuples
         """
         sections = []
-        current_section = []
-        current_heading = None
-
-        for line in text.split('\n'):
-            # Check if line is a potential heading
-            is_heading = (line.endswith(':') and not line.startswith(' ')) or (
-                    line and all(c.isalpha() or c.isspace() for c in line) and len(line) < 30
-            )
-
-            if is_heading:
-                # Save previous section if it exists
-                if current_heading and current_section:
-                    sections.append((current_heading, '\n'.join(current_section)))
-
-                # Start new section
-                current_heading = line.strip(':')
-                current_section = []
+        text_length = len(text)
+        headings = [match for match in _HEADING_RE.finditer(text) if _is_heading(match.group(0))]
+
+        for idx, match in enumerate(headings):
+            heading = match.group(0).strip(':')
+
+            # Content runs from the line after this heading to the line before the next one
+            content_start = match.end() + 1
+            if idx + 1 < len(headings):
+                content_end = headings[idx + 1].start() - 1
             else:
-                current_section.append(line)
+                content_end = text_length
 
-        # Add the last section
-        if current_heading and current_section:
-            sections.append((current_heading, '\n'.join(current_section)))
+            # Skip untitled headings and headings with no lines beneath them
+            if heading and content_start <= content_end:
+                sections.append((heading, text[content_start:content_end]))
 
         return sections
 
-
 # Export the function with the original name for backward compatibility
-def format_as_markdown(result: Dict[str, Any]) -> str:
+def format_as_markdown(result: Dict[str, Any]) -> bytes:
     """
     Format query response as markdown.
     Backward-compatible function that uses the MarkdownFormatter class.
@@ -182,6 +175,6 @@ def format_as_markdown(result: Dict[str, Any]) -> str:
         result: Result dictionary
 
     Returns:
-        JSON string with markdown content
+        UTF-8 encoded JSON with markdown content
     """
     return MarkdownFormatter.format_as_markdown(result)
\ No newline at end of file
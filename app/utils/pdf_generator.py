@@ -3,30 +3,98 @@ PDF generation utilities using ReportLab for creating legal analysis documents.
 """
 import os
 import uuid
-import datetime
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from io import BytesIO
-from typing import List, Dict, Any, Optional
+from typing import BinaryIO, List, Dict, Any, Optional, Tuple
 from functools import lru_cache
 
 # ReportLab imports
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
-from reportlab.lib.units import cm, mm
+from reportlab.lib.units import cm
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.lib.enums import TA_LEFT, TA_JUSTIFY
+from reportlab.lib.utils import ImageReader
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle,
-    PageBreak, ListFlowable, ListItem, Flowable
+    SimpleDocTemplate, Paragraph, Spacer, Image, ListFlowable, ListItem
 )
 from reportlab.pdfgen.canvas import Canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 
 import logging
 
+from app.config.settings import PDF_WORKERS
+
 logger = logging.getLogger("pdf_generator")
 
+# Process pool for PDF builds, created on first use; ReportLab layout is pure Python
+_pdf_executor: Optional[ProcessPoolExecutor] = None
+
+# Source title fields in lookup priority order
+_TITLE_FIELDS = ("case_title", "article_title", "legislation_title")
+
+# Line prefixes that mark bullet list items in answers
+_BULLET_MARKERS = ('•', '-')
+
+# Rule drawn above the signature block
+_SIGNATURE_LINE = "_" * 50
+
+# Faint fill for the diagonal page watermark
+_WATERMARK_COLOR = colors.Color(0.9, 0.9, 0.9, alpha=0.2)
+
+
+@lru_cache(maxsize=1)
+def _build_stylesheet():
+    """
+    Build the stylesheet used for legal analysis PDFs.
+    Built once and shared; callers must not mutate the returned styles.
+
+    Returns:
+        Sample stylesheet with updated and custom paragraph styles
+    """
+    styles = getSampleStyleSheet()
+
+    # Update existing styles with custom attributes
+    style_updates = {
+        'Title': {'fontSize': 18, 'spaceAfter': 12, 'alignment': TA_LEFT},
+        'Heading2': {'fontSize': 14, 'spaceAfter': 10, 'spaceBefore': 15},
+        'Heading3': {'fontSize': 12, 'spaceAfter': 8, 'spaceBefore': 10},
+        'Normal': {'fontSize': 11, 'spaceAfter': 6, 'alignment': TA_JUSTIFY}
+    }
+
+    for style_name, attributes in style_updates.items():
+        for attr, value in attributes.items():
+            setattr(styles[style_name], attr, value)
+
+    # Add custom styles
+    custom_styles = [
+        ('BodyText-Justified', styles['Normal'], {
+            'fontSize': 11,
+            'spaceAfter': 6,
+            'alignment': TA_JUSTIFY
+        }),
+        ('SourceItem', styles['Normal'], {
+            'fontSize': 10,
+            'leftIndent': 20,
+            'spaceAfter': 3
+        }),
+        ('SignatureInfo', styles['Normal'], {
+            'fontSize': 9,
+            'textColor': colors.gray
+        })
+    ]
+
+    for name, parent, attributes in custom_styles:
+        style = ParagraphStyle(name=name, parent=parent)
+        for attr, value in attributes.items():
+            setattr(style, attr, value)
+        styles.add(style)
+
+    return styles
+
 
 class NumberedCanvas(Canvas):
     """
@@ -59,28 +127,46 @@ class NumberedCanvas(Canvas):
         )
 
 
-class Watermark(Flowable):
+@lru_cache(maxsize=128)
+def _detect_sections(text: str) -> Tuple[Tuple[str, str], ...]:
     """
-    Custom Flowable for creating a watermark.
+    Detect sections in text based on headings.
+    Memoized because PDFs are often regenerated for the same answer.
+
+    Args:
+        text: Answer text with paragraphs separated by blank lines
+
+    Returns:
+        Tuple of (header, content) pairs
     """
+    sections = []
+    current_section = None
+    current_content = []
+
+    for line in text.split('\n\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        # Check if this is a section header: a short colon line, or a short line made only of
+        # letters and whitespace (str.isalpha(), which unlike [^\W\d_] rejects numerals like '²')
+        if (line.endswith(':') and len(line.split()) <= 5) or (
+                len(line) < 30 and ''.join(line.split()).isalpha()):
+            # This is a header - save previous section and start new one
+            if current_section:
+                sections.append((current_section, '\n'.join(current_content)))
+
+            current_section = line.rstrip(':')
+            current_content = []
+        else:
+            # This is content - add to current section
+            current_content.append(line)
 
-    def __init__(self, text="CONFIDENTIAL", angle=45, fontsize=100, color=colors.lightgrey):
-        Flowable.__init__(self)
-        self.text = text
-        self.angle = angle
-        self.fontsize = fontsize
-        self.color = color
+    # Add the last section
+    if current_section and current_content:
+        sections.append((current_section, '\n'.join(current_content)))
 
-    def draw(self):
-        canvas = self.canv
-        canvas.saveState()
-        canvas.translate(A4[0] / 2, A4[1] / 2)
-        canvas.rotate(self.angle)
-        canvas.setFont("Helvetica-Bold", self.fontsize)
-        canvas.setFillColor(self.color)
-        canvas.setStrokeColor(self.color)
-        canvas.drawCentredString(0, 0, self.text)
-        canvas.restoreState()
+    return tuple(sections)
 
 
 class PDFGenerator:
@@ -89,9 +175,8 @@ class PDFGenerator:
     """
 
     def __init__(self):
-        # Set up styles
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
+        # Shared, read-only stylesheet built once per process
+        self.styles = _build_stylesheet()
 
         # Ensure needed directories exist
         self._ensure_directories()
@@ -100,6 +185,15 @@ class PDFGenerator:
         self.logo_path = self._get_logo_path()
         self.signature_path = self._get_signature_path()
 
+        # Resolve static assets once instead of on every page or PDF
+        self.refresh_paths()
+
+    def refresh_paths(self):
+        """Re-check the logo and signature files, e.g. after replacing them on disk"""
+        # Decode the logo once; every page of every PDF reuses it
+        self._logo = self._load_logo()
+        self._signature_exists = os.path.exists(self.signature_path)
+
     def _ensure_directories(self):
         """Ensure required directories exist"""
         for directory in ["static", "static/signatures"]:
@@ -112,65 +206,30 @@ class PDFGenerator:
             logger.warning(f"Logo file not found at {path}")
         return path
 
+    def _load_logo(self) -> Optional[ImageReader]:
+        """Load the logo image for reuse across pages, or None if unavailable"""
+        if not os.path.exists(self.logo_path):
+            return None
+
+        try:
+            return ImageReader(self.logo_path)
+        except Exception as e:
+            logger.error(f"Error loading logo: {str(e)}")
+            return None
+
     def _get_signature_path(self):
         """Get path to signature file"""
         return "static/signatures/signature.png"
 
-    def _setup_styles(self):
-        """Set up custom paragraph styles"""
-        # Update existing styles
-        self._update_existing_styles()
-
-        # Add custom styles
-        self._add_custom_styles()
-
-    def _update_existing_styles(self):
-        """Update existing styles with custom attributes"""
-        style_updates = {
-            'Title': {'fontSize': 18, 'spaceAfter': 12, 'alignment': TA_LEFT},
-            'Heading2': {'fontSize': 14, 'spaceAfter': 10, 'spaceBefore': 15},
-            'Heading3': {'fontSize': 12, 'spaceAfter': 8, 'spaceBefore': 10},
-            'Normal': {'fontSize': 11, 'spaceAfter': 6, 'alignment': TA_JUSTIFY}
-        }
-
-        for style_name, attributes in style_updates.items():
-            for attr, value in attributes.items():
-                setattr(self.styles[style_name], attr, value)
-
-    def _add_custom_styles(self):
-        """Add custom styles to the stylesheet"""
-        custom_styles = [
-            ('BodyText-Justified', self.styles['Normal'], {
-                'fontSize': 11,
-                'spaceAfter': 6,
-                'alignment': TA_JUSTIFY
-            }),
-            ('SourceItem', self.styles['Normal'], {
-                'fontSize': 10,
-                'leftIndent': 20,
-                'spaceAfter': 3
-            }),
-            ('SignatureInfo', self.styles['Normal'], {
-                'fontSize': 9,
-                'textColor': colors.gray
-            })
-        ]
-
-        for name, parent, attributes in custom_styles:
-            style = ParagraphStyle(name=name, parent=parent)
-            for attr, value in attributes.items():
-                setattr(style, attr, value)
-            self.styles.add(style)
-
     def _create_header_with_logo(self, canvas, doc):
         """Add header with logo to each page"""
         canvas.saveState()
 
         # Draw logo at the top of the page if it exists
-        if os.path.exists(self.logo_path):
+        if self._logo is not None:
             try:
                 canvas.drawImage(
-                    self.logo_path,
+                    self._logo,
                     doc.leftMargin,
                     doc.height + doc.topMargin - 1.5 * cm,
                     width=4 * cm,
@@ -182,6 +241,18 @@ class PDFGenerator:
 
         canvas.restoreState()
 
+    @staticmethod
+    def _draw_watermark(canvas):
+        """Draw the diagonal watermark across the page"""
+        canvas.saveState()
+        canvas.translate(A4[0] / 2, A4[1] / 2)
+        canvas.rotate(-45)
+        canvas.setFont("Helvetica-Bold", 100)
+        canvas.setFillColor(_WATERMARK_COLOR)
+        canvas.setStrokeColor(_WATERMARK_COLOR)
+        canvas.drawCentredString(0, 0, "LEXANALYTICS")
+        canvas.restoreState()
+
     def generate_pdf(
             self,
             question: str,
@@ -205,11 +276,80 @@ class PDFGenerator:
         """
         buffer = BytesIO()
 
+        try:
+            self.generate_pdf_to_stream(
+                buffer,
+                question,
+                decomposed_questions,
+                final_answer,
+                document_metadata,
+                include_watermark
+            )
+
+            # Return PDF as bytes (getvalue hands over the buffer without copying)
+            return buffer.getvalue()
+        finally:
+            buffer.close()
+
+    async def generate_pdf_async(
+            self,
+            question: str,
+            decomposed_questions: List[Dict[str, str]],
+            final_answer: str,
+            document_metadata: List[Dict[str, Any]],
+            include_watermark: bool = True
+    ) -> bytes:
+        """
+        Generate a PDF document in a worker process, keeping the event loop free.
+        The worker builds with its process's get_pdf_generator() singleton; generators
+        take no configuration, so the result matches generate_pdf on this instance.
+
+        Args:
+            question: Original question
+            decomposed_questions: List of dicts with 'question' and 'answer' keys
+            final_answer: Final synthesized answer
+            document_metadata: List of document metadata dicts
+            include_watermark: Whether to include watermark
+
+        Returns:
+            PDF as bytes
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_pdf_executor(),
+            _generate_pdf_in_worker,
+            question,
+            decomposed_questions,
+            final_answer,
+            document_metadata,
+            include_watermark
+        )
+
+    def generate_pdf_to_stream(
+            self,
+            stream: BinaryIO,
+            question: str,
+            decomposed_questions: List[Dict[str, str]],
+            final_answer: str,
+            document_metadata: List[Dict[str, Any]],
+            include_watermark: bool = True
+    ):
+        """
+        Generate a PDF document with legal analysis, writing it to a binary stream
+
+        Args:
+            stream: Writable binary file-like object that receives the PDF
+            question: Original question
+            decomposed_questions: List of dicts with 'question' and 'answer' keys
+            final_answer: Final synthesized answer
+            document_metadata: List of document metadata dicts
+            include_watermark: Whether to include watermark
+        """
         try:
             # Create document
             logger.debug(f"Creating PDF for question: {question[:50]}")
             pdf_doc = SimpleDocTemplate(
-                buffer,
+                stream,
                 pagesize=A4,
                 leftMargin=2 * cm,
                 rightMargin=2 * cm,
@@ -221,15 +361,6 @@ class PDFGenerator:
             # List of elements to build the PDF
             elements = []
 
-            # Add watermark if requested
-            if include_watermark:
-                elements.append(Watermark(
-                    text="LEXANALYTICS",
-                    angle=-45,
-                    fontsize=100,
-                    color=colors.Color(0.9, 0.9, 0.9, alpha=0.2)
-                ))
-
             # Add content sections
             self._add_title_section(elements, question)
             self._add_questions_section(elements, decomposed_questions)
@@ -237,40 +368,46 @@ class PDFGenerator:
             self._add_sources_section(elements, document_metadata)
             self._add_signature_section(elements)
 
+            # Page decorations are painted directly on the canvas, outside the layout flow
+            def paint_page(canvas, doc):
+                self._create_header_with_logo(canvas, doc)
+                if include_watermark:
+                    self._draw_watermark(canvas)
+
             # Build the PDF with custom canvas for page numbering
             logger.debug("Building PDF document")
             pdf_doc.build(
                 elements,
-                onFirstPage=self._create_header_with_logo,
-                onLaterPages=self._create_header_with_logo,
+                onFirstPage=paint_page,
+                onLaterPages=paint_page,
                 canvasmaker=NumberedCanvas
             )
 
-            # Return PDF as bytes
-            return buffer.getvalue()
-
         except Exception as e:
             logger.error(f"Error generating PDF: {str(e)}", exc_info=True)
             raise
-        finally:
-            buffer.close()
 
     def _add_title_section(self, elements, question):
         """Add title section to PDF"""
-        elements.append(Paragraph(question, self.styles['Title']))
-        elements.append(Spacer(1, 0.5 * cm))
+        elements.extend([
+            Paragraph(question, self.styles['Title']),
+            Spacer(1, 0.5 * cm)
+        ])
 
     def _add_questions_section(self, elements, decomposed_questions):
         """Add key legal questions section to PDF"""
-        elements.append(Paragraph("Key Legal Questions", self.styles['Heading2']))
-        elements.append(Spacer(1, 0.3 * cm))
+        elements.extend([
+            Paragraph("Key Legal Questions", self.styles['Heading2']),
+            Spacer(1, 0.3 * cm)
+        ])
 
+        heading_style = self.styles['Heading3']
         for idx, q_a in enumerate(decomposed_questions, 1):
             question_text = q_a.get('question', '')
             answer_text = q_a.get('answer', 'No answer available')
 
             # Format question
-            elements.append(Paragraph(f"Q{idx}: {question_text}", self.styles['Heading3']))
+            elements.append(Paragraph(f"Q{idx}: {question_text}", heading_style))
 
             # Format answer
             self._add_formatted_answer(elements, answer_text)
@@ -279,24 +416,28 @@ class PDFGenerator:
 
     def _add_answer_section(self, elements, final_answer):
         """Add final answer section to PDF"""
-        elements.append(Paragraph("Final Answer", self.styles['Heading2']))
-        elements.append(Spacer(1, 0.3 * cm))
+        elements.extend([
+            Paragraph("Final Answer", self.styles['Heading2']),
+            Spacer(1, 0.3 * cm)
+        ])
 
         # Process sections
-        sections = self._detect_sections(final_answer)
+        sections = _detect_sections(final_answer)
+        heading_style = self.styles['Heading3']
+        body_style = self.styles['BodyText-Justified']
 
         if sections:
             # Add each detected section
             for header, content in sections:
-                elements.append(Paragraph(header, self.styles['Heading3']))
-                for para in content.split('\n'):
-                    if para.strip():
-                        elements.append(Paragraph(para, self.styles['BodyText-Justified']))
+                elements.append(Paragraph(header, heading_style))
+                elements.extend(
+                    Paragraph(para, body_style) for para in content.split('\n') if para.strip()
+                )
         else:
             # No sections detected, format as regular paragraphs
-            for para in final_answer.split('\n\n'):
-                if para.strip():
-                    elements.append(Paragraph(para, self.styles['BodyText-Justified']))
+            elements.extend(
+                Paragraph(para, body_style) for para in final_answer.split('\n\n') if para.strip()
+            )
 
     def _add_sources_section(self, elements, document_metadata):
         """Add sources section to PDF"""
@@ -305,34 +446,33 @@ class PDFGenerator:
 
         elements.append(Paragraph("Sources", self.styles['Heading3']))
 
-        # Group sources by title for uniqueness
-        unique_sources = {}
+        # Keep only the best (score, document ID) per source in a single pass
+        best_sources = {}
         for doc in document_metadata:
-            source_key = None
-            for field in ["case_title", "article_title", "legislation_title"]:
+            for field in _TITLE_FIELDS:
                 if field in doc:
                     source_key = (field, doc[field])
+                    score = doc.get("score", 0)
+                    current = best_sources.get(source_key)
+                    if current is None or score > current[0]:
+                        best_sources[source_key] = (score, doc.get("document_id", "Unknown"))
                     break
 
-            if source_key and (
-                    source_key not in unique_sources or
-                    doc.get("score", 0) > unique_sources[source_key].get("score", 0)):
-                unique_sources[source_key] = doc
-
         # Format sources
-        for (field_type, title), doc in unique_sources.items():
+        source_style = self.styles['SourceItem']
+        for (field_type, title), (_, document_id) in best_sources.items():
             type_name = field_type.replace("_title", "").capitalize()
-            source_text = f"• <b>{type_name}:</b> {title} (Document ID: {doc.get('document_id', 'Unknown')})"
-            elements.append(Paragraph(source_text, self.styles['SourceItem']))
+            source_text = f"• <b>{type_name}:</b> {title} (Document ID: {document_id})"
+            elements.append(Paragraph(source_text, source_style))
 
     def _add_signature_section(self, elements):
         """Add signature section to PDF"""
         elements.append(Spacer(1, 1 * cm))
-        elements.append(Paragraph("_" * 50, self.styles['Normal']))
+        elements.append(Paragraph(_SIGNATURE_LINE, self.styles['Normal']))
 
         # Generate unique document ID and timestamp
         document_id = str(uuid.uuid4())
-        generation_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        generation_date = time.strftime("%Y-%m-%d %H:%M:%S")
 
         elements.append(Paragraph(
             f"This document was digitally generated on {generation_date} by Lexanalytics AI.",
@@ -341,71 +481,86 @@ class PDFGenerator:
         elements.append(Paragraph(f"Document ID: {document_id}", self.styles['SignatureInfo']))
 
         # Add signature image if it exists
-        if os.path.exists(self.signature_path):
+        if self._signature_exists:
             signature = Image(self.signature_path, width=3 * cm, height=1 * cm)
             elements.append(signature)
 
     def _add_formatted_answer(self, elements, answer_text):
         """Add formatted answer text to PDF elements"""
-        # Split answer into paragraphs
-        paragraphs = answer_text.split('\n\n')
+        normal_style = self.styles['Normal']
+        justified_style = self.styles['BodyText-Justified']
 
-        for para in paragraphs:
-            if not para.strip():
+        # Split answer into paragraphs
+        for para in answer_text.split('\n\n'):
+            stripped_para = para.strip()
+            if not stripped_para:
                 continue
 
-            if para.strip().startswith('•') or para.strip().startswith('-'):
+            if stripped_para.startswith(_BULLET_MARKERS):
                 # Handle bullet lists
                 items = []
-                for line in para.strip().split('\n'):
-                    if line.strip().startswith('•') or line.strip().startswith('-'):
-                        line = line.strip()[1:].strip()
-                        items.append(ListItem(Paragraph(line, self.styles['Normal'])))
+                for line in stripped_para.split('\n'):
+                    stripped = line.strip()
+                    if stripped.startswith(_BULLET_MARKERS):
+                        items.append(ListItem(Paragraph(stripped[1:].strip(), normal_style)))
 
                 if items:
                     elements.append(ListFlowable(items, bulletType='bullet', leftIndent=20))
             else:
-                elements.append(Paragraph(para, self.styles['BodyText-Justified']))
+                elements.append(Paragraph(para, justified_style))
 
         # Add source references if they exist in the answer
-        if 'document' in answer_text.lower() or 'case:' in answer_text.lower():
-            for line in answer_text.split('\n'):
-                if ('document' in line.lower() or 'case:' in line.lower()) and len(line) < 100:
+        lowered = answer_text.lower()
+        if 'document' in lowered or 'case:' in lowered:
+            # Lowercasing never adds or removes newlines, so the lines pair up
+            for line, lowered_line in zip(answer_text.split('\n'), lowered.split('\n')):
+                if len(line) < 100 and ('document' in lowered_line or 'case:' in lowered_line):
                     elements.append(Paragraph(line, self.styles['SourceItem']))
 
-    def _detect_sections(self, text):
-        """Detect sections in text based on headings"""
-        sections = []
-        current_section = None
-        current_content = []
-
-        for line in text.split('\n\n'):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Check if this is a section header
-            if (line.endswith(':') and len(line.split()) <= 5) or (
-                    line and all(c.isalpha() or c.isspace() for c in line) and len(line) < 30):
-                # This is a header - save previous section and start new one
-                if current_section:
-                    sections.append((current_section, '\n'.join(current_content)))
-
-                current_section = line.rstrip(':')
-                current_content = []
-            else:
-                # This is content - add to current section
-                current_content.append(line)
-
-        # Add the last section
-        if current_section and current_content:
-            sections.append((current_section, '\n'.join(current_content)))
-
-        return sections
-
 
 # Factory function
 @lru_cache(maxsize=1)
 def get_pdf_generator():
     """Get the PDF generator singleton instance"""
-    return PDFGenerator()
\ No newline at end of file
+    return PDFGenerator()
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Get the PDF worker pool, creating it on first use"""
+    global _pdf_executor
+
+    if _pdf_executor is None:
+        # Workers come from a clean forkserver, not a fork of the server: by the first PDF request
+        # the server runs executor, ONNX and HTTP threads whose held locks a fork would inherit
+        _pdf_executor = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver")
+        )
+
+    return _pdf_executor
+
+
+def _generate_pdf_in_worker(
+        question: str,
+        decomposed_questions: List[Dict[str, str]],
+        final_answer: str,
+        document_metadata: List[Dict[str, Any]],
+        include_watermark: bool
+) -> bytes:
+    """Build a PDF inside a worker process using that process's generator"""
+    return get_pdf_generator().generate_pdf(
+        question=question,
+        decomposed_questions=decomposed_questions,
+        final_answer=final_answer,
+        document_metadata=document_metadata,
+        include_watermark=include_watermark
+    )
+
+
+def shutdown_pdf_executor():
+    """Stop the PDF worker processes, if they were started"""
+    global _pdf_executor
+
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown(wait=False, cancel_futures=True)
+        _pdf_executor = None
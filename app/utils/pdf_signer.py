@@ -3,11 +3,13 @@ PDF signing utilities for adding visual signatures to PDF documents.
 """
 import os
 import uuid
-import datetime
+import asyncio
+import time
 import logging
 from io import BytesIO
 from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import black, blue, gray
@@ -15,6 +17,8 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from PyPDF2 import PdfReader, PdfWriter
 
+from app.utils.pdf_generator import _get_pdf_executor
+
 logger = logging.getLogger("pdf")
 
 
@@ -40,8 +44,9 @@ class VisualPDFSigner:
         self.logo_path = logo_path or "static/lexanalytics_logo.png"
         self.signature_path = signature_path or "static/signatures/signature.png"
 
-        # Check if signature file exists
-        if not os.path.exists(self.signature_path):
+        # Check once whether the signature file exists; it does not change per request
+        self._has_signature = os.path.exists(self.signature_path)
+        if not self._has_signature:
             logger.warning(f"Signature file not found at {self.signature_path}")
 
     def sign_pdf(self, pdf_data, reason="Document verification", location="Digital"):
@@ -88,6 +93,30 @@ class VisualPDFSigner:
             # Return the original PDF on error
             return pdf_data
 
+    async def sign_pdf_async(self, pdf_data, reason="Document verification", location="Digital"):
+        """
+        Add a visual signature in a PDF worker process, keeping the event loop free.
+        The worker signs with a signer built from this one's logo and signature paths.
+
+        Args:
+            pdf_data: PDF document data as bytes
+            reason: Reason for signing
+            location: Location of signing
+
+        Returns:
+            PDF data with visual signature
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_pdf_executor(),
+            _sign_pdf_in_worker,
+            self.logo_path,
+            self.signature_path,
+            pdf_data,
+            reason,
+            location
+        )
+
     def _add_visual_signature(self, page, reason, location):
         """
         Add a visual signature box to a PDF page
@@ -101,26 +130,21 @@ class VisualPDFSigner:
             Modified PDF page
         """
         try:
-            # Create a new PDF with just the signature
-            signature_pdf = BytesIO()
-            c = canvas.Canvas(signature_pdf, pagesize=A4)
-
-            # Get page size
-            page_width, page_height = A4
-
-            # Draw signature box at bottom of page
-            self._draw_signature_box(c, page_width, page_height, reason, location)
-
-            # Save the canvas
+            # Box, label and signature image are identical for every document,
+            # so that overlay is rendered once and only parsed here
+            signature_path = self.signature_path if self._has_signature else None
+            static_reader = PdfReader(BytesIO(_render_static_overlay(signature_path)))
+
+            # Create a new PDF with just the per-document fields
+            fields_pdf = BytesIO()
+            c = canvas.Canvas(fields_pdf, pagesize=A4)
+            self._draw_signature_fields(c, reason, location)
             c.save()
 
-            # Merge the signature with the original page
-            signature_pdf.seek(0)
-            signature_reader = PdfReader(signature_pdf)
-            signature_page = signature_reader.pages[0]
-
-            # Merge the signature page with the original page
-            page.merge_page(signature_page)
+            # Merge both overlays with the original page
+            fields_pdf.seek(0)
+            page.merge_page(static_reader.pages[0])
+            page.merge_page(PdfReader(fields_pdf).pages[0])
 
             return page
 
@@ -128,16 +152,16 @@ class VisualPDFSigner:
             logger.error(f"Error adding visual signature elements: {str(e)}")
             return page
 
-    def _draw_signature_box(self, c, page_width, page_height, reason, location):
+    @staticmethod
+    def _draw_signature_box(c, page_width, page_height, signature_path):
         """
-        Draw signature box on canvas
+        Draw the static part of the signature box on canvas
 
         Args:
             c: Canvas to draw on
             page_width: Page width
             page_height: Page height
-            reason: Reason for signature
-            location: Location of signature
+            signature_path: Path to signature image, or None to omit it
         """
         # Draw signature box
         c.setStrokeColor(gray)
@@ -145,32 +169,16 @@ class VisualPDFSigner:
         c.setLineWidth(0.5)
         c.rect(2 * cm, 2 * cm, page_width - 4 * cm, 3 * cm, fill=0)
 
-        # Add signature information
-        c.setFont("Helvetica", 10)
-        c.setFillColor(black)
-
-        # Add document ID
-        document_id = str(uuid.uuid4())
-        c.drawString(2.5 * cm, 4.5 * cm, f"Document ID: {document_id}")
-
-        # Add timestamp
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        c.drawString(2.5 * cm, 4 * cm, f"Timestamp: {timestamp}")
-
-        # Add reason and location
-        c.drawString(2.5 * cm, 3.5 * cm, f"Reason: {reason}")
-        c.drawString(2.5 * cm, 3 * cm, f"Location: {location}")
-
         # Add "DIGITALLY VERIFIED" text
         c.setFont("Helvetica-Bold", 12)
         c.setFillColor(blue)
         c.drawString(page_width - 10 * cm, 4.5 * cm, "DIGITALLY VERIFIED")
 
         # Add signature image if available
-        if os.path.exists(self.signature_path):
+        if signature_path:
             try:
                 c.drawImage(
-                    self.signature_path,
+                    signature_path,
                     page_width - 6 * cm,
                     2.5 * cm,
                     width=3 * cm,
@@ -180,6 +188,61 @@ class VisualPDFSigner:
             except Exception as e:
                 logger.error(f"Error drawing signature image: {str(e)}")
 
+    def _draw_signature_fields(self, c, reason, location):
+        """
+        Draw the per-document signature information on canvas
+
+        Args:
+            c: Canvas to draw on
+            reason: Reason for signature
+            location: Location of signature
+        """
+        # Add signature information
+        c.setFont("Helvetica", 10)
+        c.setFillColor(black)
+
+        # Add document ID
+        document_id = str(uuid.uuid4())
+        c.drawString(2.5 * cm, 4.5 * cm, f"Document ID: {document_id}")
+
+        # Add timestamp
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        c.drawString(2.5 * cm, 4 * cm, f"Timestamp: {timestamp}")
+
+        # Add reason and location
+        c.drawString(2.5 * cm, 3.5 * cm, f"Reason: {reason}")
+        c.drawString(2.5 * cm, 3 * cm, f"Location: {location}")
+
+
+@lru_cache(maxsize=4)
+def _render_static_overlay(signature_path: Optional[str]) -> bytes:
+    """
+    Render the static signature overlay (box, label, signature image) once
+
+    Args:
+        signature_path: Path to signature image, or None to omit it
+
+    Returns:
+        Single-page A4 PDF as bytes
+    """
+    overlay_pdf = BytesIO()
+    c = canvas.Canvas(overlay_pdf, pagesize=A4)
+    page_width, page_height = A4
+    VisualPDFSigner._draw_signature_box(c, page_width, page_height, signature_path)
+    c.save()
+    return overlay_pdf.getvalue()
+
+
+@lru_cache(maxsize=8)
+def _worker_signer(logo_path: str, signature_path: str) -> "VisualPDFSigner":
+    """Get a worker process's signer for the given paths, built once per path pair"""
+    return VisualPDFSigner(logo_path=logo_path, signature_path=signature_path)
+
+
+def _sign_pdf_in_worker(logo_path: str, signature_path: str, pdf_data: bytes, reason: str, location: str) -> bytes:
+    """Sign a PDF inside a worker process with a signer using the caller's logo and signature paths"""
+    return _worker_signer(logo_path, signature_path).sign_pdf(pdf_data, reason=reason, location=location)
+
 
 # Factory function
 @lru_cache(maxsize=1)
@@ -0,0 +1,92 @@
+"""
+Normalization of decomposed sub-questions from the shapes the pipeline and cache produce.
+"""
+import logging
+from functools import singledispatch
+from typing import Any, List
+
+from app.models import Question, Questions
+
+logger = logging.getLogger("questions")
+
+
+@singledispatch
+def normalize_questions(questions_data: Any) -> List[Question]:
+    """
+    Extract decomposed questions as a list of Question objects.
+    Dispatches on the value's type; this fallback handles anything not registered below.
+
+    Args:
+        questions_data: Questions or Question object, list of questions or question dicts,
+            dict wrapping either, legacy ``("questions", [...])`` tuple, or None
+
+    Returns:
+        List of Question objects (empty if the value cannot be interpreted)
+    """
+    if hasattr(questions_data, "content") and hasattr(questions_data, "role"):
+        # It's a ChatMessage object - this shouldn't happen but handle it gracefully
+        logger.warning("Questions data is a ChatMessage object - this is unexpected")
+        return []
+
+    if hasattr(questions_data, "questions"):
+        # Another object exposing a questions list
+        return normalize_questions(questions_data.questions)
+
+    if hasattr(questions_data, "question"):
+        # A single question-like object
+        return [questions_data]
+
+    logger.warning("Unknown questions data type: %s", type(questions_data))
+    return []
+
+
+@normalize_questions.register(type(None))
+def _(questions_data: None) -> List[Question]:
+    return []
+
+
+@normalize_questions.register
+def _(questions_data: Questions) -> List[Question]:
+    # Normal case - a Questions object already holds the list
+    return questions_data.questions
+
+
+@normalize_questions.register
+def _(questions_data: Question) -> List[Question]:
+    return [questions_data]
+
+
+@normalize_questions.register
+def _(questions_data: list) -> List[Question]:
+    # Question objects are kept as they are; question dicts are rebuilt, anything else skipped
+    questions = []
+    for item in questions_data:
+        if isinstance(item, dict):
+            if "question" in item:
+                questions.append(Question(question=item.get("question", ""), answer=item.get("answer")))
+        elif hasattr(item, "question"):
+            questions.append(item)
+        else:
+            logger.warning("Skipping unknown questions list item type: %s", type(item))
+    return questions
+
+
+@normalize_questions.register
+def _(questions_data: dict) -> List[Question]:
+    # A dict wrapping a questions list, or a single question dict
+    if "questions" in questions_data:
+        return normalize_questions(questions_data["questions"])
+    if "question" in questions_data:
+        return [Question(question=questions_data.get("question", ""), answer=questions_data.get("answer"))]
+
+    logger.warning("Questions dictionary has neither 'questions' nor 'question'")
+    return []
+
+
+@normalize_questions.register
+def _(questions_data: tuple) -> List[Question]:
+    # Problematic case - a (key, questions) tuple instead of a Questions object
+    logger.warning("Questions data is a tuple: %s", type(questions_data))
+    if len(questions_data) > 1 and isinstance(questions_data[1], list):
+        return normalize_questions(questions_data[1])
+    return []
@@ -0,0 +1,18 @@
+"""
+Response classes for serializing API payloads.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response encoded by pydantic-core's Rust serializer.
+    Pydantic models inside the content are serialized directly, without first
+    being dumped to dicts and walked by FastAPI's jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
@@ -1,9 +1,31 @@
 import re
+import string
 import logging
 from fastapi import HTTPException, Query
 
 logger = logging.getLogger("api")
 
+# Common prompt injection patterns
+INJECTION_PATTERNS = [
+    r'ignore previous instructions',
+    r'disregard.*prior',
+    r'bypass',
+    r'system prompt',
+    r'as\s+if\s+you\s+were\s+not\s+restricted'
+]
+
+# Translation table deleting C0/C1 control characters (U+0000-U+001F, U+007F-U+009F)
+_CONTROL_CHARS_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7F, 0xA0)])
+
+# Patterns are compiled once; the injection patterns share one case-insensitive
+# alternation with a capturing group per pattern so a match can be reported
+_WHITESPACE_RE = re.compile(r'\s+')
+_INJECTION_RE = re.compile('|'.join(f'({pattern})' for pattern in INJECTION_PATTERNS), re.IGNORECASE)
+
+# A word repeated this many times in a row is rejected as excessive repetition;
+# surrounding punctuation is ignored so "law, law, law" counts as one word
+_MAX_REPEATED_WORDS = 6
+
 
 def sanitize_legal_query(
         question: str = Query(..., description="The legal question to research"),
@@ -25,7 +47,24 @@ def sanitize_legal_query(
         HTTPException: If query doesn't meet requirements
     """
     logger.debug(f"Sanitizing query: {question[:50]}...")
+    return _sanitize_core(question, min_length, max_length)
+
+
+def _sanitize_core(question: str, min_length: int, max_length: int) -> str:
+    """
+    Shared sanitization for query-parameter and request-body questions.
 
+    Args:
+        question: The original query text
+        min_length: Minimum allowed character length
+        max_length: Maximum allowed character length
+
+    Returns:
+        Sanitized query string
+
+    Raises:
+        HTTPException: If query doesn't meet requirements
+    """
     # Check if question is provided
     if not question:
         logger.warning("Rejected empty query")
@@ -49,18 +88,9 @@ def sanitize_legal_query(
             detail=f"Query too long. Maximum length is {max_length} characters."
         )
 
-    # Define sanitization steps as a pipeline
-    sanitization_pipeline = [
-        _remove_control_characters,
-        _normalize_whitespace,
-        _check_word_count,
-        _check_for_injection_patterns,
-        _check_for_repetition
-    ]
-
     # Apply each sanitization step
     sanitized = question
-    for sanitize_func in sanitization_pipeline:
+    for sanitize_func in _SANITIZATION_PIPELINE:
         sanitized = sanitize_func(sanitized, min_length)
         if sanitized is None:
             # This indicates sanitization failed with an error
@@ -80,17 +110,21 @@ def sanitize_legal_query(
 
 def _remove_control_characters(text: str, _: int) -> str:
     """Remove control characters and non-printable characters"""
-    return re.sub(r'[\x00-\x1F\x7F-\x9F]', '', text)
+    # Well-formed queries have nothing to strip; isprintable() scans without allocating
+    if text.isprintable():
+        return text
+    return text.translate(_CONTROL_CHARS_TABLE)
 
 
 def _normalize_whitespace(text: str, _: int) -> str:
     """Normalize whitespace (replace multiple spaces with single space)"""
-    return re.sub(r'\s+', ' ', text).strip()
+    return _WHITESPACE_RE.sub(' ', text).strip()
 
 
 def _check_word_count(text: str, min_length: int) -> str:
     """Check if text has minimum word count"""
-    if len(text.split()) < 1:
+    # At least one word means at least one non-whitespace character
+    if not text or text.isspace():
         logger.warning(f"Rejected query with too few words: {text}")
         raise HTTPException(
             status_code=400,
@@ -101,27 +135,35 @@ def _check_word_count(text: str, min_length: int) -> str:
 
 def _check_for_injection_patterns(text: str, _: int) -> str:
     """Check for common prompt injection patterns"""
-    injection_patterns = [
-        r'ignore previous instructions',
-        r'disregard.*prior',
-        r'bypass',
-        r'system prompt',
-        r'as\s+if\s+you\s+were\s+not\s+restricted'
-    ]
-
-    for pattern in injection_patterns:
-        if re.search(pattern, text.lower()):
-            logger.warning(f"Rejected query for potential prompt injection: '{pattern}'")
-            raise HTTPException(
-                status_code=400,
-                detail="Query contains potentially unsafe instructions."
-            )
+    match = _INJECTION_RE.search(text)
+    if match:
+        pattern = INJECTION_PATTERNS[match.lastindex - 1]
+        logger.warning(f"Rejected query for potential prompt injection: '{pattern}'")
+        raise HTTPException(
+            status_code=400,
+            detail="Query contains potentially unsafe instructions."
+        )
     return text
 
 
 def _check_for_repetition(text: str, _: int) -> str:
     """Check for repeated terms that might overwhelm embedding models"""
-    if re.search(r'(\b\w+\b)(\s+\1\b){5,}', text):
+    # Single linear pass over the words, tracking the current run of one word
+    previous = None
+    run_length = 0
+    for token in text.split():
+        word = token.strip(string.punctuation)
+        if not word:
+            continue
+        if word == previous:
+            run_length += 1
+            if run_length >= _MAX_REPEATED_WORDS:
+                break
+        else:
+            previous = word
+            run_length = 1
+
+    if run_length >= _MAX_REPEATED_WORDS:
         logger.warning(f"Rejected query for excessive repetition")
         raise HTTPException(
             status_code=400,
@@ -148,48 +190,14 @@ def sanitize_legal_query_body(question: str, min_length: int = 4, max_length: in
     logger.debug(f"Sanitizing body query: {question[:50]}...")
 
     # Apply same sanitization logic as the query parameter version
-    if not question:
-        logger.warning("Rejected empty query")
-        raise HTTPException(
-            status_code=400,
-            detail="Query cannot be empty"
-        )
-
-    if len(question) < min_length:
-        logger.warning(f"Rejected query for being too short: {question}")
-        raise HTTPException(
-            status_code=400,
-            detail=f"Query too short. Minimum length is {min_length} characters."
-        )
+    return _sanitize_core(question, min_length, max_length)
 
-    if len(question) > max_length:
-        logger.warning(f"Rejected query for exceeding max length: {len(question)} characters")
-        raise HTTPException(
-            status_code=400,
-            detail=f"Query too long. Maximum length is {max_length} characters."
-        )
-
-    # Apply sanitization pipeline
-    sanitization_pipeline = [
-        _remove_control_characters,
-        _normalize_whitespace,
-        _check_word_count,
-        _check_for_injection_patterns,
-        _check_for_repetition
-    ]
-
-    sanitized = question
-    for sanitize_func in sanitization_pipeline:
-        sanitized = sanitize_func(sanitized, min_length)
-        if sanitized is None:
-            break
-
-    if sanitized is None or len(sanitized) < min_length:
-        logger.warning(f"Rejected query that failed sanitization: {question}")
-        raise HTTPException(
-            status_code=400,
-            detail="Query contains invalid content."
-        )
 
-    logger.debug(f"Body query successfully sanitized")
-    return sanitized
\ No newline at end of file
+# Sanitization steps applied in order; each returns the updated text or raises
+_SANITIZATION_PIPELINE = (
+    _remove_control_characters,
+    _normalize_whitespace,
+    _check_word_count,
+    _check_for_injection_patterns,
+    _check_for_repetition
+)
@@ -0,0 +1,87 @@
+"""
+In-process semantic cache for chat responses keyed on question embeddings.
+"""
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("cache")
+
+
+class SemanticResponseCache:
+    """
+    Caches responses by the dense embedding of the question that produced them.
+    A lookup hits when a stored question in the same scope is at least `threshold`
+    cosine-similar to the incoming one. Bounded by size (LRU) and age (TTL).
+    """
+
+    def __init__(self, threshold: float = 0.97, max_size: int = 512, ttl_seconds: int = 3600):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_id = 0
+
+    def lookup(self, embedding: List[float], scope: str = "") -> Optional[Any]:
+        """
+        Find the cached payload for the most similar question in a scope
+
+        Args:
+            embedding: Dense embedding of the incoming question
+            scope: Partition key (e.g. mode or conversation tail) that must match exactly
+
+        Returns:
+            Cached payload, or None on a miss
+        """
+        self._evict_expired()
+
+        candidates = [
+            (entry_id, entry) for entry_id, entry in self._entries.items() if entry[1] == scope
+        ]
+        if not candidates:
+            return None
+
+        query = self._normalize(embedding)
+        matrix = np.vstack([entry[0] for _, entry in candidates])
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+
+        if scores[best] < self.threshold:
+            return None
+
+        entry_id, entry = candidates[best]
+        self._entries.move_to_end(entry_id)
+        logger.info(f"Semantic cache hit (similarity {scores[best]:.3f})")
+        return entry[2]
+
+    def store(self, embedding: List[float], payload: Any, scope: str = ""):
+        """
+        Store a payload under a question embedding
+
+        Args:
+            embedding: Dense embedding of the question
+            payload: Value to return on later similar lookups
+            scope: Partition key the entry belongs to
+        """
+        self._entries[self._next_id] = (self._normalize(embedding), scope, payload, time.monotonic())
+        self._next_id += 1
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _evict_expired(self):
+        """Drop entries older than the TTL"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [entry_id for entry_id, entry in self._entries.items() if entry[3] < cutoff]
+        for entry_id in expired:
+            del self._entries[entry_id]
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Convert to a unit-length float32 vector so dot products are cosine similarities"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector